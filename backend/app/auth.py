@@ -11,27 +11,34 @@ SECURITY NOTES:
    to support logout and token revocation. Store invalidated JTI (JWT ID) 
    claims with TTL matching token expiry.
 
-2. Rate Limiting: Use slowapi or fastapi-limiter for rate limiting:
-   - Login: 5 attempts per minute per IP
+2. Rate Limiting: Login attempts are throttled per (client IP, email) by the
+   in-process login_rate_limiter. For other endpoints, or several workers,
+   use slowapi or fastapi-limiter:
    - Register: 3 attempts per minute per IP
    - API endpoints: 100 requests per minute per user
 
-3. Password Storage: Using bcrypt with default work factor (12).
+3. Password Storage: Using bcrypt over a SHA-256 pre-hash (passlib
+   bcrypt_sha256) with work factor BCRYPT_COST (default 12).
    Consider increasing for higher security environments.
 """
 
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Account
+from app.schemas import UserProfile
 
 
 # ============================================================
@@ -41,27 +48,73 @@ from app.models import Account
 # Secret key for JWT signing - in production, use a proper secret from env
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dashx-dev-secret-key-change-in-production-2024")
 ALGORITHM = "HS256"
+# Signing key built once; passing the raw secret makes jose rebuild the HMAC
+# key object on every encode and decode
+JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))  # 1 hour default
 
-# Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing configuration. New hashes are bcrypt over SHA-256 of the
+# password (bcrypt alone ignores bytes past 72); plain bcrypt hashes from
+# before still verify. The cost is stored in each hash, so changing
+# BCRYPT_COST only affects hashes created afterwards
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+    bcrypt_sha256__rounds=BCRYPT_COST,
+    bcrypt__rounds=BCRYPT_COST
+)
+
+# Shortest well-formed stored hash (plain bcrypt; bcrypt_sha256 hashes are longer)
+BCRYPT_HASH_MIN_LENGTH = 60
 
 # HTTP Bearer scheme for JWT
 security = HTTPBearer(auto_error=False)
 
+# Cached profiles (GET /auth/me, GET /account/balance) live this long; commits
+# that write an account drop its entry right away
+PROFILE_CACHE_TTL_SECONDS = 30
+PROFILE_CACHE_MAX_ENTRIES = 10000
+
+# Verified access-token payloads are reused this long (never past the token's
+# exp), so polled endpoints skip the HMAC check and JSON decode
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_ENTRIES = 10000
+
+# Login attempts allowed per (client IP, email) in each window before
+# /auth/login answers 429 without touching the database or bcrypt
+LOGIN_ATTEMPT_LIMIT = int(os.getenv("LOGIN_ATTEMPT_LIMIT", "10"))
+LOGIN_ATTEMPT_WINDOW_SECONDS = 60
+LOGIN_LIMITER_MAX_KEYS = 100000
+
+# Emails found on the blacklist are remembered this long, so repeated login
+# attempts for them are refused without a query. Entries are never removed
+# by the app; the TTL bounds how long a manual removal takes to apply
+BLACKLIST_CACHE_TTL_SECONDS = 60
+BLACKLIST_CACHE_MAX_ENTRIES = 10000
+
 
 # ============================================================
 # Password Utilities
 # ============================================================
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password using bcrypt over its SHA-256 digest"""
     return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """
+    Verify a password against its hash. A missing or malformed hash fails
+    at once, without running bcrypt; passlib compares digests in constant time.
+    """
+    if not hashed_password or len(hashed_password) < BCRYPT_HASH_MIN_LENGTH:
+        return False
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except ValueError:
+        # Not a hash any configured scheme recognizes
+        return False
 
 
 # ============================================================
@@ -79,20 +132,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token string
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        **data,
+        "exp": now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)),
+        "iat": now,
         "type": "access"
-    })
+    }
     
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, JWT_KEY, algorithm=ALGORITHM)
 
 
 def decode_token(token: str) -> Optional[dict]:
@@ -106,25 +154,83 @@ def decode_token(token: str) -> Optional[dict]:
         Decoded payload dict or None if invalid
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, JWT_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
         return None
 
 
+# ============================================================
+# Access Token Cache
+# ============================================================
+
+class TokenCache:
+    """
+    In-process LRU cache of verified access-token payloads by token string.
+    
+    Only tokens that passed decode_token and the access-token checks are
+    stored. An entry lives ttl_seconds but never past the token's exp claim,
+    so an expired token is always rejected. The payload carries only the
+    subject and ID; profile data still comes from profile_cache or the
+    database, so account changes apply as before.
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: int = TOKEN_CACHE_TTL_SECONDS,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES
+    ):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, token: str) -> Optional[dict]:
+        """Cached payload, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry[1]
+    
+    def set(self, token: str, payload: dict) -> None:
+        """Store a verified payload"""
+        lifetime = self.ttl
+        exp = payload.get("exp")
+        if exp is not None:
+            lifetime = min(lifetime, exp - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (time.monotonic() + lifetime, payload)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached payloads"""
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
 # ============================================================
 # Authentication Dependencies
 # ============================================================
 
-async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> Account:
+def _access_token_payload(credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
     """
-    Dependency to get the current authenticated user from JWT token
+    Decode and check a bearer access token, reusing token_cache for tokens
+    already verified
     
     Raises:
-        HTTPException 401 if token is missing, invalid, or user not found
+        HTTPException 401 if token is missing, invalid, or has no subject
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -136,6 +242,10 @@ async def get_current_user(
         raise credentials_exception
     
     token = credentials.credentials
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    
     payload = decode_token(token)
     
     if payload is None:
@@ -146,19 +256,51 @@ async def get_current_user(
         raise credentials_exception
     
     # Get user email from token subject
-    email: str = payload.get("sub")
-    if email is None:
+    if payload.get("sub") is None:
         raise credentials_exception
     
-    # Fetch user from database
-    user = db.query(Account).filter(Account.email == email).first()
-    if user is None:
-        raise credentials_exception
+    token_cache.set(token, payload)
+    return payload
+
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> Account:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    A plain function, so FastAPI runs its account SELECT in the threadpool
+    instead of blocking the event loop.
     
+    Raises:
+        HTTPException 401 if token is missing, invalid, or user not found
+    """
+    email: str = _access_token_payload(credentials)["sub"]
+    return _user_by_email(db, email)
+
+
+# Built once: the per-request lookups only bind the email, instead of
+# rebuilding the statement and its cache key on every call
+_ACCOUNT_BY_EMAIL = select(Account).where(Account.email == bindparam("email"))
+
+
+def _user_by_email(db: Session, email: str) -> Account:
+    """Fetch the token's user from database; 401 if it no longer exists"""
+    user = db.execute(_ACCOUNT_BY_EMAIL, {"email": email}).scalars().first()
+    if user is None:
+        raise _unknown_user()
     return user
 
 
-async def get_current_user_optional(
+def _unknown_user() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
 ) -> Optional[Account]:
@@ -169,11 +311,224 @@ async def get_current_user_optional(
         return None
     
     try:
-        return await get_current_user(credentials, db)
+        return get_current_user(credentials, db)
     except HTTPException:
         return None
 
 
+# ============================================================
+# Cached Profile
+# ============================================================
+
+# Columns read to build a UserProfile; a cache miss selects only these
+# instead of the whole account row
+PROFILE_COLUMNS = (
+    Account.ID, Account.email, Account.type, Account.balance, Account.warnings,
+    Account.wage, Account.restaurantID, Account.customer_tier
+)
+_PROFILE_BY_EMAIL = select(*PROFILE_COLUMNS).where(Account.email == bindparam("email"))
+
+
+def account_profile(account) -> UserProfile:
+    """The read-only profile fields of an account (or a PROFILE_COLUMNS row)"""
+    return UserProfile(
+        ID=account.ID,
+        email=account.email,
+        type=account.type,
+        balance=account.balance,
+        warnings=account.warnings,
+        wage=account.wage,
+        restaurantID=account.restaurantID,
+        customer_tier=account.customer_tier
+    )
+
+
+class ProfileCache:
+    """
+    In-process LRU cache of UserProfile by account ID.
+    
+    Entries expire after ttl_seconds. The reputation engine's commit hook
+    invalidates every account written in the committed transaction (ORM
+    flushes and Core UPDATEs recorded with touch_accounts).
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: int = PROFILE_CACHE_TTL_SECONDS,
+        max_entries: int = PROFILE_CACHE_MAX_ENTRIES
+    ):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, UserProfile]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, account_id: int) -> Optional[UserProfile]:
+        """Cached profile, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(account_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[account_id]
+                return None
+            self._entries.move_to_end(account_id)
+            return entry[1]
+    
+    def set(self, profile: UserProfile) -> None:
+        """Store a profile"""
+        with self._lock:
+            self._entries[profile.ID] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(profile.ID)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, *account_ids: int) -> None:
+        """Drop cached profiles for the given accounts"""
+        with self._lock:
+            for account_id in account_ids:
+                self._entries.pop(account_id, None)
+    
+    def clear(self) -> None:
+        """Drop all cached profiles"""
+        with self._lock:
+            self._entries.clear()
+
+
+profile_cache = ProfileCache()
+
+
+def get_current_profile(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> UserProfile:
+    """
+    Dependency for read-only endpoints: the current user's profile, served
+    from profile_cache when possible so no account row is loaded
+    
+    Raises:
+        HTTPException 401 if token is missing, invalid, or user not found
+    """
+    payload = _access_token_payload(credentials)
+    user_id = payload.get("user_id")
+    if user_id is not None:
+        profile = profile_cache.get(user_id)
+        if profile is not None and profile.email == payload["sub"]:
+            return profile
+    
+    row = db.execute(_PROFILE_BY_EMAIL, {"email": payload["sub"]}).first()
+    if row is None:
+        raise _unknown_user()
+    profile = account_profile(row)
+    profile_cache.set(profile)
+    return profile
+
+
+# ============================================================
+# Login Rate Limiting
+# ============================================================
+
+class LoginRateLimiter:
+    """
+    In-process fixed-window counter of login attempts per key.
+    
+    The first attempt for a key opens a window of window_seconds; hit()
+    refuses once more than limit attempts fall in the same window. The
+    oldest keys are dropped beyond max_keys so a spray of distinct emails
+    cannot grow the table without bound.
+    """
+    
+    def __init__(
+        self,
+        limit: int = LOGIN_ATTEMPT_LIMIT,
+        window_seconds: int = LOGIN_ATTEMPT_WINDOW_SECONDS,
+        max_keys: int = LOGIN_LIMITER_MAX_KEYS
+    ):
+        self.limit = limit
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[Tuple[str, str], List]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def hit(self, key: Tuple[str, str]) -> Optional[int]:
+        """
+        Count an attempt. Returns None if it is allowed, otherwise the
+        seconds until the key's window resets.
+        """
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window[0] <= now:
+                window = [now + self.window, 0]
+                self._windows[key] = window
+                self._windows.move_to_end(key)
+                while len(self._windows) > self.max_keys:
+                    self._windows.popitem(last=False)
+            window[1] += 1
+            if window[1] > self.limit:
+                return max(1, int(window[0] - now))
+            return None
+    
+    def clear(self) -> None:
+        """Forget all counters"""
+        with self._lock:
+            self._windows.clear()
+
+
+login_rate_limiter = LoginRateLimiter()
+
+
+# ============================================================
+# Blacklisted Email Cache
+# ============================================================
+
+class BlacklistCache:
+    """
+    In-process TTL set of emails known to be blacklisted.
+    
+    Only positive lookups are cached: a new blacklist entry must apply at
+    once, so an email not in the cache is always checked in the database.
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: int = BLACKLIST_CACHE_TTL_SECONDS,
+        max_entries: int = BLACKLIST_CACHE_MAX_ENTRIES
+    ):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def contains(self, email: str) -> bool:
+        """Whether email was found blacklisted within the TTL"""
+        key = email.lower()
+        with self._lock:
+            expires = self._expiry.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._expiry[key]
+                return False
+            return True
+    
+    def add(self, email: str) -> None:
+        """Remember an email found on the blacklist"""
+        key = email.lower()
+        with self._lock:
+            self._expiry[key] = time.monotonic() + self.ttl
+            self._expiry.move_to_end(key)
+            while len(self._expiry) > self.max_entries:
+                self._expiry.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Forget all cached emails"""
+        with self._lock:
+            self._expiry.clear()
+
+
+blacklist_cache = BlacklistCache()
+
+
 # ============================================================
 # Role-Based Access Control Dependencies
 # ============================================================
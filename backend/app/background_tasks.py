@@ -6,14 +6,14 @@ Handles periodic evaluation of chef/delivery performance
 import logging
 import asyncio
 from datetime import datetime, timezone
-from typing import Optional
 from contextlib import asynccontextmanager
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, text
 
 from app.database import SessionLocal
-from app.models import Account, Complaint, Dish, ManagerNotification, DeliveryRating, VoiceReport
+from app.models import Account, Complaint, Dish, DeliveryRating, VoiceReport
+from app.reputation_engine import create_manager_notification, recalculate_all_chef_ratings
 from app.audio_transcription_adapter import get_transcription_service
 from app.voice_report_nlp import get_nlp_analyzer
 
@@ -25,26 +25,6 @@ def get_iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def create_notification(
-    db: Session,
-    notification_type: str,
-    title: str,
-    message: str,
-    related_account_id: Optional[int] = None
-) -> ManagerNotification:
-    """Create a manager notification"""
-    notification = ManagerNotification(
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        related_account_id=related_account_id,
-        is_read=False,
-        created_at=get_iso_now()
-    )
-    db.add(notification)
-    return notification
-
-
 def evaluate_chef_performance(db: Session) -> list:
     """
     Evaluate all chef performance and create notifications for those at risk.
@@ -84,7 +64,7 @@ def evaluate_chef_performance(db: Session) -> list:
         status = "ok"
         if complaint_count >= 3 or (avg_rating and avg_rating < 2.0):
             status = "critical"
-            create_notification(
+            create_manager_notification(
                 db,
                 notification_type="chef_performance_critical",
                 title=f"Chef Performance Critical: {chef.email}",
@@ -93,7 +73,7 @@ def evaluate_chef_performance(db: Session) -> list:
             )
         elif complaint_count >= 2 or (avg_rating and avg_rating < 2.5):
             status = "warning"
-            create_notification(
+            create_manager_notification(
                 db,
                 notification_type="chef_performance_warning",
                 title=f"Chef Performance Warning: {chef.email}",
@@ -154,7 +134,7 @@ def evaluate_delivery_performance(db: Session) -> list:
         status = "ok"
         if on_time_pct < 70 or (avg_rating and avg_rating < 3.0):
             status = "warning"
-            create_notification(
+            create_manager_notification(
                 db,
                 notification_type="delivery_performance_warning",
                 title=f"Delivery Performance Warning: {person.email}",
@@ -229,6 +209,129 @@ def run_immediate_evaluation():
         db.close()
 
 
+def refresh_dish_popularity(db: Session) -> bool:
+    """
+    Recompute the dish_popularity materialized view.
+    
+    Uses CONCURRENTLY so readers are never blocked while the view rebuilds.
+    Only PostgreSQL supports materialized views; other backends are skipped.
+    
+    Returns True if the view was refreshed.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    
+    db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY dish_popularity"))
+    db.commit()
+    return True
+
+
+async def periodic_dish_popularity_refresh():
+    """
+    Background task that refreshes dish popularity counters.
+    Runs every 15 minutes.
+    """
+    interval_seconds = 900  # 15 minutes
+    
+    while True:
+        try:
+            db = SessionLocal()
+            try:
+                if refresh_dish_popularity(db):
+                    logger.info("Refreshed dish_popularity materialized view")
+            finally:
+                db.close()
+                
+        except Exception as e:
+            logger.error(f"Error refreshing dish popularity: {e}", exc_info=True)
+        
+        await asyncio.sleep(interval_seconds)
+
+
+# Tables partitioned by month on created_at (see migration 20251212_030)
+PARTITIONED_LOG_TABLES = ("audit_log", "transactions")
+
+
+def ensure_log_partitions(db: Session, months_ahead: int = 3) -> int:
+    """
+    Create any missing monthly partitions for the append-only log tables.
+    
+    Partitions are created months_ahead months in advance so inserts never
+    fall into the DEFAULT partition. Only PostgreSQL is partitioned; other
+    backends are skipped.
+    
+    Returns the number of partitions created.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return 0
+    
+    created = 0
+    for table in PARTITIONED_LOG_TABLES:
+        created += db.execute(
+            text("SELECT ensure_monthly_partitions(:parent, :months_ahead)"),
+            {"parent": table, "months_ahead": months_ahead}
+        ).scalar()
+    db.commit()
+    return created
+
+
+async def periodic_log_partition_maintenance():
+    """
+    Background task that keeps monthly log partitions created ahead.
+    Runs once a day.
+    """
+    interval_seconds = 86400  # 24 hours
+    
+    while True:
+        try:
+            db = SessionLocal()
+            try:
+                created = ensure_log_partitions(db)
+                if created:
+                    logger.info(f"Created {created} log table partitions")
+            finally:
+                db.close()
+                
+        except Exception as e:
+            logger.error(f"Error maintaining log partitions: {e}", exc_info=True)
+        
+        await asyncio.sleep(interval_seconds)
+
+
+def reconcile_chef_ratings(db: Session) -> int:
+    """
+    Recompute every active chef's rolling rating from their dishes.
+    
+    Review submission updates chef ratings incrementally; this full rescan
+    corrects any rounding drift. Returns the number of chefs reconciled.
+    """
+    count = recalculate_all_chef_ratings(db)
+    db.commit()
+    return count
+
+
+async def periodic_chef_rating_reconciliation():
+    """
+    Background task that reconciles chef ratings.
+    Runs once a day.
+    """
+    interval_seconds = 86400  # 24 hours
+    
+    while True:
+        try:
+            db = SessionLocal()
+            try:
+                count = reconcile_chef_ratings(db)
+                logger.info(f"Reconciled ratings for {count} chefs")
+            finally:
+                db.close()
+                
+        except Exception as e:
+            logger.error(f"Error reconciling chef ratings: {e}", exc_info=True)
+        
+        await asyncio.sleep(interval_seconds)
+
+
 def process_voice_report(db: Session, report_id: int) -> dict:
     """
     Process a voice report: transcribe audio and run NLP analysis
@@ -299,7 +402,7 @@ def process_voice_report(db: Session, report_id: int) -> dict:
             submitter = db.query(Account).filter(Account.ID == report.submitter_id).first()
             submitter_email = submitter.email if submitter else "Unknown"
             
-            create_notification(
+            create_manager_notification(
                 db,
                 notification_type="voice_complaint_received",
                 title=f"New Voice Complaint from {submitter_email}",
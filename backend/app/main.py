@@ -6,6 +6,7 @@ FastAPI Application Entry Point
 import os
 import logging
 import asyncio
+import anyio
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, Depends
@@ -32,6 +33,9 @@ else:
     STATIC_DIR = Path(__file__).parent.parent / "static"
 STATIC_IMAGES_DIR = STATIC_DIR / "images"
 
+# Threadpool size for sync route handlers and dependencies
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "64"))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -41,6 +45,11 @@ async def lifespan(app: FastAPI):
     logger.info(f"   Debug mode: {os.getenv('DEBUG', 'true')}")
     logger.info(f"   LLM URL: {os.getenv('LLM_STUB_URL', 'http://llm-stub:8001')}")
     
+    # Sync handlers (bcrypt in register/login, sync DB sessions) run on
+    # anyio's worker threads; allow more of them than the default 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    logger.info(f"   Worker threads: {WORKER_THREADS}")
+    
     # Ensure static directories exist
     STATIC_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
     logger.info(f"   Static images dir: {STATIC_IMAGES_DIR}")
@@ -48,7 +57,10 @@ async def lifespan(app: FastAPI):
     # Start background tasks
     background_tasks = []
     if os.getenv("ENABLE_BACKGROUND_TASKS", "true").lower() == "true":
-        from app.background_tasks import periodic_performance_evaluation, periodic_voice_report_processing
+        from app.background_tasks import (
+            periodic_performance_evaluation, periodic_voice_report_processing, periodic_dish_popularity_refresh,
+            periodic_chef_rating_reconciliation, periodic_log_partition_maintenance
+        )
         
         perf_task = asyncio.create_task(periodic_performance_evaluation())
         background_tasks.append(perf_task)
@@ -57,6 +69,18 @@ async def lifespan(app: FastAPI):
         voice_task = asyncio.create_task(periodic_voice_report_processing())
         background_tasks.append(voice_task)
         logger.info("   Background voice report processing task started")
+        
+        popularity_task = asyncio.create_task(periodic_dish_popularity_refresh())
+        background_tasks.append(popularity_task)
+        logger.info("   Background dish popularity refresh task started")
+        
+        rating_task = asyncio.create_task(periodic_chef_rating_reconciliation())
+        background_tasks.append(rating_task)
+        logger.info("   Background chef rating reconciliation task started")
+        
+        partition_task = asyncio.create_task(periodic_log_partition_maintenance())
+        background_tasks.append(partition_task)
+        logger.info("   Background log partition maintenance task started")
     
     yield
     
@@ -67,6 +91,10 @@ async def lifespan(app: FastAPI):
             await task
         except asyncio.CancelledError:
             pass
+    
+    # Write audit entries / notifications still queued by committed requests
+    from app.reputation_engine import audit_writer
+    await asyncio.to_thread(audit_writer.stop)
     logger.info("👋 Shutting down API...")
 
 
@@ -127,7 +155,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "detail": exc.detail,
             "status_code": exc.status_code,
             "path": str(request.url.path)
-        }
+        },
+        headers=exc.headers
     )
 
 
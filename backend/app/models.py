@@ -3,14 +3,82 @@ SQLAlchemy ORM Models for DashX
 Matches exactly the authoritative database schema.
 """
 
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+
 from sqlalchemy import (
-    Column, Integer, String, Text, Numeric, ForeignKey, Boolean, JSON, CheckConstraint
+    Column, Integer, SmallInteger, String, Text, Numeric, ForeignKey, Boolean, JSON,
+    CheckConstraint, DDL, DateTime, Index, MetaData, Table, TypeDecorator, event, select, func, or_
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, column_property, configure_mappers, deferred, synonym
 from app.database import Base
 
 
+class IsoTimestamp(TypeDecorator):
+    """
+    TIMESTAMPTZ column that keeps the ISO-string interface of the old Text columns.
+    
+    Accepts datetimes or ISO strings on write (naive values are treated as UTC)
+    and returns ISO strings on read, so routers and API schemas are unchanged
+    while the database stores, sorts and indexes real timestamps.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+
+
+def scaled_rating(column_name: str) -> hybrid_property:
+    """
+    Expose a rating stored as rating*100 in a SmallInteger column as a 0.00-5.00 value.
+    
+    Reads return a float, writes accept float/Decimal (rounded half-up to two
+    places) and SQL expressions divide by 100 so filters and aggregates keep
+    working in rating units.
+    """
+    def fget(self):
+        value = getattr(self, column_name)
+        return None if value is None else value / 100
+
+    def fset(self, value):
+        if value is not None:
+            value = int((Decimal(str(value)) * 100).to_integral_value(ROUND_HALF_UP))
+        setattr(self, column_name, value)
+
+    def expr(cls):
+        return getattr(cls, column_name) / 100.0
+
+    return hybrid_property(fget, fset, expr=expr)
+
+
+# Materialized view (see migration 20251212_020), refreshed periodically by
+# app.background_tasks. Kept out of Base.metadata so create_all() never tries
+# to create it as a table.
+dish_popularity = Table(
+    "dish_popularity",
+    MetaData(),
+    Column("dish_id", Integer, primary_key=True),
+    Column("order_count", Integer),
+    Column("units", Integer),
+)
+
+
 class Restaurant(Base):
     """Restaurant entity"""
     __tablename__ = "restaurant"
@@ -53,11 +121,12 @@ class Account(Base):
     
     # ========== Reputation System Fields ==========
     # Employee (Chef/Delivery) reputation tracking
-    rolling_avg_rating = Column(Numeric(3, 2), nullable=True, default=0.00)  # Rolling average rating 0.00-5.00
+    rolling_avg_x100 = Column(SmallInteger, nullable=True, default=0)  # Rolling average rating * 100 (0-500)
+    rolling_avg_rating = scaled_rating('rolling_avg_x100')
     total_rating_count = Column(Integer, nullable=False, default=0)  # Total ratings received
     complaint_count = Column(Integer, nullable=False, default=0)  # Active complaints (decremented by compliments)
     compliment_count = Column(Integer, nullable=False, default=0)  # Total compliments received
-    demotion_count = Column(Integer, nullable=False, default=0)  # Synonym for times_demoted for clarity
+    demotion_count = synonym('times_demoted')  # Same counter, reputation-system name
     employment_status = Column(String(50), nullable=False, default='active')  # active, demoted, fired
     bonus_count = Column(Integer, nullable=False, default=0)  # Number of bonuses received
     last_bonus_at = Column(Text, nullable=True)  # ISO timestamp of last bonus
@@ -66,8 +135,24 @@ class Account(Base):
     customer_tier = Column(String(50), nullable=False, default='registered')  # registered, vip, deregistered
     dispute_status = Column(String(50), nullable=True)  # pending, resolved - if customer has active dispute
 
+    # Optimistic lock: ORM flushes of an account bump this and fail with
+    # StaleDataError if another transaction changed the row since it was read
+    version_id = Column(Integer, nullable=False, default=1)
+
+    __mapper_args__ = {"version_id_col": version_id}
+
+    __table_args__ = (
+        # Active chefs and delivery people: the rule evaluator's and bidding
+        # pool's working set. type / is_fired only change on firing, so the
+        # counter UPDATEs stay HOT.
+        Index(
+            'idx_accounts_active_workforce', type,
+            postgresql_where=(is_fired == False) & type.in_(["chef", "delivery"])
+        ),
+    )
+
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="accounts")
+    restaurant = relationship(Restaurant, back_populates="accounts")
     orders = relationship("Order", back_populates="account")
     dishes_created = relationship("Dish", back_populates="chef", foreign_keys="Dish.chefID")
     bids = relationship("Bid", back_populates="delivery_person")
@@ -77,6 +162,37 @@ class Account(Base):
     delivery_rating = relationship("DeliveryRating", back_populates="account", uselist=False)
     closure_request = relationship("ClosureRequest", back_populates="account", uselist=False)
     transactions = relationship("Transaction", back_populates="account")
+    voice_reports_submitted = relationship(
+        "VoiceReport", back_populates="submitter", foreign_keys="VoiceReport.submitter_id",
+        lazy="raise", passive_deletes=True
+    )
+    dish_reviews = relationship("DishReview", back_populates="account")
+    delivery_reviews_received = relationship(
+        "OrderDeliveryReview", back_populates="delivery_person", foreign_keys="OrderDeliveryReview.delivery_person_id"
+    )
+    delivery_reviews_given = relationship(
+        "OrderDeliveryReview", back_populates="reviewer", foreign_keys="OrderDeliveryReview.reviewer_id"
+    )
+    customer_reviews_received = relationship(
+        "CustomerReview", back_populates="customer", foreign_keys="CustomerReview.customer_id"
+    )
+    customer_reviews_given = relationship(
+        "CustomerReview", back_populates="reviewer", foreign_keys="CustomerReview.reviewer_id"
+    )
+    vip_history = relationship("VIPHistory", back_populates="account", foreign_keys="VIPHistory.account_id")
+    profile = relationship("AccountProfile", back_populates="account")
+    forum_threads = relationship("ForumThread", back_populates="author")
+    forum_posts = relationship("ForumPost", back_populates="author")
+    kb_contributions = relationship("KBContribution", back_populates="submitter", foreign_keys="KBContribution.submitter_id")
+
+
+# Reputation counters on accounts are rewritten constantly and deliberately
+# left unindexed; free space on each page lets Postgres apply those UPDATEs as
+# HOT (heap-only) updates without touching any index.
+event.listen(
+    Account.__table__, "after_create",
+    DDL("ALTER TABLE accounts SET (fillfactor = 80)").execute_if(dialect="postgresql")
+)
 
 
 class Dish(Base):
@@ -89,19 +205,40 @@ class Dish(Base):
     description = Column(Text, nullable=True)
     cost = Column(Integer, nullable=False)  # In cents
     picture = Column(Text, nullable=True)  # URL/path to image
-    average_rating = Column(Numeric(3, 2), nullable=True, default=0.00)
+    avg_rating_x100 = Column(SmallInteger, nullable=True, default=0)  # Rating * 100
+    average_rating = scaled_rating('avg_rating_x100')
     reviews = Column(Integer, nullable=False, default=0)
     chefID = Column(Integer, ForeignKey("accounts.ID", ondelete="SET NULL"), nullable=True)
     is_specialty = Column(Boolean, nullable=False, default=False)  # VIP-only specialty dishes
 
+    # Popularity counter read from the dish_popularity view (deferred - only
+    # loaded on access). No counter is bumped on the order write path.
+    order_count = column_property(
+        func.coalesce(
+            select(dish_popularity.c.order_count)
+            .where(dish_popularity.c.dish_id == id)
+            .correlate_except(dish_popularity)
+            .scalar_subquery(),
+            0
+        ),
+        deferred=True
+    )
+
     __table_args__ = (
         CheckConstraint('cost >= 0', name='check_dish_cost_positive'),
+        # Covering index for chef rating aggregates (index-only scan on Postgres)
+        Index(
+            'idx_dishes_chef_reviews', chefID,
+            postgresql_include=['avg_rating_x100', 'reviews'],
+            postgresql_where=reviews > 0
+        ),
     )
 
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="dishes")
-    chef = relationship("Account", back_populates="dishes_created", foreign_keys=[chefID])
+    restaurant = relationship(Restaurant, back_populates="dishes")
+    chef = relationship(Account, back_populates="dishes_created", foreign_keys=[chefID])
     ordered_dishes = relationship("OrderedDish", back_populates="dish")
+    dish_reviews = relationship("DishReview", back_populates="dish")
 
 
 class Order(Base):
@@ -110,7 +247,7 @@ class Order(Base):
 
     id = Column(Integer, primary_key=True)
     accountID = Column(Integer, ForeignKey("accounts.ID", ondelete="RESTRICT"), nullable=False)
-    dateTime = Column(Text, nullable=True)  # Stored as text per schema
+    dateTime = Column(IsoTimestamp, nullable=True, server_default=func.now())
     finalCost = Column(Integer, nullable=False)  # Total in cents (items + delivery)
     status = Column(String(50), nullable=False, default='pending')
     bidID = Column(Integer, ForeignKey("bid.id", ondelete="SET NULL"), nullable=True)
@@ -121,14 +258,34 @@ class Order(Base):
     discount_cents = Column(Integer, nullable=False, default=0)  # VIP discount applied
     free_delivery_used = Column(Integer, nullable=False, default=0)  # 1 if free delivery used
     assignment_memo = Column(Text, nullable=True)  # Manager memo when non-lowest bid assigned
-    bidding_closes_at = Column(Text, nullable=True)  # ISO timestamp when bidding closes
+    bidding_closes_at = Column(IsoTimestamp, nullable=True)  # When bidding closes
     delivered_at = Column(Text, nullable=True)  # ISO timestamp when order was delivered
 
+    __table_args__ = (
+        Index('idx_orders_datetime', dateTime.desc()),
+    )
+
     # Relationships
-    account = relationship("Account", back_populates="orders")
+    account = relationship(Account, back_populates="orders")
     accepted_bid = relationship("Bid", back_populates="order_accepted", foreign_keys=[bidID])
     ordered_dishes = relationship("OrderedDish", back_populates="order", cascade="all, delete-orphan")
     bids = relationship("Bid", back_populates="order", foreign_keys="Bid.orderID")
+    complaints = relationship("Complaint", back_populates="order", lazy="raise", passive_deletes=True)
+    dish_reviews = relationship("DishReview", back_populates="order")
+    delivery_review = relationship("OrderDeliveryReview", back_populates="order")
+    customer_review = relationship("CustomerReview", back_populates="order")
+
+    @hybrid_property
+    def bidding_open(self):
+        """True until bidding_closes_at passes; orders without a deadline stay open."""
+        if self.bidding_closes_at is None:
+            return True
+        return datetime.fromisoformat(self.bidding_closes_at) > datetime.now(timezone.utc)
+
+    @bidding_open.expression
+    def bidding_open(cls):
+        # Compared against the database clock, so the bid path never parses the deadline
+        return or_(cls.bidding_closes_at.is_(None), cls.bidding_closes_at > func.now())
 
 
 class OrderedDish(Base):
@@ -144,8 +301,8 @@ class OrderedDish(Base):
     )
 
     # Relationships
-    order = relationship("Order", back_populates="ordered_dishes")
-    dish = relationship("Dish", back_populates="ordered_dishes")
+    order = relationship(Order, back_populates="ordered_dishes")
+    dish = relationship(Dish, back_populates="ordered_dishes")
 
 
 class Bid(Base):
@@ -157,12 +314,19 @@ class Bid(Base):
     orderID = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
     bidAmount = Column(Integer, nullable=False)  # In cents
     estimated_minutes = Column(Integer, nullable=False, default=30)  # Estimated delivery time
-    created_at = Column(Text, nullable=True)  # ISO timestamp for throttling
+    created_at = Column(IsoTimestamp, nullable=True, server_default=func.now())  # For throttling
+
+    __table_args__ = (
+        # One bid per delivery person per order; also answers the duplicate check
+        Index('idx_bid_delivery_person_order', 'deliveryPersonID', 'orderID', unique=True),
+        # The bidder's latest bid for the throttle: MAX(created_at) reads one index entry
+        Index('idx_bid_delivery_person_created', 'deliveryPersonID', created_at.desc()),
+    )
 
     # Relationships
-    delivery_person = relationship("Account", back_populates="bids")
-    order = relationship("Order", back_populates="bids", foreign_keys=[orderID])
-    order_accepted = relationship("Order", back_populates="accepted_bid", foreign_keys="Order.bidID")
+    delivery_person = relationship(Account, back_populates="bids")
+    order = relationship(Order, back_populates="bids", foreign_keys=[orderID])
+    order_accepted = relationship(Order, back_populates="accepted_bid", foreign_keys="Order.bidID")
 
 
 class Thread(Base):
@@ -174,8 +338,8 @@ class Thread(Base):
     restaurantID = Column(Integer, ForeignKey("restaurant.id", ondelete="CASCADE"), nullable=True)
 
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="threads")
-    posts = relationship("Post", back_populates="thread", cascade="all, delete-orphan")
+    restaurant = relationship(Restaurant, back_populates="threads")
+    posts = relationship("Post", back_populates="thread", cascade="all, delete-orphan", lazy="selectin")
 
 
 class Post(Base):
@@ -186,12 +350,12 @@ class Post(Base):
     threadID = Column(Integer, ForeignKey("thread.id", ondelete="CASCADE"), nullable=False)
     posterID = Column(Integer, ForeignKey("accounts.ID", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=True)
-    body = Column(Text, nullable=False)
-    datetime = Column(Text, nullable=True)  # Stored as text per schema
+    body = deferred(Column(Text, nullable=False))  # Loaded on access; undefer() to fetch eagerly
+    datetime = Column(IsoTimestamp, nullable=True, server_default=func.now())
 
     # Relationships
-    thread = relationship("Thread", back_populates="posts")
-    poster = relationship("Account", back_populates="posts")
+    thread = relationship(Thread, back_populates="posts")
+    poster = relationship(Account, back_populates="posts")
 
 
 class AgentQuery(Base):
@@ -203,8 +367,8 @@ class AgentQuery(Base):
     restaurantID = Column(Integer, ForeignKey("restaurant.id", ondelete="CASCADE"), nullable=True)
 
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="agent_queries")
-    answers = relationship("AgentAnswer", back_populates="query", cascade="all, delete-orphan")
+    restaurant = relationship(Restaurant, back_populates="agent_queries")
+    answers = relationship("AgentAnswer", back_populates="query", cascade="all, delete-orphan", lazy="selectin")
 
 
 class AgentAnswer(Base):
@@ -213,12 +377,13 @@ class AgentAnswer(Base):
 
     ID = Column(Integer, primary_key=True)
     queryID = Column(Integer, ForeignKey("agent_query.id", ondelete="CASCADE"), nullable=False)
-    answer = Column(Text, nullable=False)
-    average_rating = Column(Numeric(3, 2), nullable=True, default=0.00)
+    answer = deferred(Column(Text, nullable=False))  # Loaded on access; undefer() to fetch eagerly
+    avg_rating_x100 = Column(SmallInteger, nullable=True, default=0)  # Rating * 100
+    average_rating = scaled_rating('avg_rating_x100')
     reviews = Column(Integer, nullable=False, default=0)
 
     # Relationships
-    query = relationship("AgentQuery", back_populates="answers")
+    query = relationship(AgentQuery, back_populates="answers")
 
 
 class DeliveryRating(Base):
@@ -226,14 +391,15 @@ class DeliveryRating(Base):
     __tablename__ = "DeliveryRating"
 
     accountID = Column(Integer, ForeignKey("accounts.ID", ondelete="CASCADE"), primary_key=True)
-    averageRating = Column(Numeric(3, 2), nullable=True, default=0.00)
+    avg_rating_x100 = Column(SmallInteger, nullable=True, default=0)  # Rating * 100
+    averageRating = scaled_rating('avg_rating_x100')
     reviews = Column(Integer, nullable=False, default=0)
     total_deliveries = Column(Integer, nullable=False, default=0)
     on_time_deliveries = Column(Integer, nullable=False, default=0)
     avg_delivery_minutes = Column(Integer, nullable=False, default=30)
 
     # Relationships
-    account = relationship("Account", back_populates="delivery_rating")
+    account = relationship(Account, back_populates="delivery_rating")
 
 
 class Complaint(Base):
@@ -250,7 +416,7 @@ class Complaint(Base):
     resolution = Column(String(50), nullable=True)  # dismissed, warning_issued, upheld, dismissed_with_warning
     resolved_by = Column(Integer, ForeignKey("accounts.ID", ondelete="SET NULL"), nullable=True)
     resolved_at = Column(Text, nullable=True)  # ISO timestamp
-    created_at = Column(Text, nullable=True)  # ISO timestamp
+    created_at = Column(IsoTimestamp, nullable=True, server_default=func.now())
     
     # Dispute fields
     disputed = Column(Boolean, nullable=False, default=False)  # Whether complaint has been disputed
@@ -260,11 +426,15 @@ class Complaint(Base):
     # Target type tracking for filing rules
     target_type = Column(String(50), nullable=True)  # 'chef', 'delivery', 'customer' - role of person complained about
 
+    __table_args__ = (
+        Index('idx_complaint_account_status', 'accountID', 'status'),
+    )
+
     # Relationships
-    account = relationship("Account", back_populates="complaints_about", foreign_keys=[accountID])
-    filer_account = relationship("Account", back_populates="complaints_filed", foreign_keys=[filer])
-    order = relationship("Order", backref="complaints")
-    resolver = relationship("Account", foreign_keys=[resolved_by])
+    account = relationship(Account, back_populates="complaints_about", foreign_keys=[accountID])
+    filer_account = relationship(Account, back_populates="complaints_filed", foreign_keys=[filer])
+    order = relationship(Order, back_populates="complaints")
+    resolver = relationship(Account, foreign_keys=[resolved_by])
 
 
 class ClosureRequest(Base):
@@ -275,7 +445,7 @@ class ClosureRequest(Base):
     reason = Column(Text, nullable=True)
 
     # Relationships
-    account = relationship("Account", back_populates="closure_request")
+    account = relationship(Account, back_populates="closure_request")
 
 
 class OpenRequest(Base):
@@ -288,7 +458,7 @@ class OpenRequest(Base):
     password = Column(String(255), nullable=False)
 
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="open_requests")
+    restaurant = relationship(Restaurant, back_populates="open_requests")
 
 
 class Transaction(Base):
@@ -304,10 +474,28 @@ class Transaction(Base):
     reference_type = Column(String(50), nullable=True)  # 'order', 'deposit', etc.
     reference_id = Column(Integer, nullable=True)  # ID of the related order, etc.
     description = Column(Text, nullable=True)
-    created_at = Column(Text, nullable=False)  # ISO timestamp
+    created_at = Column(IsoTimestamp, nullable=False, server_default=func.now())
+
+    # On Postgres the table is partitioned by month on created_at with primary
+    # key (id, created_at) (migration 20251212_030); id alone stays unique.
+    __table_args__ = (
+        # Ledger reads are "recent N for account X"
+        Index('idx_transactions_account_created', 'accountID', created_at.desc()),
+        # Same, filtered by type (transaction history page). Keyed in the
+        # page's (created_at, id) order and covering the remaining columns,
+        # so Postgres answers a page with an index-only scan
+        Index(
+            'idx_transactions_account_type_page',
+            'accountID', 'transaction_type', created_at.desc(), id.desc(),
+            postgresql_include=[
+                'amount_cents', 'balance_before', 'balance_after',
+                'reference_type', 'reference_id', 'description'
+            ]
+        ),
+    )
 
     # Relationships
-    account = relationship("Account", back_populates="transactions")
+    account = relationship(Account, back_populates="transactions")
 
 
 class AuditLog(Base):
@@ -321,13 +509,44 @@ class AuditLog(Base):
     complaint_id = Column(Integer, ForeignKey("complaint.id", ondelete="SET NULL"), nullable=True)
     order_id = Column(Integer, ForeignKey("orders.id", ondelete="SET NULL"), nullable=True)
     details = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)  # Additional context
-    created_at = Column(Text, nullable=False)  # ISO timestamp
+    created_at = Column(IsoTimestamp, nullable=False, server_default=func.now())
+
+    # Frequent details keys stored as typed columns (NULL when not applicable)
+    new_rating = Column(SmallInteger, nullable=True)
+    old_avg_x100 = Column(SmallInteger, nullable=True)  # Rating * 100
+    new_avg_x100 = Column(SmallInteger, nullable=True)  # Rating * 100
+    total_ratings = Column(Integer, nullable=True)
+    old_complaint_count = Column(Integer, nullable=True)
+    new_complaint_count = Column(Integer, nullable=True)
+
+    # On Postgres the table is partitioned by month on created_at with primary
+    # key (id, created_at) (migration 20251212_030); id alone stays unique.
+    __table_args__ = (
+        # Append-only, so created_at follows physical order - a tiny BRIN
+        # index serves time-range scans of the audit trail
+        Index('idx_audit_log_created_brin', created_at, postgresql_using='brin'),
+    )
+
+    @property
+    def full_details(self) -> dict:
+        """details with the typed columns merged back under their original keys"""
+        merged = {
+            "new_rating": self.new_rating,
+            "old_avg": None if self.old_avg_x100 is None else self.old_avg_x100 / 100,
+            "new_avg": None if self.new_avg_x100 is None else self.new_avg_x100 / 100,
+            "total_ratings": self.total_ratings,
+            "old_complaint_count": self.old_complaint_count,
+            "new_complaint_count": self.new_complaint_count,
+        }
+        merged = {k: v for k, v in merged.items() if v is not None}
+        merged.update(self.details or {})
+        return merged
 
     # Relationships
-    actor = relationship("Account", foreign_keys=[actor_id])
-    target = relationship("Account", foreign_keys=[target_id])
-    complaint = relationship("Complaint")
-    order = relationship("Order")
+    actor = relationship(Account, foreign_keys=[actor_id])
+    target = relationship(Account, foreign_keys=[target_id])
+    complaint = relationship(Complaint)
+    order = relationship(Order)
 
 
 class Blacklist(Base):
@@ -342,7 +561,7 @@ class Blacklist(Base):
     created_at = Column(Text, nullable=False)  # ISO timestamp
 
     # Relationships
-    blacklisted_by_account = relationship("Account", foreign_keys=[blacklisted_by])
+    blacklisted_by_account = relationship(Account, foreign_keys=[blacklisted_by])
 
 
 class ManagerNotification(Base):
@@ -356,11 +575,16 @@ class ManagerNotification(Base):
     related_account_id = Column(Integer, ForeignKey("accounts.ID", ondelete="SET NULL"), nullable=True)
     related_order_id = Column(Integer, ForeignKey("orders.id", ondelete="SET NULL"), nullable=True)
     is_read = Column(Boolean, nullable=False, default=False)
-    created_at = Column(Text, nullable=False)  # ISO timestamp
+    created_at = Column(IsoTimestamp, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Only unread rows are indexed, so the index tracks the inbox, not history
+        Index('idx_manager_notifications_unread', created_at.desc(), postgresql_where=is_read == False),
+    )
 
     # Relationships
-    related_account = relationship("Account", foreign_keys=[related_account_id])
-    related_order = relationship("Order")
+    related_account = relationship(Account, foreign_keys=[related_account_id])
+    related_order = relationship(Order)
 
 
 class KnowledgeBase(Base):
@@ -378,7 +602,7 @@ class KnowledgeBase(Base):
     updated_at = Column(Text, nullable=True)
 
     # Relationships
-    author = relationship("Account", foreign_keys=[author_id])
+    author = relationship(Account, foreign_keys=[author_id])
     chat_logs = relationship("ChatLog", back_populates="kb_entry")
 
 
@@ -398,12 +622,20 @@ class ChatLog(Base):
     reviewed = Column(Boolean, nullable=False, default=False)
     reviewed_by = Column(Integer, ForeignKey("accounts.ID", ondelete="SET NULL"), nullable=True)
     reviewed_at = Column(Text, nullable=True)
-    created_at = Column(Text, nullable=True)
+    created_at = Column(IsoTimestamp, nullable=True, server_default=func.now())
+
+    __table_args__ = (
+        # Manager review queue: flagged chats not yet reviewed
+        Index(
+            'idx_chat_log_flagged_unreviewed', created_at.desc(),
+            postgresql_where=(flagged == True) & (reviewed == False)
+        ),
+    )
 
     # Relationships
-    user = relationship("Account", foreign_keys=[user_id])
-    kb_entry = relationship("KnowledgeBase", back_populates="chat_logs")
-    reviewer = relationship("Account", foreign_keys=[reviewed_by])
+    user = relationship(Account, foreign_keys=[user_id])
+    kb_entry = relationship(KnowledgeBase, back_populates="chat_logs")
+    reviewer = relationship(Account, foreign_keys=[reviewed_by])
 
 
 class VoiceReport(Base):
@@ -429,14 +661,19 @@ class VoiceReport(Base):
     manager_notes = Column(Text, nullable=True)
     resolved_by = Column(Integer, ForeignKey("accounts.ID", ondelete="SET NULL"), nullable=True)
     resolved_at = Column(Text, nullable=True)  # ISO timestamp
-    created_at = Column(Text, nullable=False)
+    created_at = Column(IsoTimestamp, nullable=False, server_default=func.now())
     updated_at = Column(Text, nullable=False)
 
+    __table_args__ = (
+        # Background processing polls unprocessed reports by status
+        Index('idx_voice_reports_unprocessed', status, postgresql_where=is_processed == False),
+    )
+
     # Relationships
-    submitter = relationship("Account", foreign_keys=[submitter_id], backref="voice_reports_submitted")
-    related_account = relationship("Account", foreign_keys=[related_account_id])
-    related_order = relationship("Order", foreign_keys=[related_order_id])
-    resolver = relationship("Account", foreign_keys=[resolved_by])
+    submitter = relationship(Account, foreign_keys=[submitter_id], back_populates="voice_reports_submitted")
+    related_account = relationship(Account, foreign_keys=[related_account_id])
+    related_order = relationship(Order, foreign_keys=[related_order_id])
+    resolver = relationship(Account, foreign_keys=[resolved_by])
 
 
 class DishReview(Base):
@@ -457,9 +694,9 @@ class DishReview(Base):
     )
 
     # Relationships
-    dish = relationship("Dish", backref="dish_reviews")
-    account = relationship("Account", backref="dish_reviews")
-    order = relationship("Order", backref="dish_reviews")
+    dish = relationship(Dish, back_populates="dish_reviews")
+    account = relationship(Account, back_populates="dish_reviews")
+    order = relationship(Order, back_populates="dish_reviews")
 
 
 class OrderDeliveryReview(Base):
@@ -480,9 +717,9 @@ class OrderDeliveryReview(Base):
     )
 
     # Relationships
-    order = relationship("Order", backref="delivery_review")
-    delivery_person = relationship("Account", foreign_keys=[delivery_person_id], backref="delivery_reviews_received")
-    reviewer = relationship("Account", foreign_keys=[reviewer_id], backref="delivery_reviews_given")
+    order = relationship(Order, back_populates="delivery_review")
+    delivery_person = relationship(Account, foreign_keys=[delivery_person_id], back_populates="delivery_reviews_received")
+    reviewer = relationship(Account, foreign_keys=[reviewer_id], back_populates="delivery_reviews_given")
 
 
 class CustomerReview(Base):
@@ -504,9 +741,9 @@ class CustomerReview(Base):
     )
 
     # Relationships
-    order = relationship("Order", backref="customer_review")
-    customer = relationship("Account", foreign_keys=[customer_id], backref="customer_reviews_received")
-    reviewer = relationship("Account", foreign_keys=[reviewer_id], backref="customer_reviews_given")
+    order = relationship(Order, back_populates="customer_review")
+    customer = relationship(Account, foreign_keys=[customer_id], back_populates="customer_reviews_received")
+    reviewer = relationship(Account, foreign_keys=[reviewer_id], back_populates="customer_reviews_given")
 
 
 class VIPHistory(Base):
@@ -522,8 +759,8 @@ class VIPHistory(Base):
     created_at = Column(Text, nullable=False)  # ISO timestamp
 
     # Relationships
-    account = relationship("Account", foreign_keys=[account_id], backref="vip_history")
-    changed_by_account = relationship("Account", foreign_keys=[changed_by])
+    account = relationship(Account, foreign_keys=[account_id], back_populates="vip_history")
+    changed_by_account = relationship(Account, foreign_keys=[changed_by])
 
 
 class AccountProfile(Base):
@@ -541,7 +778,7 @@ class AccountProfile(Base):
     updated_at = Column(Text, nullable=True)
 
     # Relationships
-    account = relationship("Account", backref="profile", uselist=False)
+    account = relationship(Account, back_populates="profile", uselist=False)
 
 
 class ForumThread(Base):
@@ -559,7 +796,7 @@ class ForumThread(Base):
     updated_at = Column(Text, nullable=True)
 
     # Relationships
-    author = relationship("Account", backref="forum_threads")
+    author = relationship(Account, back_populates="forum_threads")
     posts = relationship("ForumPost", back_populates="thread", cascade="all, delete-orphan")
 
 
@@ -576,8 +813,8 @@ class ForumPost(Base):
     updated_at = Column(Text, nullable=True)
 
     # Relationships
-    thread = relationship("ForumThread", back_populates="posts")
-    author = relationship("Account", backref="forum_posts")
+    thread = relationship(ForumThread, back_populates="posts")
+    author = relationship(Account, back_populates="forum_posts")
 
 
 class KBContribution(Base):
@@ -598,6 +835,11 @@ class KBContribution(Base):
     updated_at = Column(Text, nullable=True)
 
     # Relationships
-    submitter = relationship("Account", foreign_keys=[submitter_id], backref="kb_contributions")
-    reviewer = relationship("Account", foreign_keys=[reviewed_by])
-    created_kb_entry = relationship("KnowledgeBase", foreign_keys=[created_kb_entry_id])
+    submitter = relationship(Account, foreign_keys=[submitter_id], back_populates="kb_contributions")
+    reviewer = relationship(Account, foreign_keys=[reviewed_by])
+    created_kb_entry = relationship(KnowledgeBase, foreign_keys=[created_kb_entry_id])
+
+
+# Resolve all relationships now, at import time, rather than on the
+# first query a fresh worker serves.
+configure_mappers()
@@ -30,14 +30,26 @@ TRIGGER POINTS:
 - Every demotion/bonus update
 """
 
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict
 from datetime import datetime, timezone
-from decimal import Decimal
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm import load_only, raiseload, selectinload
+from sqlalchemy import bindparam, case, delete, event, exists, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.auth import profile_cache
+from app.database import SessionLocal
 from app.models import (
     Account, Complaint, AuditLog, Blacklist, ManagerNotification,
     Dish, Order, Bid, DeliveryRating
@@ -59,6 +71,19 @@ EMPLOYEE_DEMOTION_FIRE_THRESHOLD = 2  # At or above → fired
 EMPLOYEE_WAGE_DEMOTION_PERCENT = 0.10  # 10% wage reduction on demotion
 EMPLOYEE_BONUS_PERCENT = 0.10  # 10% wage increase on bonus
 
+# Rating thresholds in rolling_avg_x100 units: rules compare the stored
+# integers directly instead of converting every employee's rating to float
+_LOW_RATING_X100 = round(EMPLOYEE_LOW_RATING_THRESHOLD * 100)
+_HIGH_RATING_X100 = round(EMPLOYEE_HIGH_RATING_THRESHOLD * 100)
+
+# Display labels for account types in notification messages
+_ROLE_LABELS = {
+    "chef": "Chef",
+    "delivery": "Delivery",
+    "customer": "Customer",
+    "vip": "Vip",
+}
+
 # Customer thresholds
 CUSTOMER_WARNING_THRESHOLD = 3  # At or above → deregistration
 VIP_WARNING_DOWNGRADE_THRESHOLD = 2  # At or above → VIP demoted to registered
@@ -68,11 +93,92 @@ VIP_WARNING_DOWNGRADE_THRESHOLD = 2  # At or above → VIP demoted to registered
 # Utility Functions
 # ============================================================
 
+def _get_account(db: Session, account_id: int) -> Optional[Account]:
+    """
+    Load an account for rule processing; relationships are never loaded.
+    An account already in the session's identity map costs no query.
+    """
+    return db.get(Account, account_id, options=[raiseload("*")])
+
+
+def _rounded_div(numerator: int, denominator: int) -> int:
+    """Integer division rounded half-up (for non-negative scaled ratings)"""
+    return (numerator + denominator // 2) // denominator
+
+
+def _role_label(account_type: str) -> str:
+    """Capitalized account type for messages, without re-capitalizing known types"""
+    return _ROLE_LABELS.get(account_type) or account_type.capitalize()
+
+
 def get_iso_now() -> str:
     """Get current timestamp as ISO string"""
     return datetime.now(timezone.utc).isoformat()
 
 
+# Session.info keys for rows buffered until the session commits
+AUDIT_BUFFER_KEY = "audit_buffer"
+NOTIFICATION_BUFFER_KEY = "notification_buffer"
+# Session.info key for account IDs written in the current transaction
+REPUTATION_TOUCHED_KEY = "reputation_touched"
+# Session.info key for {employee_id: actor_id} awaiting rule evaluation at commit
+PENDING_RULE_EVALS_KEY = "pending_rule_evals"
+# Session.info key for blacklist rows collected while resolve_disputes runs
+BLACKLIST_BATCH_KEY = "blacklist_batch"
+
+# Buffered audit rows are written early once this many are pending, so a
+# large batch (e.g. run_all_employee_evaluations) does not hold them all
+AUDIT_BUFFER_FLUSH_SIZE = 500
+
+# Hand committed audit entries and notifications to audit_writer instead of
+# inserting them inside the request's transaction (opt-in)
+ASYNC_AUDIT_WRITES = os.getenv("ASYNC_AUDIT_WRITES", "false").lower() == "true"
+AUDIT_WRITER_MAX_WAIT_SECONDS = 0.2
+
+# Statements are built once and reused; SQLAlchemy's compiled cache then
+# serves the compiled form for each dialect without re-building the construct
+_AUDIT_INSERT = insert(AuditLog)
+_AUDIT_INSERT_RETURNING_ID = insert(AuditLog).returning(AuditLog.id)
+_NOTIFICATION_INSERT = insert(ManagerNotification)
+_BLACKLIST_INSERT = insert(Blacklist)
+
+# Postgres channel signalled whenever manager notifications are written;
+# listeners get {notification_type: count} and re-read the table
+MANAGER_EVENTS_CHANNEL = "manager_events"
+_MANAGER_EVENTS_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+# Typed audit_log columns for the most frequent details keys. Every row
+# carries all of them so buffered rows share one executemany parameter set.
+AUDIT_METRIC_COLUMNS = (
+    "new_rating", "old_avg_x100", "new_avg_x100",
+    "total_ratings", "old_complaint_count", "new_complaint_count",
+)
+
+
+def _audit_row(
+    action_type: str,
+    actor_id: Optional[int],
+    target_id: Optional[int],
+    complaint_id: Optional[int],
+    order_id: Optional[int],
+    details: Optional[dict],
+    **metrics: Optional[int]
+) -> Dict[str, Any]:
+    """Build an audit_log row as a plain dict"""
+    row = {
+        "action_type": action_type,
+        "actor_id": actor_id,
+        "target_id": target_id,
+        "complaint_id": complaint_id,
+        "order_id": order_id,
+        "details": details or {}
+    }
+    for column in AUDIT_METRIC_COLUMNS:
+        row[column] = metrics.get(column)
+    return row
+
+
 def create_audit_entry(
     db: Session,
     action_type: str,
@@ -80,21 +186,105 @@ def create_audit_entry(
     target_id: Optional[int] = None,
     complaint_id: Optional[int] = None,
     order_id: Optional[int] = None,
-    details: Optional[dict] = None
-) -> AuditLog:
-    """Create an immutable audit log entry"""
-    entry = AuditLog(
-        action_type=action_type,
-        actor_id=actor_id,
-        target_id=target_id,
-        complaint_id=complaint_id,
-        order_id=order_id,
-        details=details or {},
-        created_at=get_iso_now()
+    details: Optional[dict] = None,
+    new_rating: Optional[int] = None,
+    old_avg_x100: Optional[int] = None,
+    new_avg_x100: Optional[int] = None,
+    total_ratings: Optional[int] = None,
+    old_complaint_count: Optional[int] = None,
+    new_complaint_count: Optional[int] = None
+) -> None:
+    """
+    Queue an immutable audit log entry (created_at is set by the database).
+    
+    Rating/count values go in their typed columns; details holds anything
+    else. Rows are buffered on the session and written with a single
+    executemany INSERT when the session commits (see flush_reputation_buffers),
+    or earlier in chunks of AUDIT_BUFFER_FLUSH_SIZE; early chunks still belong
+    to the open transaction. With ASYNC_AUDIT_WRITES the buffer is instead
+    handed to audit_writer once the transaction has committed. Use
+    insert_audit_entry() when the new row's id is needed right away.
+    """
+    buffer = db.info.setdefault(AUDIT_BUFFER_KEY, [])
+    buffer.append(
+        _audit_row(
+            action_type, actor_id, target_id, complaint_id, order_id, details,
+            new_rating=new_rating,
+            old_avg_x100=old_avg_x100,
+            new_avg_x100=new_avg_x100,
+            total_ratings=total_ratings,
+            old_complaint_count=old_complaint_count,
+            new_complaint_count=new_complaint_count
+        )
     )
-    db.add(entry)
-    db.flush()
-    return entry
+    if not ASYNC_AUDIT_WRITES and len(buffer) >= AUDIT_BUFFER_FLUSH_SIZE:
+        # Flush pending ORM objects first so FK targets exist
+        db.flush()
+        db.execute(_AUDIT_INSERT, db.info.pop(AUDIT_BUFFER_KEY))
+
+
+def insert_audit_entry(
+    db: Session,
+    action_type: str,
+    actor_id: Optional[int] = None,
+    target_id: Optional[int] = None,
+    complaint_id: Optional[int] = None,
+    order_id: Optional[int] = None,
+    details: Optional[dict] = None
+) -> int:
+    """Write an audit log entry immediately and return its id"""
+    return db.execute(
+        _AUDIT_INSERT_RETURNING_ID,
+        _audit_row(action_type, actor_id, target_id, complaint_id, order_id, details)
+    ).scalar_one()
+
+
+def resolve_complaint_with_audit(
+    db: Session,
+    complaint: Complaint,
+    resolution: str,
+    action_type: str,
+    actor_id: int,
+    target_id: Optional[int] = None,
+    details: Optional[dict] = None
+) -> int:
+    """
+    Mark a complaint resolved and write its audit entry in one round trip.
+    
+    On PostgreSQL the complaint UPDATE runs in a data-modifying CTE that feeds
+    the audit INSERT ... RETURNING id. SQLite does not allow DML in a CTE, so
+    other backends issue the two statements back to back. The loaded
+    complaint is synced without being marked dirty. Returns the audit entry id.
+    """
+    resolved_values = {
+        "status": "resolved",
+        "resolution": resolution,
+        "resolved_by": actor_id,
+        "resolved_at": get_iso_now(),
+    }
+    resolve = update(Complaint).where(Complaint.id == complaint.id).values(**resolved_values)
+    row = _audit_row(action_type, actor_id, target_id, complaint.id, complaint.order_id, details)
+    
+    if db.get_bind().dialect.name == "postgresql":
+        resolved = resolve.returning(Complaint.id).cte("resolved_complaint")
+        audit_columns = AuditLog.__table__.c
+        audit_id = db.execute(
+            insert(AuditLog).from_select(
+                list(row),
+                select(*[
+                    resolved.c.id if column == "complaint_id" else literal(value, audit_columns[column].type)
+                    for column, value in row.items()
+                ])
+            ).returning(AuditLog.id)
+        ).scalar_one()
+    else:
+        db.execute(resolve.execution_options(synchronize_session=False))
+        audit_id = db.execute(_AUDIT_INSERT_RETURNING_ID, row).scalar_one()
+    
+    for attr, value in resolved_values.items():
+        set_committed_value(complaint, attr, value)
+    
+    return audit_id
 
 
 def create_manager_notification(
@@ -103,21 +293,337 @@ def create_manager_notification(
     title: str,
     message: str,
     related_account_id: Optional[int] = None,
-    related_order_id: Optional[int] = None
-) -> ManagerNotification:
-    """Create a notification for managers"""
-    notification = ManagerNotification(
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        related_account_id=related_account_id,
-        related_order_id=related_order_id,
-        is_read=False,
-        created_at=get_iso_now()
-    )
-    db.add(notification)
-    db.flush()
-    return notification
+    related_order_id: Optional[int] = None,
+    message_params: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Queue a notification for managers (written once the session commits).
+    
+    With message_params, message is a str.format template rendered only when
+    the row is written (see _render_notification); *_cents params render as
+    dollars, e.g. "${wage_cents}" -> "$10.50".
+    """
+    row = {
+        "notification_type": notification_type,
+        "title": title,
+        "message": message,
+        "related_account_id": related_account_id,
+        "related_order_id": related_order_id,
+        "is_read": False
+    }
+    if message_params:
+        row["message_params"] = message_params
+    db.info.setdefault(NOTIFICATION_BUFFER_KEY, []).append(row)
+
+
+def _render_notification(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a buffered notification's message template into an insertable row"""
+    params = row.pop("message_params", None)
+    if params:
+        row["message"] = row["message"].format(**{
+            key: f"{value / 100:.2f}" if key.endswith("_cents") else value
+            for key, value in params.items()
+        })
+    return row
+
+
+def notify_manager_listeners(db: Session, notification_rows: List[Dict[str, Any]]) -> None:
+    """
+    Signal MANAGER_EVENTS_CHANNEL once for a batch of written notifications.
+    
+    Postgres delivers the NOTIFY when the transaction commits, so listeners
+    never see rows that were rolled back. No-op on other databases.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    counts = Counter(row["notification_type"] for row in notification_rows)
+    db.execute(_MANAGER_EVENTS_NOTIFY, {
+        "channel": MANAGER_EVENTS_CHANNEL,
+        "payload": json.dumps(counts)
+    })
+
+
+def flush_reputation_buffers(db: Session) -> None:
+    """Write all buffered audit entries and notifications, one INSERT per table"""
+    audit_rows = db.info.pop(AUDIT_BUFFER_KEY, None)
+    notification_rows = db.info.pop(NOTIFICATION_BUFFER_KEY, None)
+    
+    if audit_rows:
+        db.execute(_AUDIT_INSERT, audit_rows)
+    if notification_rows:
+        db.execute(_NOTIFICATION_INSERT, [_render_notification(row) for row in notification_rows])
+        notify_manager_listeners(db, notification_rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_buffers_before_commit(session: Session) -> None:
+    """Run deferred rule evaluations, then write buffered rows inside the committing transaction"""
+    # Rules may buffer audit entries and notifications of their own
+    run_pending_rule_evaluations(session)
+    if ASYNC_AUDIT_WRITES:
+        return
+    if session.info.get(AUDIT_BUFFER_KEY) or session.info.get(NOTIFICATION_BUFFER_KEY):
+        # Flush pending ORM objects first so FK targets exist
+        session.flush()
+        flush_reputation_buffers(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _hand_off_buffers_after_commit(session: Session) -> None:
+    """Queue the committed transaction's buffered rows on audit_writer"""
+    if not ASYNC_AUDIT_WRITES:
+        return
+    audit_rows = session.info.pop(AUDIT_BUFFER_KEY, None)
+    notification_rows = session.info.pop(NOTIFICATION_BUFFER_KEY, None)
+    if audit_rows:
+        audit_writer.submit(_AUDIT_INSERT, audit_rows)
+    if notification_rows:
+        # Templates are rendered here so a bad one is caught with its own
+        # request rather than inside a batch shared with other requests
+        rendered = []
+        for row in notification_rows:
+            try:
+                rendered.append(_render_notification(row))
+            except Exception:
+                logger.exception(f"Failed to render {row['notification_type']} notification")
+        if rendered:
+            audit_writer.submit(_NOTIFICATION_INSERT, rendered)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_buffers_after_rollback(session: Session) -> None:
+    """Buffered rows belong to the rolled-back transaction - drop them"""
+    session.info.pop(AUDIT_BUFFER_KEY, None)
+    session.info.pop(NOTIFICATION_BUFFER_KEY, None)
+    session.info.pop(REPUTATION_TOUCHED_KEY, None)
+    session.info.pop(PENDING_RULE_EVALS_KEY, None)
+
+
+# ============================================================
+# Asynchronous Audit Writer
+# ============================================================
+
+class BackgroundRowWriter:
+    """
+    Daemon thread that bulk-inserts rows handed off by committed sessions.
+    
+    Rows are drained from a queue until max_rows are collected or max_wait
+    seconds have passed since the first one, then written with one
+    executemany per statement in the writer's own session. Only rows of
+    committed transactions are submitted, so the request never waits on
+    these INSERTs. If a batch fails, its rows are retried one at a time so
+    only the rows that cannot be written are logged and dropped.
+    """
+    
+    _STOP = object()
+    
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_rows: int = AUDIT_BUFFER_FLUSH_SIZE,
+        max_wait_seconds: float = AUDIT_WRITER_MAX_WAIT_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_wait = max_wait_seconds
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, statement, rows: List[Dict[str, Any]]) -> None:
+        """Queue insertable rows for statement; never blocks"""
+        for row in rows:
+            self._queue.put_nowait((statement, row))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far, then stop the thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+    
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+    
+    def _write(self, batch: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        rows_by_statement: Dict[Any, List[Dict[str, Any]]] = {}
+        for statement, row in batch:
+            rows_by_statement.setdefault(statement, []).append(row)
+        
+        db = self.session_factory()
+        try:
+            try:
+                self._insert(db, rows_by_statement)
+                db.commit()
+                return
+            except Exception:
+                db.rollback()
+                logger.warning(
+                    f"Failed to write {len(batch)} audit/notification rows as a batch, retrying one by one",
+                    exc_info=True
+                )
+            
+            # Rows come from unrelated requests; keep every row that can be written
+            for statement, rows in rows_by_statement.items():
+                for row in rows:
+                    try:
+                        self._insert(db, {statement: [row]})
+                        db.commit()
+                    except Exception:
+                        db.rollback()
+                        logger.exception(f"Dropped unwritable audit/notification row: {row}")
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _insert(db: Session, rows_by_statement: Dict[Any, List[Dict[str, Any]]]) -> None:
+        for statement, rows in rows_by_statement.items():
+            db.execute(statement, rows)
+        if _NOTIFICATION_INSERT in rows_by_statement:
+            notify_manager_listeners(db, rows_by_statement[_NOTIFICATION_INSERT])
+
+
+audit_writer = BackgroundRowWriter()
+
+
+# ============================================================
+# Reputation Counter Cache
+# ============================================================
+
+REPUTATION_CACHE_TTL_SECONDS = 300
+REPUTATION_CACHE_MAX_ENTRIES = 10000
+
+_REPUTATION_COUNTERS = select(
+    Account.ID, Account.email, Account.type, Account.employment_status,
+    Account.rolling_avg_x100, Account.total_rating_count,
+    Account.complaint_count, Account.compliment_count,
+    Account.times_demoted, Account.bonus_count, Account.is_fired, Account.wage
+)
+
+
+class ReputationCache:
+    """
+    In-process LRU cache of per-account reputation counters, keyed emp:{ID}.
+    
+    Entries expire after ttl_seconds. Accounts written in a transaction are
+    invalidated when it commits, and are never cached while the write is
+    still uncommitted.
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: int = REPUTATION_CACHE_TTL_SECONDS,
+        max_entries: int = REPUTATION_CACHE_MAX_ENTRIES
+    ):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _make_key(account_id: int) -> str:
+        return f"emp:{account_id}"
+    
+    def get(self, db: Session, account_id: int) -> Optional[Dict[str, Any]]:
+        """Get an account's counters, loading them on a miss; None if the account does not exist"""
+        # A session that wrote the account must see its own uncommitted values
+        if account_id not in db.info.get(REPUTATION_TOUCHED_KEY, ()):
+            key = self._make_key(account_id)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] > time.monotonic():
+                        self._entries.move_to_end(key)
+                        return dict(entry[1])
+                    del self._entries[key]
+        
+        row = db.execute(
+            _REPUTATION_COUNTERS.where(Account.ID == account_id)
+        ).mappings().first()
+        if row is None:
+            return None
+        
+        counters = dict(row)
+        # The SELECT may have autoflushed this session's writes; uncommitted
+        # values must not leak to other sessions
+        if account_id not in db.info.get(REPUTATION_TOUCHED_KEY, ()):
+            self.set(account_id, counters)
+        return counters
+    
+    def set(self, account_id: int, counters: Dict[str, Any]) -> None:
+        """Store an account's counters"""
+        key = self._make_key(account_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(counters))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, *account_ids: int) -> None:
+        """Drop cached counters for the given accounts"""
+        with self._lock:
+            for account_id in account_ids:
+                self._entries.pop(self._make_key(account_id), None)
+    
+    def clear(self) -> None:
+        """Drop all cached counters"""
+        with self._lock:
+            self._entries.clear()
+
+
+reputation_cache = ReputationCache()
+
+
+def touch_accounts(db: Session, account_ids) -> None:
+    """
+    Record accounts written outside the unit of work (Core UPDATEs), so their
+    cached counters and profiles are dropped when the transaction commits
+    """
+    db.info.setdefault(REPUTATION_TOUCHED_KEY, set()).update(account_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_accounts(session: Session, flush_context) -> None:
+    """Collect accounts written by this flush"""
+    account_ids = [
+        obj.ID for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Account) and obj.ID is not None
+    ]
+    if account_ids:
+        touch_accounts(session, account_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_accounts(session: Session) -> None:
+    """Committed writes make the cached counters and profiles stale"""
+    account_ids = session.info.pop(REPUTATION_TOUCHED_KEY, None)
+    if account_ids:
+        reputation_cache.invalidate(*account_ids)
+        profile_cache.invalidate(*account_ids)
 
 
 # ============================================================
@@ -128,47 +634,54 @@ def update_employee_rating(
     db: Session,
     employee: Account,
     new_rating: int,
-    actor_id: Optional[int] = None
+    actor_id: Optional[int] = None,
+    defer_rules: bool = False
 ) -> Dict[str, Any]:
     """
     Update employee's rolling average rating with a new rating.
-    Triggers rule engine evaluation afterward.
+    Triggers rule engine evaluation afterward, or queues it until commit
+    when defer_rules is set (rule_results is then None).
     
     Returns dict with rating update details and any triggered actions.
     """
     if employee.type not in ["chef", "delivery"]:
         return {"error": "Not an employee account"}
     
-    old_avg = float(employee.rolling_avg_rating or 0)
+    old_scaled = employee.rolling_avg_x100 or 0
     old_count = employee.total_rating_count or 0
     
-    # Calculate new rolling average
+    # Calculate new rolling average in rating*100 units (integer math only)
     new_count = old_count + 1
     if old_count == 0:
-        new_avg = float(new_rating)
+        new_scaled = new_rating * 100
     else:
-        new_avg = ((old_avg * old_count) + new_rating) / new_count
+        new_scaled = _rounded_div(old_scaled * old_count + new_rating * 100, new_count)
     
     # Update employee
-    employee.rolling_avg_rating = Decimal(str(round(new_avg, 2)))
+    employee.rolling_avg_x100 = new_scaled
     employee.total_rating_count = new_count
     
+    old_avg = old_scaled / 100
+    new_avg = new_scaled / 100
+    
     # Audit the rating update
     create_audit_entry(
         db,
         action_type="employee_rating_updated",
         actor_id=actor_id,
         target_id=employee.ID,
-        details={
-            "new_rating": new_rating,
-            "old_avg": old_avg,
-            "new_avg": new_avg,
-            "total_ratings": new_count
-        }
+        new_rating=new_rating,
+        old_avg_x100=old_scaled,
+        new_avg_x100=new_scaled,
+        total_ratings=new_count
     )
     
-    # Run rule engine
-    rule_results = evaluate_employee_rules(db, employee, actor_id)
+    # Run rule engine now, or once at commit when the caller batches events
+    if defer_rules:
+        defer_employee_rules(db, employee, actor_id)
+        rule_results = None
+    else:
+        rule_results = evaluate_employee_rules(db, employee, actor_id)
     
     return {
         "old_avg": old_avg,
@@ -178,27 +691,155 @@ def update_employee_rating(
     }
 
 
+# Per-chef review-weighted rating aggregate over reviewed dishes. Built once
+# with an expanding bind so every call hits the same compiled-cache entry.
+_CHEF_RATING_AGGREGATE = select(
+    Dish.chefID,
+    func.sum(Dish.avg_rating_x100 * Dish.reviews),
+    func.sum(Dish.reviews)
+).where(
+    Dish.chefID.in_(bindparam("chef_ids", expanding=True)),
+    Dish.reviews > 0
+).group_by(Dish.chefID)
+
+
+def recalculate_chef_ratings_bulk(
+    db: Session,
+    chef_ids: List[int]
+) -> Dict[int, Tuple[float, int]]:
+    """
+    Recalculate the rating of several chefs from their dish ratings.
+    
+    A chef's rating is the review-weighted mean of their dish averages, i.e.
+    the mean of every review they received. One GROUP BY query computes
+    every chef's aggregate and one table-level executemany UPDATE writes
+    them back. Chefs without reviewed dishes are reset to 0.0 / 0.
+    Returns {chef_id: (average_rating, total_reviews)}.
+    """
+    if not chef_ids:
+        return {}
+    
+    rows = db.execute(_CHEF_RATING_AGGREGATE, {"chef_ids": list(chef_ids)}).all()
+    
+    scaled = {chef_id: (0, 0) for chef_id in chef_ids}
+    for chef_id, weighted_sum, total_reviews in rows:
+        total_reviews = int(total_reviews or 0)
+        if total_reviews:
+            scaled[chef_id] = (_rounded_div(int(weighted_sum or 0), total_reviews), total_reviews)
+    
+    mappings = [
+        {"account_id": chef_id, "rolling_avg_x100": avg_x100, "total_rating_count": total_reviews}
+        for chef_id, (avg_x100, total_reviews) in scaled.items()
+    ]
+    # Table-level executemany: the ORM's bulk-by-primary-key UPDATE would
+    # also demand (and check) each chef's version_id
+    accounts = Account.__table__
+    db.execute(
+        update(accounts)
+        .where(accounts.c.ID == bindparam("account_id"))
+        .values(
+            rolling_avg_x100=bindparam("rolling_avg_x100"),
+            total_rating_count=bindparam("total_rating_count")
+        ),
+        mappings
+    )
+    touch_accounts(db, scaled)
+    
+    # Bulk UPDATE bypasses the identity map; sync already-loaded chefs
+    # without marking them dirty (which would re-issue the UPDATE on flush)
+    for mapping in mappings:
+        chef = db.identity_map.get(identity_key(Account, mapping["account_id"]))
+        if chef is not None:
+            set_committed_value(chef, "rolling_avg_x100", mapping["rolling_avg_x100"])
+            set_committed_value(chef, "total_rating_count", mapping["total_rating_count"])
+    
+    return {
+        chef_id: (avg_x100 / 100, total_reviews)
+        for chef_id, (avg_x100, total_reviews) in scaled.items()
+    }
+
+
+def recalculate_all_chef_ratings(db: Session) -> int:
+    """
+    Recalculate every active chef's rating from their dishes in one UPDATE.
+    
+    Same review-weighted, half-up rounded average as recalculate_chef_ratings_bulk,
+    but computed by correlated subqueries inside the database, so no chef IDs
+    or aggregates round-trip through Python. Intended for full reconciliation
+    in a fresh session: loaded Account instances are not synced. Returns the
+    number of chefs updated.
+    """
+    reviewed = (Dish.chefID == Account.ID) & (Dish.reviews > 0)
+    weighted_sum = select(func.sum(Dish.avg_rating_x100 * Dish.reviews)).where(reviewed).scalar_subquery()
+    total_reviews = select(func.sum(Dish.reviews)).where(reviewed).scalar_subquery()
+    
+    chef_ids = db.execute(
+        update(Account)
+        .where(Account.type == "chef", Account.is_fired == False)
+        .values(
+            rolling_avg_x100=func.coalesce((weighted_sum + total_reviews // 2) // total_reviews, 0),
+            total_rating_count=func.coalesce(total_reviews, 0)
+        )
+        .returning(Account.ID)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    touch_accounts(db, chef_ids)
+    return len(chef_ids)
+
+
 def recalculate_chef_rating_from_dishes(db: Session, chef: Account) -> Tuple[float, int]:
     """
     Recalculate a chef's rating from their dish ratings.
     Returns (average_rating, total_reviews).
+    
+    Full rescan of the chef's dishes - the review hot path uses
+    apply_dish_rating_change(); this is for periodic reconciliation.
+    """
+    return recalculate_chef_ratings_bulk(db, [chef.ID])[chef.ID]
+
+
+def apply_dish_rating_change(
+    db: Session,
+    chef: Account,
+    old_dish_avg_x100: int,
+    old_dish_reviews: int,
+    new_dish_avg_x100: int,
+    new_dish_reviews: int
+) -> Tuple[float, int]:
+    """
+    Incrementally update a chef's rating after one of their dishes changed.
+    
+    Swaps the dish's old contribution (avg * reviews) for its new one in the
+    chef's running total, then writes the result with a single UPDATE.
+    Dish averages are passed in rating*100 units (Dish.avg_rating_x100).
+    Returns (average_rating, total_reviews).
     """
-    result = db.query(
-        func.avg(Dish.average_rating),
-        func.sum(Dish.reviews)
-    ).filter(
-        Dish.chefID == chef.ID,
-        Dish.reviews > 0
-    ).first()
+    old_total = chef.total_rating_count or 0
+    old_dish_reviews = old_dish_reviews or 0
+    
+    new_total = old_total - old_dish_reviews + new_dish_reviews
+    new_sum = (
+        (chef.rolling_avg_x100 or 0) * old_total
+        - (old_dish_avg_x100 or 0) * old_dish_reviews
+        + new_dish_avg_x100 * new_dish_reviews
+    )
     
-    avg_rating = float(result[0]) if result[0] else 0.0
-    total_reviews = int(result[1] or 0)
+    if new_total <= 0:
+        new_total, avg_x100 = 0, 0
+    else:
+        avg_x100 = min(max(_rounded_div(new_sum, new_total), 0), 500)
     
-    # Update chef's rolling average
-    chef.rolling_avg_rating = Decimal(str(round(avg_rating, 2)))
-    chef.total_rating_count = total_reviews
+    db.execute(
+        update(Account)
+        .where(Account.ID == chef.ID)
+        .values(rolling_avg_x100=avg_x100, total_rating_count=new_total)
+        .execution_options(synchronize_session=False)
+    )
+    touch_accounts(db, [chef.ID])
+    set_committed_value(chef, "rolling_avg_x100", avg_x100)
+    set_committed_value(chef, "total_rating_count", new_total)
     
-    return avg_rating, total_reviews
+    return avg_x100 / 100, new_total
 
 
 def recalculate_delivery_rating(db: Session, delivery_person: Account) -> Tuple[float, int]:
@@ -206,16 +847,86 @@ def recalculate_delivery_rating(db: Session, delivery_person: Account) -> Tuple[
     Get delivery person's rating from DeliveryRating table.
     Returns (average_rating, total_reviews).
     """
-    delivery_rating = db.query(DeliveryRating).filter(
-        DeliveryRating.accountID == delivery_person.ID
-    ).first()
+    delivery_rating = db.execute(
+        select(DeliveryRating)
+        .options(raiseload("*"))
+        .where(DeliveryRating.accountID == delivery_person.ID)
+    ).scalars().first()
+    
+    return _sync_delivery_rating(delivery_person, delivery_rating)
+
+
+def upsert_delivery_rating(
+    db: Session,
+    delivery_person_id: int,
+    rating: int,
+    on_time: bool,
+    delivery_person: Optional[Account] = None
+) -> Tuple[float, int]:
+    """
+    Fold one delivery review into the DeliveryRating row in a single round trip.
+    
+    INSERT ... ON CONFLICT (accountID) DO UPDATE creates the row on the first
+    review and otherwise updates the running average (rating*100, rounded
+    half-up) from the stored row, returning the new aggregate. When
+    delivery_person is given, the account's rolling average is synced too.
+    Returns (average_rating, total_reviews).
+    """
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(DeliveryRating).values(
+        accountID=delivery_person_id,
+        avg_rating_x100=rating * 100,
+        reviews=1,
+        total_deliveries=1,
+        on_time_deliveries=1 if on_time else 0,
+    )
+    reviews = DeliveryRating.reviews + 1
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DeliveryRating.accountID],
+        set_={
+            "avg_rating_x100": (
+                func.coalesce(DeliveryRating.avg_rating_x100, 0) * DeliveryRating.reviews
+                + stmt.excluded.avg_rating_x100
+                + reviews // 2
+            ) // reviews,
+            "reviews": reviews,
+            "total_deliveries": DeliveryRating.total_deliveries + 1,
+            "on_time_deliveries": DeliveryRating.on_time_deliveries + stmt.excluded.on_time_deliveries,
+        },
+    ).returning(
+        DeliveryRating.avg_rating_x100,
+        DeliveryRating.reviews,
+        DeliveryRating.total_deliveries,
+        DeliveryRating.on_time_deliveries,
+    )
+    avg_x100, total_reviews, total_deliveries, on_time_deliveries = db.execute(stmt).one()
+    
+    # The upsert bypasses the identity map; sync an already-loaded row
+    delivery_rating = db.identity_map.get(identity_key(DeliveryRating, delivery_person_id))
+    if delivery_rating is not None:
+        set_committed_value(delivery_rating, "avg_rating_x100", avg_x100)
+        set_committed_value(delivery_rating, "reviews", total_reviews)
+        set_committed_value(delivery_rating, "total_deliveries", total_deliveries)
+        set_committed_value(delivery_rating, "on_time_deliveries", on_time_deliveries)
+    
+    if delivery_person is not None:
+        delivery_person.rolling_avg_x100 = avg_x100
+        delivery_person.total_rating_count = total_reviews
     
+    return avg_x100 / 100, total_reviews
+
+
+def _sync_delivery_rating(
+    delivery_person: Account,
+    delivery_rating: Optional[DeliveryRating]
+) -> Tuple[float, int]:
+    """Copy an already-loaded DeliveryRating onto the account"""
     if delivery_rating:
         avg_rating = float(delivery_rating.averageRating or 0)
         total_reviews = delivery_rating.reviews or 0
         
         # Sync to account
-        delivery_person.rolling_avg_rating = delivery_rating.averageRating
+        delivery_person.rolling_avg_x100 = delivery_rating.avg_rating_x100
         delivery_person.total_rating_count = total_reviews
         
         return avg_rating, total_reviews
@@ -230,13 +941,15 @@ def recalculate_delivery_rating(db: Session, delivery_person: Account) -> Tuple[
 def process_compliment(
     db: Session,
     employee: Account,
-    actor_id: Optional[int] = None
+    actor_id: Optional[int] = None,
+    defer_rules: bool = False
 ) -> Dict[str, Any]:
     """
     Process a compliment for an employee.
     - Increment compliment count
     - Decrement complaint count by 1 (floor at 0)
     - Check for bonus eligibility
+    - defer_rules queues the rule check until commit (rule_results is None)
     
     Returns dict with action details.
     """
@@ -262,17 +975,21 @@ def process_compliment(
         action_type="employee_compliment_processed",
         actor_id=actor_id,
         target_id=employee.ID,
+        old_complaint_count=old_complaint_count,
+        new_complaint_count=employee.complaint_count,
         details={
-            "old_complaint_count": old_complaint_count,
-            "new_complaint_count": employee.complaint_count,
             "old_compliment_count": old_compliment_count,
             "new_compliment_count": employee.compliment_count,
             "complaint_canceled": complaint_canceled
         }
     )
     
-    # Run rule engine
-    rule_results = evaluate_employee_rules(db, employee, actor_id)
+    # Run rule engine now, or once at commit when the caller batches events
+    if defer_rules:
+        defer_employee_rules(db, employee, actor_id)
+        rule_results = None
+    else:
+        rule_results = evaluate_employee_rules(db, employee, actor_id)
     
     return {
         "complaint_canceled": complaint_canceled,
@@ -285,12 +1002,14 @@ def process_compliment(
 def process_complaint_against_employee(
     db: Session,
     employee: Account,
-    actor_id: Optional[int] = None
+    actor_id: Optional[int] = None,
+    defer_rules: bool = False
 ) -> Dict[str, Any]:
     """
     Process a valid (upheld) complaint against an employee.
     - Increment complaint count
     - Check for demotion
+    - defer_rules queues the rule check until commit (rule_results is None)
     
     Returns dict with action details.
     """
@@ -308,14 +1027,16 @@ def process_complaint_against_employee(
         action_type="employee_complaint_processed",
         actor_id=actor_id,
         target_id=employee.ID,
-        details={
-            "old_complaint_count": old_complaint_count,
-            "new_complaint_count": employee.complaint_count
-        }
+        old_complaint_count=old_complaint_count,
+        new_complaint_count=employee.complaint_count
     )
     
-    # Run rule engine
-    rule_results = evaluate_employee_rules(db, employee, actor_id)
+    # Run rule engine now, or once at commit when the caller batches events
+    if defer_rules:
+        defer_employee_rules(db, employee, actor_id)
+        rule_results = None
+    else:
+        rule_results = evaluate_employee_rules(db, employee, actor_id)
     
     return {
         "new_complaint_count": employee.complaint_count,
@@ -323,14 +1044,119 @@ def process_complaint_against_employee(
     }
 
 
+def process_events_bulk(
+    db: Session,
+    events: List[Dict[str, Any]],
+    actor_id: Optional[int] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Apply many complaint/compliment events in one pass.
+    
+    Each event is {"employee_id": int, "type": "complaint" | "compliment"}.
+    Counter deltas are summed per employee and written with one executemany
+    UPDATE; the new counters are read back with one SELECT and the rule
+    engine runs once per employee on the final values. Complaint counts are
+    floored at 0 after all of an employee's events are combined.
+    
+    Returns {employee_id: {"new_complaint_count", "new_compliment_count",
+    "rule_results"}} for each employee that was updated.
+    """
+    deltas: Dict[int, List[int]] = {}
+    for ev in events:
+        delta = deltas.setdefault(ev["employee_id"], [0, 0])
+        if ev["type"] == "complaint":
+            delta[0] += 1
+        elif ev["type"] == "compliment":
+            delta[0] -= 1
+            delta[1] += 1
+    
+    if not deltas:
+        return {}
+    
+    accounts = Account.__table__
+    new_complaint_count = accounts.c.complaint_count + bindparam("complaint_delta")
+    db.execute(
+        update(accounts)
+        .where(
+            accounts.c.ID == bindparam("account_id"),
+            # IN (...) expands per call and cannot be used with executemany
+            or_(accounts.c.type == "chef", accounts.c.type == "delivery")
+        )
+        .values(
+            complaint_count=case((new_complaint_count < 0, 0), else_=new_complaint_count),
+            compliment_count=accounts.c.compliment_count + bindparam("compliment_delta")
+        ),
+        [
+            {"account_id": account_id, "complaint_delta": dc, "compliment_delta": dp}
+            for account_id, (dc, dp) in deltas.items()
+        ]
+    )
+    touch_accounts(db, deltas)
+    
+    employees = db.execute(
+        select(Account)
+        .options(raiseload("*"))
+        .where(Account.ID.in_(deltas), Account.type.in_(["chef", "delivery"]))
+        .execution_options(populate_existing=True)
+    ).scalars().all()
+    
+    results = {}
+    for employee in employees:
+        complaint_delta, compliment_delta = deltas[employee.ID]
+        create_audit_entry(
+            db,
+            action_type="employee_events_processed",
+            actor_id=actor_id,
+            target_id=employee.ID,
+            new_complaint_count=employee.complaint_count,
+            details={
+                "complaint_delta": complaint_delta,
+                "compliment_delta": compliment_delta,
+                "new_compliment_count": employee.compliment_count
+            }
+        )
+        results[employee.ID] = {
+            "new_complaint_count": employee.complaint_count,
+            "new_compliment_count": employee.compliment_count,
+            "rule_results": evaluate_employee_rules(db, employee, actor_id)
+        }
+    
+    return results
+
+
 # ============================================================
 # Employee Rule Engine
 # ============================================================
 
+def _classify_employee(
+    avg_x100: int,
+    complaint_count: int,
+    compliment_count: int
+) -> Optional[str]:
+    """
+    Decide the rule action for an employee's counters, without side effects.
+    
+    avg_x100 is the rating in rolling_avg_x100 units. Returns "demote",
+    "bonus" or None. Demotion wins over a bonus.
+    """
+    if 0 < avg_x100 < _LOW_RATING_X100 or complaint_count >= EMPLOYEE_COMPLAINT_THRESHOLD:
+        return "demote"
+    if avg_x100 > _HIGH_RATING_X100 or compliment_count >= EMPLOYEE_COMPLIMENT_BONUS_THRESHOLD:
+        return "bonus"
+    return None
+
+
+def _no_rule_results() -> Dict[str, Any]:
+    """Rule results for an employee no rule applies to"""
+    return {"demoted": False, "fired": False, "bonus_awarded": False, "actions": []}
+
+
 def evaluate_employee_rules(
     db: Session,
     employee: Account,
-    actor_id: Optional[int] = None
+    actor_id: Optional[int] = None,
+    remove_bids: bool = True,
+    now_iso: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Evaluate all employee rules and apply actions.
@@ -340,60 +1166,83 @@ def evaluate_employee_rules(
     - avg_rating > 4 OR compliment_count >= 3 → bonus
     - 2 demotions → fired
     
+    remove_bids=False leaves a fired delivery person's pending bids for the
+    caller to remove (see remove_pending_bids). Batch callers pass one
+    now_iso timestamp for the whole run.
     Returns dict with all actions taken.
     """
     if employee.type not in ["chef", "delivery"] or employee.is_fired:
         return {"skipped": True, "reason": "Not active employee"}
     
-    results = {
-        "demoted": False,
-        "fired": False,
-        "bonus_awarded": False,
-        "actions": []
-    }
-    
-    avg_rating = float(employee.rolling_avg_rating or 0)
+    avg_x100 = employee.rolling_avg_x100 or 0
     complaint_count = employee.complaint_count or 0
     compliment_count = employee.compliment_count or 0
     
-    # Check demotion conditions
-    should_demote = (
-        (avg_rating > 0 and avg_rating < EMPLOYEE_LOW_RATING_THRESHOLD) or
-        complaint_count >= EMPLOYEE_COMPLAINT_THRESHOLD
-    )
+    action = _classify_employee(avg_x100, complaint_count, compliment_count)
+    results = _no_rule_results()
+    if action is None:
+        # Most employees sit in the normal band; nothing else to compute
+        return results
     
-    if should_demote:
+    avg_rating = avg_x100 / 100
+    if action == "demote":
         demotion_result = apply_employee_demotion(db, employee, actor_id, {
             "avg_rating": avg_rating,
             "complaint_count": complaint_count
-        })
+        }, remove_bids=remove_bids)
         results["demoted"] = demotion_result.get("demoted", False)
         results["fired"] = demotion_result.get("fired", False)
         results["actions"].append(demotion_result)
-    
-    # Check bonus conditions (only if not demoted/fired)
-    if not results["demoted"] and not results["fired"]:
-        should_bonus = (
-            (avg_rating > EMPLOYEE_HIGH_RATING_THRESHOLD) or
-            compliment_count >= EMPLOYEE_COMPLIMENT_BONUS_THRESHOLD
-        )
-        
-        if should_bonus:
-            bonus_result = apply_employee_bonus(db, employee, actor_id, {
-                "avg_rating": avg_rating,
-                "compliment_count": compliment_count
-            })
-            results["bonus_awarded"] = bonus_result.get("bonus_awarded", False)
-            results["actions"].append(bonus_result)
+    elif action == "bonus":
+        bonus_result = apply_employee_bonus(db, employee, actor_id, {
+            "avg_rating": avg_rating,
+            "compliment_count": compliment_count
+        }, now_iso=now_iso)
+        results["bonus_awarded"] = bonus_result.get("bonus_awarded", False)
+        results["actions"].append(bonus_result)
     
     return results
 
 
+def defer_employee_rules(
+    db: Session,
+    employee: Account,
+    actor_id: Optional[int] = None
+) -> None:
+    """
+    Queue an employee for rule evaluation when the session commits.
+    
+    Several events for the same employee in one transaction then cost a
+    single evaluation against the final counters.
+    """
+    db.info.setdefault(PENDING_RULE_EVALS_KEY, {})[employee.ID] = actor_id
+
+
+def run_pending_rule_evaluations(db: Session) -> Dict[int, Dict[str, Any]]:
+    """
+    Evaluate every queued employee once, loading them in one SELECT.
+    Returns {employee_id: rule_results}.
+    """
+    pending = db.info.pop(PENDING_RULE_EVALS_KEY, None)
+    if not pending:
+        return {}
+    
+    employees = db.execute(
+        select(Account).options(raiseload("*")).where(Account.ID.in_(pending))
+    ).scalars().all()
+    
+    return {
+        employee.ID: evaluate_employee_rules(db, employee, pending[employee.ID])
+        for employee in employees
+    }
+
+
 def apply_employee_demotion(
     db: Session,
     employee: Account,
     actor_id: Optional[int] = None,
-    reason_details: Optional[dict] = None
+    reason_details: Optional[dict] = None,
+    remove_bids: bool = True
 ) -> Dict[str, Any]:
     """
     Apply demotion to employee.
@@ -405,14 +1254,13 @@ def apply_employee_demotion(
     
     # Increment demotion counts
     employee.times_demoted = (employee.times_demoted or 0) + 1
-    employee.demotion_count = employee.times_demoted  # Keep in sync
     
     # Check if should be fired
     if employee.times_demoted >= EMPLOYEE_DEMOTION_FIRE_THRESHOLD:
         return apply_employee_firing(db, employee, actor_id, {
             **(reason_details or {}),
             "reason": f"Reached {EMPLOYEE_DEMOTION_FIRE_THRESHOLD} demotions"
-        })
+        }, remove_bids=remove_bids)
     
     # Apply wage reduction
     if employee.wage and employee.wage > 0:
@@ -440,8 +1288,18 @@ def apply_employee_demotion(
         db,
         notification_type="employee_demoted",
         title=f"Employee Demoted",
-        message=f"{employee.type.capitalize()} {employee.email} has been demoted (time #{employee.times_demoted}). Wage reduced from ${old_wage/100:.2f} to ${employee.wage/100:.2f}." if old_wage else f"{employee.type.capitalize()} {employee.email} has been demoted.",
-        related_account_id=employee.ID
+        message=(
+            "{role} {email} has been demoted (time #{times_demoted}). "
+            "Wage reduced from ${old_wage_cents} to ${new_wage_cents}."
+        ) if old_wage else "{role} {email} has been demoted.",
+        related_account_id=employee.ID,
+        message_params={
+            "role": _role_label(employee.type),
+            "email": employee.email,
+            "times_demoted": employee.times_demoted,
+            # Wage is nullable; only the wage template reads these
+            **({"old_wage_cents": old_wage, "new_wage_cents": employee.wage} if old_wage else {})
+        }
     )
     
     logger.warning(f"Employee {employee.email} demoted. Times demoted: {employee.times_demoted}")
@@ -455,17 +1313,32 @@ def apply_employee_demotion(
     }
 
 
+def remove_pending_bids(db: Session, delivery_ids: List[int]) -> None:
+    """Delete the delivery people's bids in one statement, keeping winning bids"""
+    if not delivery_ids:
+        return
+    db.execute(
+        delete(Bid)
+        .where(
+            Bid.deliveryPersonID.in_(delivery_ids),
+            ~exists().where(Order.id == Bid.orderID, Order.bidID == Bid.id)
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+
+
 def apply_employee_firing(
     db: Session,
     employee: Account,
     actor_id: Optional[int] = None,
-    reason_details: Optional[dict] = None
+    reason_details: Optional[dict] = None,
+    remove_bids: bool = True
 ) -> Dict[str, Any]:
     """
     Fire an employee.
     - Mark as fired
     - Set employment_status to 'fired'
-    - Remove from all active bidding pools
+    - Remove from all active bidding pools (unless remove_bids=False)
     - Block future order assignments
     """
     old_type = employee.type
@@ -476,17 +1349,8 @@ def apply_employee_firing(
     employee.employment_status = "fired"
     
     # Remove from active bidding pools - delete all pending bids
-    if old_type == "delivery":
-        # Get all orders that have this person's pending bids but not yet assigned
-        pending_bids = db.query(Bid).filter(
-            Bid.deliveryPersonID == employee.ID
-        ).all()
-        
-        # Delete bids for unassigned orders
-        for bid in pending_bids:
-            order = db.query(Order).filter(Order.id == bid.orderID).first()
-            if order and order.bidID != bid.id:  # Not the winning bid
-                db.delete(bid)
+    if old_type == "delivery" and remove_bids:
+        remove_pending_bids(db, [employee.ID])
     
     # Create audit entry
     create_audit_entry(
@@ -506,8 +1370,13 @@ def apply_employee_firing(
         db,
         notification_type="employee_fired",
         title=f"Employee Fired",
-        message=f"{old_type.capitalize()} {employee.email} has been fired after {employee.times_demoted} demotions. Account disabled.",
-        related_account_id=employee.ID
+        message="{role} {email} has been fired after {times_demoted} demotions. Account disabled.",
+        related_account_id=employee.ID,
+        message_params={
+            "role": _role_label(old_type),
+            "email": employee.email,
+            "times_demoted": employee.times_demoted
+        }
     )
     
     logger.warning(f"Employee {employee.email} FIRED")
@@ -524,7 +1393,8 @@ def apply_employee_bonus(
     db: Session,
     employee: Account,
     actor_id: Optional[int] = None,
-    reason_details: Optional[dict] = None
+    reason_details: Optional[dict] = None,
+    now_iso: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Apply bonus to employee.
@@ -542,7 +1412,7 @@ def apply_employee_bonus(
     
     # Track bonus
     employee.bonus_count = (employee.bonus_count or 0) + 1
-    employee.last_bonus_at = get_iso_now()
+    employee.last_bonus_at = now_iso or get_iso_now()
     
     # Reset compliment count to prevent repeated bonuses
     employee.compliment_count = 0
@@ -571,8 +1441,16 @@ def apply_employee_bonus(
         db,
         notification_type="employee_bonus",
         title=f"Employee Bonus Awarded",
-        message=f"{employee.type.capitalize()} {employee.email} received a bonus! Wage increased from ${old_wage/100:.2f} to ${employee.wage/100:.2f}." if old_wage else f"{employee.type.capitalize()} {employee.email} received a bonus!",
-        related_account_id=employee.ID
+        message=(
+            "{role} {email} received a bonus! "
+            "Wage increased from ${old_wage_cents} to ${new_wage_cents}."
+        ) if old_wage else "{role} {email} received a bonus!",
+        related_account_id=employee.ID,
+        message_params={
+            "role": _role_label(employee.type),
+            "email": employee.email,
+            **({"old_wage_cents": old_wage, "new_wage_cents": employee.wage} if old_wage else {})
+        }
     )
     
     logger.info(f"Employee {employee.email} received bonus. Total bonuses: {employee.bonus_count}")
@@ -718,65 +1596,101 @@ def apply_vip_downgrade(
     }
 
 
-def apply_customer_deregistration(
+def apply_customer_deregistrations(
     db: Session,
-    customer: Account,
+    customers: List[Account],
     actor_id: Optional[int] = None
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
     """
-    Deregister customer.
+    Deregister several customers.
     - Disable login
     - Remove balance (manager processes)
     - Mark as blacklisted
-    """
-    old_balance = customer.balance
     
-    customer.is_blacklisted = True
-    customer.type = "deregistered"
-    customer.customer_tier = "deregistered"
-    
-    # Balance removal handled by manager - flag for processing
-    customer.balance = 0  # Set to 0 (manager will process refund if needed)
-    
-    # Add to blacklist table
-    blacklist_entry = Blacklist(
-        email=customer.email,
-        reason=f"Reached {CUSTOMER_WARNING_THRESHOLD} warnings. Automatically deregistered.",
-        original_account_id=customer.ID,
-        blacklisted_by=actor_id,
-        created_at=get_iso_now()
-    )
-    db.add(blacklist_entry)
+    Account changes are flushed together by the unit of work, blacklist
+    entries go in one executemany INSERT (one per resolve_disputes batch
+    when called from inside one) and audit entries / notifications
+    through the session buffers. Returns one result per customer.
+    """
+    if not customers:
+        return []
     
-    # Create audit entry
-    create_audit_entry(
-        db,
-        action_type="customer_deregistered",
-        actor_id=actor_id,
-        target_id=customer.ID,
-        details={
-            "warnings": customer.warnings,
+    now_iso = get_iso_now()
+    blacklist_rows = []
+    results = []
+    for customer in customers:
+        old_balance = customer.balance
+        
+        customer.is_blacklisted = True
+        customer.type = "deregistered"
+        customer.customer_tier = "deregistered"
+        
+        # Balance removal handled by manager - flag for processing
+        customer.balance = 0  # Set to 0 (manager will process refund if needed)
+        
+        blacklist_rows.append({
+            "email": customer.email,
+            "reason": f"Reached {CUSTOMER_WARNING_THRESHOLD} warnings. Automatically deregistered.",
+            "original_account_id": customer.ID,
+            "blacklisted_by": actor_id,
+            "created_at": now_iso
+        })
+        
+        # Create audit entry
+        create_audit_entry(
+            db,
+            action_type="customer_deregistered",
+            actor_id=actor_id,
+            target_id=customer.ID,
+            details={
+                "warnings": customer.warnings,
+                "balance_removed": old_balance,
+                "reason": f"Reached {CUSTOMER_WARNING_THRESHOLD} warnings"
+            }
+        )
+        
+        # Notify manager
+        create_manager_notification(
+            db,
+            notification_type="customer_deregistered",
+            title="Customer Deregistered",
+            message=(
+                "Customer {email} has been deregistered after {warnings} warnings. "
+                "Balance of ${balance_cents} needs processing."
+            ),
+            related_account_id=customer.ID,
+            message_params={
+                "email": customer.email,
+                "warnings": customer.warnings,
+                "balance_cents": old_balance
+            }
+        )
+        
+        logger.warning(f"Customer {customer.email} DEREGISTERED")
+        
+        results.append({
+            "deregistered": True,
             "balance_removed": old_balance,
-            "reason": f"Reached {CUSTOMER_WARNING_THRESHOLD} warnings"
-        }
-    )
-    
-    # Notify manager
-    create_manager_notification(
-        db,
-        notification_type="customer_deregistered",
-        title="Customer Deregistered",
-        message=f"Customer {customer.email} has been deregistered after {customer.warnings} warnings. Balance of ${old_balance/100:.2f} needs processing.",
-        related_account_id=customer.ID
-    )
+            "warnings": customer.warnings
+        })
     
-    logger.warning(f"Customer {customer.email} DEREGISTERED")
+    # Add to blacklist table
+    batch = db.info.get(BLACKLIST_BATCH_KEY)
+    if batch is not None:
+        batch.extend(blacklist_rows)
+    else:
+        db.execute(_BLACKLIST_INSERT, blacklist_rows)
     
-    return {
-        "deregistered": True,
-        "balance_removed": old_balance,
-        "warnings": customer.warnings
-    }
+    return results
+
+
+def apply_customer_deregistration(
+    db: Session,
+    customer: Account,
+    actor_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Deregister one customer (see apply_customer_deregistrations)"""
+    return apply_customer_deregistrations(db, [customer], actor_id)[0]
 
 
 # ============================================================
@@ -813,7 +1727,7 @@ def resolve_dispute(
     if resolution == "upheld" or resolution == "warning_issued":
         # Valid complaint → warning to target
         if complaint.accountID:
-            target = db.query(Account).filter(Account.ID == complaint.accountID).first()
+            target = _get_account(db, complaint.accountID)
             if target:
                 results["warning_applied_to"] = target.ID
                 
@@ -826,7 +1740,7 @@ def resolve_dispute(
     
     elif resolution == "dismissed":
         # Complaint without merit → warning to filer (they made a false complaint)
-        filer = db.query(Account).filter(Account.ID == complaint.filer).first()
+        filer = _get_account(db, complaint.filer)
         if filer and filer.type in ["customer", "vip", "visitor"]:
             results["warning_applied_to"] = filer.ID
             warning_result = process_customer_warning(db, filer, actor_id, "complaint_dismissed_false")
@@ -849,6 +1763,46 @@ def resolve_dispute(
     return results
 
 
+def resolve_disputes(
+    db: Session,
+    complaints: List[Complaint],
+    resolution: str,
+    actor_id: int,
+    notes: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Resolve several disputed complaints the same way.
+    
+    Every target and filer is loaded with one IN query up front, so each
+    resolve_dispute() finds its accounts in the identity map. Customers
+    deregistered along the way are blacklisted with a single INSERT once
+    every dispute has been applied.
+    """
+    account_ids = {
+        account_id
+        for complaint in complaints
+        for account_id in (complaint.accountID, complaint.filer)
+        if account_id is not None
+    }
+    # Held for the loop: the identity map only keeps referenced objects
+    _accounts = db.execute(
+        select(Account).options(raiseload("*")).where(Account.ID.in_(account_ids))
+    ).scalars().all() if account_ids else []
+    
+    blacklist_rows = db.info[BLACKLIST_BATCH_KEY] = []
+    try:
+        results = [
+            resolve_dispute(db, complaint, resolution, actor_id, notes)
+            for complaint in complaints
+        ]
+    finally:
+        db.info.pop(BLACKLIST_BATCH_KEY, None)
+    
+    if blacklist_rows:
+        db.execute(_BLACKLIST_INSERT, blacklist_rows)
+    return results
+
+
 def process_compliment_resolution(
     db: Session,
     complaint: Complaint,  # Actually a compliment
@@ -872,7 +1826,7 @@ def process_compliment_resolution(
     complaint.resolved_at = get_iso_now()
     
     if complaint.accountID:
-        target = db.query(Account).filter(Account.ID == complaint.accountID).first()
+        target = _get_account(db, complaint.accountID)
         if target and target.type in ["chef", "delivery"]:
             compliment_result = process_compliment(db, target, actor_id)
             results["actions"].append({"type": "employee_compliment", **compliment_result})
@@ -884,6 +1838,19 @@ def process_compliment_resolution(
 # Batch/Trigger Functions
 # ============================================================
 
+# Employees streamed per chunk by run_all_employee_evaluations
+EVALUATION_BATCH_SIZE = 500
+
+# The Account columns rule evaluation reads; the rest stay unloaded
+_EVALUATION_COLUMNS = (
+    Account.ID, Account.email, Account.type, Account.wage, Account.is_fired,
+    Account.employment_status, Account.previous_type,
+    Account.rolling_avg_x100, Account.total_rating_count,
+    Account.complaint_count, Account.compliment_count,
+    Account.times_demoted, Account.bonus_count, Account.version_id,
+)
+
+
 def run_all_employee_evaluations(
     db: Session,
     actor_id: Optional[int] = None
@@ -891,28 +1858,60 @@ def run_all_employee_evaluations(
     """
     Run rule evaluation for all active employees.
     Used for batch processing or periodic checks.
+    
+    Employees are streamed in chunks of EVALUATION_BATCH_SIZE with only the
+    columns the rules read. Per chunk, chef ratings are recalculated with one
+    aggregate and delivery ratings arrive in one IN query; rules then run in
+    memory, wage/status changes are flushed together at commit and every
+    fired delivery person's bids go in one DELETE. Employees whose counters
+    trigger no rule are classified without entering evaluate_employee_rules.
     """
-    employees = db.query(Account).filter(
-        Account.type.in_(["chef", "delivery"]),
-        Account.is_fired == False
-    ).all()
+    employee_chunks = db.execute(
+        select(Account)
+        .options(
+            load_only(*_EVALUATION_COLUMNS),
+            selectinload(Account.delivery_rating).raiseload("*"),
+            raiseload("*")
+        )
+        .where(
+            Account.type.in_(["chef", "delivery"]),
+            Account.is_fired == False
+        )
+        .execution_options(yield_per=EVALUATION_BATCH_SIZE)
+    ).scalars().partitions()
     
     results = []
-    for emp in employees:
-        # Recalculate ratings
-        if emp.type == "chef":
-            recalculate_chef_rating_from_dishes(db, emp)
-        elif emp.type == "delivery":
-            recalculate_delivery_rating(db, emp)
+    fired_delivery_ids = []
+    now_iso = get_iso_now()
+    for employees in employee_chunks:
+        # Recalculate the chunk's chef ratings in one round trip
+        recalculate_chef_ratings_bulk(db, [emp.ID for emp in employees if emp.type == "chef"])
         
-        # Evaluate rules
-        rule_results = evaluate_employee_rules(db, emp, actor_id)
-        results.append({
-            "employee_id": emp.ID,
-            "email": emp.email,
-            "type": emp.type,
-            **rule_results
-        })
+        for emp in employees:
+            # Recalculate ratings
+            if emp.type == "delivery":
+                _sync_delivery_rating(emp, emp.delivery_rating)
+            
+            # Evaluate rules; most employees trigger none
+            action = _classify_employee(
+                emp.rolling_avg_x100 or 0, emp.complaint_count or 0, emp.compliment_count or 0
+            )
+            if action is None:
+                rule_results = _no_rule_results()
+            else:
+                rule_results = evaluate_employee_rules(
+                    db, emp, actor_id, remove_bids=False, now_iso=now_iso
+                )
+            if rule_results.get("fired") and emp.previous_type == "delivery":
+                fired_delivery_ids.append(emp.ID)
+            results.append({
+                "employee_id": emp.ID,
+                "email": emp.email,
+                "type": emp.type,
+                **rule_results
+            })
+    
+    remove_pending_bids(db, fired_delivery_ids)
     
     return results
 
@@ -924,28 +1923,63 @@ def get_employee_reputation_summary(
     """
     Get comprehensive reputation summary for an employee.
     """
-    return {
-        "employee_id": employee.ID,
+    return _build_reputation_summary({
+        "ID": employee.ID,
         "email": employee.email,
         "type": employee.type,
-        "employment_status": employee.employment_status or "active",
-        "rolling_avg_rating": float(employee.rolling_avg_rating or 0),
-        "total_rating_count": employee.total_rating_count or 0,
-        "complaint_count": employee.complaint_count or 0,
-        "compliment_count": employee.compliment_count or 0,
-        "demotion_count": employee.times_demoted or 0,
-        "bonus_count": employee.bonus_count or 0,
+        "employment_status": employee.employment_status,
+        "rolling_avg_x100": employee.rolling_avg_x100,
+        "total_rating_count": employee.total_rating_count,
+        "complaint_count": employee.complaint_count,
+        "compliment_count": employee.compliment_count,
+        "times_demoted": employee.times_demoted,
+        "bonus_count": employee.bonus_count,
         "is_fired": employee.is_fired,
         "wage": employee.wage,
+    })
+
+
+def get_cached_employee_reputation_summary(
+    db: Session,
+    account_id: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the reputation summary for an account from the counter cache.
+    Returns None if the account does not exist.
+    """
+    counters = reputation_cache.get(db, account_id)
+    if counters is None:
+        return None
+    return _build_reputation_summary(counters)
+
+
+def _build_reputation_summary(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the reputation summary from an account's counters"""
+    avg_x100 = counters["rolling_avg_x100"]
+    rolling_avg_rating = None if avg_x100 is None else avg_x100 / 100
+    
+    return {
+        "employee_id": counters["ID"],
+        "email": counters["email"],
+        "type": counters["type"],
+        "employment_status": counters["employment_status"] or "active",
+        "rolling_avg_rating": float(rolling_avg_rating or 0),
+        "total_rating_count": counters["total_rating_count"] or 0,
+        "complaint_count": counters["complaint_count"] or 0,
+        "compliment_count": counters["compliment_count"] or 0,
+        "demotion_count": counters["times_demoted"] or 0,
+        "bonus_count": counters["bonus_count"] or 0,
+        "is_fired": counters["is_fired"],
+        "wage": counters["wage"],
         # Risk assessment
         "near_demotion": (
-            (float(employee.rolling_avg_rating or 5) < EMPLOYEE_LOW_RATING_THRESHOLD + 0.5) or
-            (employee.complaint_count or 0) >= EMPLOYEE_COMPLAINT_THRESHOLD - 1
+            (float(rolling_avg_rating or 5) < EMPLOYEE_LOW_RATING_THRESHOLD + 0.5) or
+            (counters["complaint_count"] or 0) >= EMPLOYEE_COMPLAINT_THRESHOLD - 1
         ),
-        "near_firing": employee.times_demoted == 1,
+        "near_firing": counters["times_demoted"] == 1,
         "bonus_eligible": (
-            float(employee.rolling_avg_rating or 0) > EMPLOYEE_HIGH_RATING_THRESHOLD or
-            (employee.compliment_count or 0) >= EMPLOYEE_COMPLIMENT_BONUS_THRESHOLD - 1
+            float(rolling_avg_rating or 0) > EMPLOYEE_HIGH_RATING_THRESHOLD or
+            (counters["compliment_count"] or 0) >= EMPLOYEE_COMPLIMENT_BONUS_THRESHOLD - 1
         )
     }
 
@@ -977,42 +2011,75 @@ def get_customer_warning_summary(
     }
 
 
+# Account type -> (warning count from which the next warning acts, what it does)
+_WARNING_CONSEQUENCES = {
+    "vip": (VIP_WARNING_DOWNGRADE_THRESHOLD - 1, "VIP status removal"),
+    "customer": (CUSTOMER_WARNING_THRESHOLD - 1, "account suspension"),
+    "visitor": (CUSTOMER_WARNING_THRESHOLD - 1, "account suspension"),
+}
+
+
+def _format_warning_message(account_type: str, warnings: int) -> str:
+    near, consequence = _WARNING_CONSEQUENCES[account_type]
+    message = f"You have {warnings} warning(s)."
+    if warnings >= near:
+        message += f" One more warning will result in {consequence}."
+    return message
+
+
+# Every message an active account can reach; counts past the thresholds
+# (accounts are deregistered/downgraded there) are formatted on demand
+_WARNING_MESSAGES = {
+    (account_type, warnings): _format_warning_message(account_type, warnings)
+    for account_type in _WARNING_CONSEQUENCES
+    for warnings in range(1, CUSTOMER_WARNING_THRESHOLD + 1)
+}
+
+
 def _get_warning_message(customer: Account) -> Optional[str]:
-    """Generate warning message for customer based on their status."""
-    warnings = customer.warnings or 0
-    
+    """Warning message for customer based on their status."""
     if customer.is_blacklisted:
         return "Your account has been suspended."
     
-    if warnings == 0:
-        return None
-    
-    if customer.type == "vip":
-        if warnings >= 1:
-            return f"You have {warnings} warning(s). One more warning will result in VIP status removal."
-        return f"You have {warnings} warning(s)."
-    
-    if customer.type in ["customer", "visitor"]:
-        if warnings >= 2:
-            return f"You have {warnings} warning(s). One more warning will result in account suspension."
-        return f"You have {warnings} warning(s)."
-    
-    return None
+    warnings = customer.warnings or 0
+    message = _WARNING_MESSAGES.get((customer.type, warnings))
+    if message is None and warnings > 0 and customer.type in _WARNING_CONSEQUENCES:
+        message = _format_warning_message(customer.type, warnings)
+    return message
 
 
 # ============================================================
 # Delivery Bidding Pool Exclusion
 # ============================================================
 
+# SQL form of is_delivery_eligible_for_bidding
+_ELIGIBLE_DELIVERY_CRITERIA = (
+    Account.type == "delivery",
+    Account.is_fired == False,
+    Account.employment_status != "fired"
+)
+
+
 def get_eligible_delivery_persons(db: Session) -> List[Account]:
     """
     Get all delivery persons eligible for bidding.
     Excludes fired employees.
     """
-    return db.query(Account).filter(
-        Account.type == "delivery",
-        Account.is_fired == False
-    ).all()
+    return db.execute(
+        select(Account).where(*_ELIGIBLE_DELIVERY_CRITERIA)
+    ).scalars().all()
+
+
+def get_eligible_delivery_ids(db: Session) -> frozenset:
+    """
+    IDs of all delivery persons eligible for bidding, loaded as plain integers.
+    
+    Build once per bidding round and test candidates with `emp.ID in ids`
+    instead of calling is_delivery_eligible_for_bidding per candidate.
+    """
+    return frozenset(
+        db.execute(select(Account.ID).where(*_ELIGIBLE_DELIVERY_CRITERIA)).scalars()
+    )
 
 
 def is_delivery_eligible_for_bidding(employee: Account) -> bool:
@@ -4,68 +4,161 @@ Endpoints for account balance and deposit management
 """
 
 import logging
-from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func, insert, literal, select, tuple_, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import get_db
-from app.models import Account, Transaction, ManagerNotification, AuditLog
+from app.models import Account, Transaction
 from app.schemas import (
     DepositRequest, DepositResponse, BalanceResponse,
-    TransactionResponse, TransactionListResponse
+    TransactionResponse, TransactionListResponse, UserProfile
 )
-from app.auth import get_current_user
+from app.auth import get_current_profile, get_current_user
+from app.reputation_engine import create_audit_entry, create_manager_notification, touch_accounts
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/account", tags=["Account"])
 
-
+@lru_cache(maxsize=1024)
 def format_cents_to_dollars(cents: int) -> str:
-    """Format cents as dollar string (e.g., 1050 -> '$10.50')"""
-    dollars = cents / 100
-    return f"${dollars:,.2f}"
+    """Format cents as dollar string (e.g., 1050 -> '$10.50'), in integer arithmetic"""
+    sign = "-" if cents < 0 else ""
+    whole, rem = divmod(abs(cents), 100)
+    return f"${sign}{whole:,}.{rem:02d}"
 
 
-def create_transaction(
-    db: Session,
-    account: Account,
+def transaction_row(
+    account_id: int,
     amount_cents: int,
+    balance_before: int,
     transaction_type: str,
     reference_type: Optional[str] = None,
     reference_id: Optional[int] = None,
     description: Optional[str] = None
-) -> Transaction:
-    """Create an audit log entry for a balance change"""
-    balance_before = account.balance
-    balance_after = account.balance + amount_cents
-    
-    transaction = Transaction(
-        accountID=account.ID,
-        amount_cents=amount_cents,
-        balance_before=balance_before,
-        balance_after=balance_after,
-        transaction_type=transaction_type,
-        reference_type=reference_type,
-        reference_id=reference_id,
-        description=description,
-        created_at=datetime.now(timezone.utc).isoformat()
+) -> dict:
+    """
+    Column values of an audit log entry for a balance change, for
+    flush_transactions. created_at comes from the database default
+    (transaction time).
+    """
+    return {
+        "accountID": account_id,
+        "amount_cents": amount_cents,
+        "balance_before": balance_before,
+        "balance_after": balance_before + amount_cents,
+        "transaction_type": transaction_type,
+        "reference_type": reference_type,
+        "reference_id": reference_id,
+        "description": description
+    }
+
+
+def flush_transactions(db: Session, rows: List[dict]) -> None:
+    """
+    Write transaction_row entries in one executemany INSERT, without building
+    Transaction instances or adding them to the identity map
+    """
+    if rows:
+        db.execute(insert(Transaction), rows)
+
+
+def apply_balance_change(
+    db: Session,
+    account: Account,
+    amount_cents: int,
+    transaction_type: str,
+    description: str
+) -> None:
+    """
+    Change the balance in one atomic UPDATE, record the transaction and commit.
+
+    The new balance is computed by the database (balance + amount, for
+    withdrawals only while the balance covers it) and returned, so
+    concurrent changes to the same account queue on the row lock instead of
+    overwriting each other. version_id is bumped as well, so an ORM flush
+    based on an older read of the account still fails with StaleDataError.
+
+    On PostgreSQL the UPDATE runs as a CTE feeding the transaction INSERT,
+    so both writes are one statement. SQLite does not allow DML in a CTE,
+    so other backends issue the UPDATE and then flush the INSERT.
+
+    Raises:
+        HTTPException 400 if a withdrawal exceeds the balance
+    """
+    accounts = Account.__table__
+    stmt = (
+        update(accounts)
+        .where(accounts.c.ID == account.ID)
+        .values(balance=accounts.c.balance + amount_cents, version_id=accounts.c.version_id + 1)
+        .returning(accounts.c.balance, accounts.c.version_id)
     )
-    db.add(transaction)
-    return transaction
+    if amount_cents < 0:
+        stmt = stmt.where(accounts.c.balance >= -amount_cents)
+
+    single_statement = db.get_bind().dialect.name == "postgresql"
+    if single_statement:
+        changed = stmt.cte("changed_balance")
+        transactions = Transaction.__table__
+        row = db.execute(
+            insert(transactions).from_select(
+                [
+                    "accountID", "amount_cents", "balance_before", "balance_after",
+                    "transaction_type", "reference_type", "description"
+                ],
+                select(
+                    literal(account.ID), literal(amount_cents),
+                    changed.c.balance - amount_cents, changed.c.balance,
+                    literal(transaction_type), literal(transaction_type), literal(description)
+                )
+            ).returning(transactions.c.balance_after)
+        ).first()
+    else:
+        row = db.execute(stmt).first()
+
+    if row is None:
+        current_balance = db.execute(
+            select(accounts.c.balance).where(accounts.c.ID == account.ID)
+        ).scalar_one()
+        set_committed_value(account, "balance", current_balance)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient funds. Current balance: {format_cents_to_dollars(current_balance)}"
+        )
+
+    new_balance = row[0]
+    if not single_statement:
+        # Create audit log transaction
+        flush_transactions(db, [transaction_row(
+            account.ID, amount_cents, new_balance - amount_cents, transaction_type,
+            reference_type=transaction_type, description=description
+        )])
+        set_committed_value(account, "version_id", row[1])
+    else:
+        # INSERT ... RETURNING only sees the transaction row; the bumped
+        # version is reloaded only if the account is flushed again
+        db.expire(account, ["version_id"])
+    # Already written; keep the loaded account in step without marking it dirty
+    set_committed_value(account, "balance", new_balance)
+    touch_accounts(db, [account.ID])
+    db.commit()
 
 
 @router.get("/balance", response_model=BalanceResponse)
 async def get_balance(
-    current_user: Account = Depends(get_current_user)
+    current_user: UserProfile = Depends(get_current_profile)
 ):
     """
     Get the current user's account balance.
     
-    Returns balance in cents and formatted string.
+    Returns balance in cents and formatted string. Served from the profile
+    cache, which every committed balance change invalidates.
     """
     return BalanceResponse(
         balance_cents=current_user.balance,
@@ -92,23 +185,18 @@ async def deposit(
             detail="Deposit amount must be positive"
         )
     
-    # Create audit log transaction
-    create_transaction(
-        db=db,
-        account=current_user,
-        amount_cents=request.amount_cents,
-        transaction_type="deposit",
-        reference_type="deposit",
-        description=f"Deposit of {format_cents_to_dollars(request.amount_cents)}"
+    apply_balance_change(
+        db,
+        current_user,
+        request.amount_cents,
+        "deposit",
+        f"Deposit of {format_cents_to_dollars(request.amount_cents)}"
     )
     
-    # Update balance
-    current_user.balance += request.amount_cents
-    
-    db.commit()
-    db.refresh(current_user)
-    
-    logger.info(f"Deposit: user={current_user.email}, amount={request.amount_cents}, new_balance={current_user.balance}")
+    logger.info(
+        "Deposit: user=%s, amount=%d, new_balance=%d",
+        current_user.email, request.amount_cents, current_user.balance
+    )
     
     return DepositResponse(
         message="Deposit successful",
@@ -135,29 +223,18 @@ async def withdraw(
             detail="Withdrawal amount must be positive"
         )
     
-    if current_user.balance < request.amount_cents:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Insufficient funds. Current balance: {format_cents_to_dollars(current_user.balance)}"
-        )
-    
-    # Create audit log transaction
-    create_transaction(
-        db=db,
-        account=current_user,
-        amount_cents=-request.amount_cents,
-        transaction_type="withdrawal",
-        reference_type="withdrawal",
-        description=f"Withdrawal of {format_cents_to_dollars(request.amount_cents)}"
+    apply_balance_change(
+        db,
+        current_user,
+        -request.amount_cents,
+        "withdrawal",
+        f"Withdrawal of {format_cents_to_dollars(request.amount_cents)}"
     )
     
-    # Update balance
-    current_user.balance -= request.amount_cents
-    
-    db.commit()
-    db.refresh(current_user)
-    
-    logger.info(f"Withdrawal: user={current_user.email}, amount={request.amount_cents}, new_balance={current_user.balance}")
+    logger.info(
+        "Withdrawal: user=%s, amount=%d, new_balance=%d",
+        current_user.email, request.amount_cents, current_user.balance
+    )
     
     return DepositResponse(
         message="Withdrawal successful",
@@ -170,6 +247,7 @@ async def withdraw(
 async def get_transactions(
     limit: int = Query(20, ge=1, le=100, description="Max transactions to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    before_id: Optional[int] = Query(None, description="Keyset cursor: next_before_id of the previous page (overrides offset)"),
     transaction_type: Optional[str] = Query(None, description="Filter by type"),
     current_user: Account = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -177,19 +255,50 @@ async def get_transactions(
     """
     Get transaction history for the current user.
     
-    Returns list of balance changes with audit details.
+    Returns list of balance changes with audit details. Pass the returned
+    next_before_id as before_id to fetch the following page; unlike offset,
+    its cost does not grow with the page number.
     """
-    query = db.query(Transaction).filter(Transaction.accountID == current_user.ID)
-    
+    criteria = [Transaction.accountID == current_user.ID]
     if transaction_type:
-        query = query.filter(Transaction.transaction_type == transaction_type)
+        criteria.append(Transaction.transaction_type == transaction_type)
+    
+    # The window count rides along with the page, so one query returns both
+    total_column = func.count().over()
+    page_criteria = criteria
+    if before_id is not None:
+        # Seek past the cursor row in (created_at, id) order
+        cursor_created_at = select(Transaction.created_at).where(
+            Transaction.id == before_id, Transaction.accountID == current_user.ID
+        ).scalar_subquery()
+        page_criteria = criteria + [
+            tuple_(Transaction.created_at, Transaction.id) < tuple_(cursor_created_at, before_id)
+        ]
+        # The window would only see rows past the cursor
+        total_column = select(func.count()).select_from(Transaction).where(*criteria).scalar_subquery()
+        offset = 0
     
-    total = query.count()
-    transactions = query.order_by(Transaction.id.desc()).offset(offset).limit(limit).all()
+    rows = db.execute(
+        select(Transaction, total_column.label("total"))
+        .where(*page_criteria)
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    transactions = [row.Transaction for row in rows]
+    if rows:
+        total = rows[0].total
+    elif offset or before_id is not None:
+        # Past the last page: no row to carry the count
+        total = db.execute(select(func.count()).select_from(Transaction).where(*criteria)).scalar_one()
+    else:
+        total = 0
     
-    return TransactionListResponse(
+    # Rows are trusted ORM values (created_at is already an ISO string from
+    # IsoTimestamp); FastAPI validates the response model once on the way out
+    return TransactionListResponse.model_construct(
         transactions=[
-            TransactionResponse(
+            TransactionResponse.model_construct(
                 id=t.id,
                 accountID=t.accountID,
                 amount_cents=t.amount_cents,
@@ -199,11 +308,12 @@ async def get_transactions(
                 reference_type=t.reference_type,
                 reference_id=t.reference_id,
                 description=t.description,
-                created_at=t.created_at.isoformat() if hasattr(t.created_at, 'isoformat') else str(t.created_at)
+                created_at=t.created_at
             )
             for t in transactions
         ],
-        total=total
+        total=total,
+        next_before_id=transactions[-1].id if len(transactions) == limit else None
     )
 
 
@@ -236,27 +346,25 @@ async def deregister_account(
         )
     
     # Create manager notification for deregistration request
-    now_iso = datetime.now(timezone.utc).isoformat()
-    notif = ManagerNotification(
+    create_manager_notification(
+        db,
         notification_type="deregister_request",
         title="Account Deregistration Request",
         message=f"Customer {current_user.email} ({current_user.type}) has requested account closure",
-        related_account_id=current_user.ID,
-        is_read=False,
-        created_at=now_iso
+        related_account_id=current_user.ID
     )
-    db.add(notif)
     
     # Create audit log
-    audit = AuditLog(
+    create_audit_entry(
+        db,
         action_type="deregister_request",
         actor_id=current_user.ID,
         target_id=current_user.ID,
-        details={"reason": "Customer requested account deregistration"},
-        created_at=now_iso
+        details={"reason": "Customer requested account deregistration"}
     )
-    db.add(audit)
     
+    # Both rows are buffered on the session and written at commit by
+    # executemany INSERTs, with no ORM instances to flush or refresh
     db.commit()
     
     return {
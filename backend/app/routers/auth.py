@@ -4,14 +4,15 @@ Endpoints for user registration, login, and profile management
 """
 
 import logging
+from typing import Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import bindparam, exists, insert, literal, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime, timezone
 
 from app.database import get_db
-from app.models import Account, Blacklist, Restaurant, AuditLog, ManagerNotification
+from app.models import Account, Blacklist, Restaurant
 from app.schemas import (
     UserRegisterRequest, UserLoginRequest, TokenResponse, RegistrationResponse,
     UserProfile, UserProfileResponse, TokenResponseWithWarnings, LoginWarningInfo,
@@ -19,17 +20,39 @@ from app.schemas import (
 )
 from app.auth import (
     hash_password, verify_password, create_access_token,
-    get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_current_user, get_current_profile, blacklist_cache, login_rate_limiter,
+    ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app.reputation_engine import create_audit_entry, create_manager_notification
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+TOKEN_EXPIRES_IN = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Login's account + blacklist lookup, built once. The account is outer-joined
+# to a one-row probe, so an unknown email still returns a row (user None)
+# carrying its blacklist flag
+_LOGIN_PROBE = select(literal(1).label("one")).subquery("probe")
+_LOGIN_LOOKUP = (
+    select(Account, exists().where(Blacklist.email == bindparam("email")).label("blacklisted"))
+    .select_from(_LOGIN_PROBE)
+    .outerjoin(Account, Account.email == bindparam("email"))
+)
+
+# Checked against when the email has no account, so an unknown email costs
+# the same bcrypt work as a wrong password and timing does not reveal it
+_DUMMY_HASH = hash_password("dashx-login-dummy-password")
+
+# register, register_manager and login are plain functions: bcrypt hashing and
+# the synchronous Session would otherwise block the event loop, so FastAPI runs
+# them in its worker threadpool instead
+
 
 @router.post("/register", response_model=RegistrationResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     request: UserRegisterRequest,
     db: Session = Depends(get_db)
 ):
@@ -41,41 +64,27 @@ async def register(
     
     Returns a JWT access token upon successful registration.
     """
-    # Check if email already exists
-    existing_user = db.query(Account).filter(Account.email == request.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
-
     # Reject registration if email is blacklisted and log the attempt for managers
     blacklisted = db.query(Blacklist).filter(Blacklist.email == request.email).first()
     if blacklisted:
+        blacklist_cache.add(request.email)
         # Create a manager notification so managers can see blocked attempts
-        now_iso = datetime.now(timezone.utc).isoformat()
-        notif = ManagerNotification(
+        create_manager_notification(
+            db,
             notification_type="blacklist_registration_attempt",
             title="Blocked Registration Attempt",
             message=f"Registration attempt blocked for blacklisted email: {request.email}",
-            related_account_id=blacklisted.original_account_id,
-            related_order_id=None,
-            is_read=False,
-            created_at=now_iso
+            related_account_id=blacklisted.original_account_id
         )
-        db.add(notif)
 
         # Create an audit log entry for the blocked registration
-        audit = AuditLog(
+        create_audit_entry(
+            db,
             action_type="blocked_registration_attempt",
-            actor_id=None,
             target_id=blacklisted.original_account_id,
-            complaint_id=None,
-            order_id=None,
-            details={"email": request.email, "blacklist_id": blacklisted.id},
-            created_at=now_iso
+            details={"email": request.email, "blacklist_id": blacklisted.id}
         )
-        db.add(audit)
+        # Both rows are buffered and written at commit as executemany INSERTs
         db.commit()
 
         raise HTTPException(
@@ -83,7 +92,8 @@ async def register(
             detail="This email has been blacklisted and cannot register",
         )
     
-    # Create new user with schema fields
+    # Create new user with schema fields; a taken email surfaces as the
+    # unique constraint's IntegrityError (no racy pre-check SELECT)
     try:
         # Always treat self-registrations as customer accounts that require manager approval
         new_user = Account(
@@ -97,9 +107,8 @@ async def register(
 
         db.add(new_user)
         db.commit()
-        db.refresh(new_user)
 
-        logger.info(f"New user registered (pending approval): {new_user.email}")
+        logger.info("New user registered (pending approval): %s", new_user.email)
 
     except IntegrityError:
         db.rollback()
@@ -110,16 +119,13 @@ async def register(
 
     # Notify managers about a pending registration
     try:
-        now_iso = datetime.now(timezone.utc).isoformat()
-        create_notif = ManagerNotification(
+        create_manager_notification(
+            db,
             notification_type="registration_pending",
             title="New Registration Pending Approval",
             message=f"New user {new_user.email} registered and awaits approval.",
-            related_account_id=new_user.ID,
-            is_read=False,
-            created_at=now_iso
+            related_account_id=new_user.ID
         )
-        db.add(create_notif)
         db.commit()
     except Exception:
         # Don't fail registration if notification can't be created
@@ -128,8 +134,61 @@ async def register(
     return RegistrationResponse(message="Registration created and is pending manager approval", pending=True)
 
 
+def _insert_manager_with_restaurant(
+    db: Session,
+    email: str,
+    password_hash: str,
+    restaurant_name: str,
+    restaurant_address: str
+) -> Tuple[int, int]:
+    """
+    Insert a restaurant and its manager account; returns (account ID,
+    restaurant ID). Nothing is committed.
+
+    On PostgreSQL the restaurant INSERT runs as a CTE feeding the account
+    INSERT, so both rows go in one statement and a taken email aborts both.
+    SQLite does not allow DML in a CTE, so other backends flush the two
+    rows through the ORM.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        restaurants = Restaurant.__table__
+        accounts = Account.__table__
+        new_restaurant = (
+            insert(restaurants)
+            .values(name=restaurant_name, address=restaurant_address)
+            .returning(restaurants.c.id)
+            .cte("new_restaurant")
+        )
+        # Column defaults (version_id, counters, tier) are rendered into the SELECT
+        row = db.execute(
+            insert(accounts).from_select(
+                ["email", "password", "type", "balance", "warnings", "restaurantID"],
+                select(
+                    literal(email), literal(password_hash), literal("manager"),
+                    literal(0), literal(0), new_restaurant.c.id
+                )
+            ).returning(accounts.c.ID, accounts.c.restaurantID)
+        ).one()
+        return row[0], row[1]
+
+    new_restaurant = Restaurant(name=restaurant_name, address=restaurant_address)
+    db.add(new_restaurant)
+    db.flush()  # Get the restaurant ID without committing
+    new_user = Account(
+        email=email,
+        password=password_hash,
+        type="manager",
+        balance=0,
+        warnings=0,
+        restaurantID=new_restaurant.id
+    )
+    db.add(new_user)
+    db.flush()
+    return new_user.ID, new_restaurant.id
+
+
 @router.post("/register-manager", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def register_manager(
+def register_manager(
     request: ManagerRegisterRequest,
     db: Session = Depends(get_db)
 ):
@@ -139,39 +198,16 @@ async def register_manager(
     This endpoint creates a new restaurant and assigns the manager to it.
     Returns a JWT access token upon successful registration.
     """
-    # Check if email already exists
-    existing_user = db.query(Account).filter(Account.email == request.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
+    password_hash = hash_password(request.password)
+    restaurant_name = request.restaurant_name.strip()
     
+    # A taken email surfaces as the unique constraint's IntegrityError below
     try:
-        # Create restaurant first
-        new_restaurant = Restaurant(
-            name=request.restaurant_name.strip(),
-	    address=request.restaurant_address.strip()
-        )
-        db.add(new_restaurant)
-        db.flush()  # Get the restaurant ID without committing
-        
-        # Create manager account linked to the restaurant
-        new_user = Account(
-            email=request.email,
-            password=hash_password(request.password),
-            type="manager",
-            balance=0,
-            warnings=0,
-            restaurantID=new_restaurant.id
+        user_id, restaurant_id = _insert_manager_with_restaurant(
+            db, request.email, password_hash,
+            restaurant_name, request.restaurant_address.strip()
         )
-        
-        db.add(new_user)
         db.commit()
-        db.refresh(new_user)
-        
-        logger.info(f"New manager registered: {new_user.email} for restaurant: {new_restaurant.name} (ID: {new_restaurant.id})")
-        
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -179,41 +215,72 @@ async def register_manager(
             detail="Email already registered or restaurant name taken"
         )
     
+    logger.info(
+        "New manager registered: %s for restaurant: %s (ID: %s)",
+        request.email, restaurant_name, restaurant_id
+    )
+    
     # Generate access token
     access_token = create_access_token(
-        data={"sub": new_user.email, "user_id": new_user.ID, "role": new_user.type}
+        data={"sub": request.email, "user_id": user_id, "role": "manager"}
     )
     
-    return TokenResponse(
+    return TokenResponse.model_construct(
         access_token=access_token,
         token_type="bearer",
-        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        expires_in=TOKEN_EXPIRES_IN
     )
 
 
 @router.post("/login", response_model=TokenResponseWithWarnings)
-async def login(
+def login(
     request: UserLoginRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Authenticate user and return JWT access token.
     Also returns warning information if the user has any warnings.
     """
-    # Check if email is blacklisted
-    blacklisted = db.query(Blacklist).filter(Blacklist.email == request.email).first()
-    if blacklisted:
+    # Throttle repeated attempts per client and email before any DB or bcrypt work
+    client_ip = http_request.client.host if http_request.client else ""
+    retry_after = login_rate_limiter.hit((client_ip, request.email.lower()))
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many login attempts. Try again in {retry_after} seconds",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    # Emails already seen on the blacklist are refused without a query
+    if blacklist_cache.contains(request.email):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This account has been permanently suspended",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    # Find user by email
-    user = db.query(Account).filter(Account.email == request.email).first()
+    # Find user by email and check the blacklist in one round trip
+    user, blacklisted = db.execute(_LOGIN_LOOKUP, {"email": request.email}).first()
+    
+    # Login reads nothing else from the database: end the read-only
+    # transaction so the pooled connection is not held through bcrypt
+    # (expire_on_commit=False keeps user loaded)
+    db.commit()
+    
+    # Check if email is blacklisted (entries may outlive or predate the account)
+    if blacklisted:
+        blacklist_cache.add(request.email)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This account has been permanently suspended",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
     
     if not user:
-        # Use same error message to prevent user enumeration
+        # Same bcrypt work and error message as a wrong password, to prevent
+        # user enumeration
+        verify_password(request.password, _DUMMY_HASH)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -260,7 +327,7 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    logger.info(f"User logged in: {user.email}")
+    logger.info("User logged in: %s", user.email)
     
     # Generate access token
     access_token = create_access_token(
@@ -295,38 +362,25 @@ async def login(
                 is_near_threshold=is_near
             )
     
-    return TokenResponseWithWarnings(
+    # FastAPI validates the response model once on the way out
+    return TokenResponseWithWarnings.model_construct(
         access_token=access_token,
         token_type="bearer",
-        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        expires_in=TOKEN_EXPIRES_IN,
         warning_info=warning_info
     )
 
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_current_user_profile(
-    current_user: Account = Depends(get_current_user)
+    profile: UserProfile = Depends(get_current_profile)
 ):
     """
     Get the current authenticated user's profile.
     
-    Requires valid JWT token in Authorization header.
+    Requires valid JWT token in Authorization header. Served from the
+    profile cache when the account has not changed since it was cached.
     """
-    profile = UserProfile(
-        ID=current_user.ID,
-        email=current_user.email,
-        type=current_user.type,
-        balance=current_user.balance,
-        warnings=current_user.warnings,
-        wage=current_user.wage,
-        restaurantID=current_user.restaurantID
-    )
-    # include customer_tier if available
-    try:
-        profile.customer_tier = getattr(current_user, 'customer_tier', None)
-    except Exception:
-        pass
-    
     return UserProfileResponse(user=profile)
 
 
@@ -340,7 +394,7 @@ async def logout(current_user: Account = Depends(get_current_user)):
     
     This endpoint serves as a confirmation that the user intends to logout.
     """
-    logger.info(f"User logged out: {current_user.email}")
+    logger.info("User logged out: %s", current_user.email)
     
     return {
         "message": "Successfully logged out",
@@ -4,12 +4,16 @@ POST /bids - Create a new bid (with order_id in body)
 GET /bids/scoreboard - Get delivery person scoreboard
 """
 
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc
+from sqlalchemy import bindparam, func, desc, select
+from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
 from app.auth import get_current_user, require_manager
@@ -25,10 +29,107 @@ router = APIRouter(prefix="/bids", tags=["Bids"])
 # Configuration
 BIDDING_DURATION_MINUTES = 30  # How long bidding stays open
 BID_THROTTLE_SECONDS = 30  # Minimum time between bids from same user
+BID_THROTTLE_MAX_KEYS = 10000
+
+
+class BidThrottle:
+    """
+    In-process record of when each delivery person may bid again.
+    
+    A placed bid opens a window of window_seconds for its bidder, and
+    retry_after() refuses further attempts in this worker without querying
+    the bid table (see check_bid_throttle). It is only a fast path: without
+    a record the bid table decides, which holds across workers and restarts.
+    The oldest entries are dropped beyond max_keys.
+    """
+    
+    def __init__(self, window_seconds: int = BID_THROTTLE_SECONDS, max_keys: int = BID_THROTTLE_MAX_KEYS):
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._until: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def retry_after(self, user_id: int) -> Optional[int]:
+        """Seconds until user_id may bid again, or None if it may bid now"""
+        now = time.monotonic()
+        with self._lock:
+            until = self._until.get(user_id)
+            if until is None:
+                return None
+            if until <= now:
+                del self._until[user_id]
+                return None
+            return max(1, int(until - now))
+    
+    def record(self, user_id: int) -> None:
+        """Open the throttle window after user_id placed a bid"""
+        with self._lock:
+            self._until[user_id] = time.monotonic() + self.window
+            self._until.move_to_end(user_id)
+            while len(self._until) > self.max_keys:
+                self._until.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Forget all windows"""
+        with self._lock:
+            self._until.clear()
+
+
+bid_throttle = BidThrottle()
+
+# The user's latest bid after the cutoff, for the throttle; answered from
+# idx_bid_delivery_person_created. Built once; callers bind user_id and cutoff.
+# A repeat bid on the same order is left to the unique
+# (deliveryPersonID, orderID) index, which rejects it at commit
+LAST_BID_AT = select(func.max(Bid.created_at)).where(
+    Bid.deliveryPersonID == bindparam("user_id"),
+    Bid.created_at > bindparam("cutoff")
+)
+
+
+def check_bid_throttle(db: Session, user_id: int, order_id: int, now: datetime) -> None:
+    """
+    Refuse a bid placed within BID_THROTTLE_SECONDS of the user's last one.
+    
+    Runs after the order checks. This worker's bid_throttle answers without
+    a query; otherwise the bid table decides. A throttled repeat bid on the
+    same order is reported as a repeat (400) rather than as throttled.
+    
+    Raises:
+        HTTPException 400 for a repeat bid, 429 while throttled
+    """
+    retry_after = bid_throttle.retry_after(user_id)
+    if retry_after is None:
+        last_bid_at = db.execute(LAST_BID_AT, {
+            "user_id": user_id,
+            "cutoff": now - timedelta(seconds=BID_THROTTLE_SECONDS)
+        }).scalar()
+        if not last_bid_at:
+            return
+        time_since_last_bid = (now - datetime.fromisoformat(last_bid_at)).total_seconds()
+        retry_after = int(BID_THROTTLE_SECONDS - time_since_last_bid)
+    
+    already_bid = db.query(Bid.id).filter(
+        Bid.orderID == order_id,
+        Bid.deliveryPersonID == user_id
+    ).first()
+    if already_bid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already submitted a bid for this order"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Please wait {retry_after} seconds before placing another bid"
+    )
+
+
+# The endpoints are plain functions: the synchronous Session would otherwise
+# block the event loop, so FastAPI runs them in its worker threadpool instead
 
 
 @router.post("", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
-async def create_bid_standalone(
+def create_bid_standalone(
     bid_request: BidCreateRequest,
     db: Session = Depends(get_db),
     current_user: Account = Depends(get_current_user)
@@ -44,7 +145,6 @@ async def create_bid_standalone(
     - Bid throttle (30 seconds between bids)
     """
     now = datetime.now(timezone.utc)
-    now_str = now.isoformat()
     
     # Only delivery personnel can bid
     if current_user.type != "delivery":
@@ -70,12 +170,13 @@ async def create_bid_standalone(
     order_id = bid_request.order_id
     
     # Get order
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if not order:
+    row = db.query(Order, Order.bidding_open).filter(Order.id == order_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order {order_id} not found"
         )
+    order, bidding_open = row
     
     # Order must be in 'paid' status for bidding
     if order.status != "paid":
@@ -85,64 +186,48 @@ async def create_bid_standalone(
         )
     
     # Check if bidding has closed
-    if order.bidding_closes_at:
-        closes_at = datetime.fromisoformat(order.bidding_closes_at.replace('Z', '+00:00'))
-        if now > closes_at:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Bidding has closed for this order"
-            )
-    
-    # Check if this delivery person already bid on this order
-    existing_bid = db.query(Bid).filter(
-        Bid.orderID == order_id,
-        Bid.deliveryPersonID == current_user.ID
-    ).first()
-    
-    if existing_bid:
+    if not bidding_open:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already submitted a bid for this order"
+            detail="Bidding has closed for this order"
         )
     
-    # Check bid throttle - get user's most recent bid
-    last_bid = db.query(Bid).filter(
-        Bid.deliveryPersonID == current_user.ID
-    ).order_by(Bid.id.desc()).first()
-    
-    if last_bid and last_bid.created_at:
-        last_bid_time = datetime.fromisoformat(last_bid.created_at.replace('Z', '+00:00'))
-        time_since_last_bid = (now - last_bid_time).total_seconds()
-        if time_since_last_bid < BID_THROTTLE_SECONDS:
-            wait_time = int(BID_THROTTLE_SECONDS - time_since_last_bid)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Please wait {wait_time} seconds before placing another bid"
-            )
+    # Check bid throttle (30 seconds between bids)
+    check_bid_throttle(db, current_user.ID, order_id, now)
     
     # Create bid
     bid = Bid(
         deliveryPersonID=current_user.ID,
         orderID=order_id,
         bidAmount=bid_request.price_cents,
-        estimated_minutes=bid_request.estimated_minutes,
-        created_at=now_str
+        estimated_minutes=bid_request.estimated_minutes
     )
     db.add(bid)
     
     # Set bidding close time if not already set
     if not order.bidding_closes_at:
-        order.bidding_closes_at = (now + timedelta(minutes=BIDDING_DURATION_MINUTES)).isoformat()
+        order.bidding_closes_at = now + timedelta(minutes=BIDDING_DURATION_MINUTES)
     
-    db.commit()
+    # One bid per user per order: a repeat fails on the unique
+    # (deliveryPersonID, orderID) index, also under concurrent requests
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already submitted a bid for this order"
+        )
+    bid_throttle.record(current_user.ID)
     db.refresh(bid)
     
-    # Check if this is the lowest bid
-    lowest_bid = db.query(Bid).filter(
-        Bid.orderID == order_id
-    ).order_by(Bid.bidAmount.asc()).first()
+    # Lowest if no other bid on the order is at or below it (ties keep the earlier bid)
+    min_other_amount = db.query(func.min(Bid.bidAmount)).filter(
+        Bid.orderID == order_id,
+        Bid.id != bid.id
+    ).scalar()
     
-    is_lowest = lowest_bid is not None and lowest_bid.id == bid.id
+    is_lowest = min_other_amount is None or bid.bidAmount < min_other_amount
     
     return BidResponse(
         id=bid.id,
@@ -156,7 +241,7 @@ async def create_bid_standalone(
 
 
 @router.get("/scoreboard", response_model=List[DeliveryPersonStats])
-async def get_delivery_scoreboard(
+def get_delivery_scoreboard(
     limit: int = Query(20, ge=1, le=100, description="Max results to return"),
     sort_by: str = Query("rating", description="Sort by: rating, on_time, deliveries"),
     db: Session = Depends(get_db),
@@ -166,42 +251,37 @@ async def get_delivery_scoreboard(
     Get a scoreboard of all delivery personnel with their stats.
     Manager-only endpoint for evaluating delivery people.
     """
-    # Get all delivery personnel with their ratings
-    delivery_accounts = db.query(Account).filter(
-        Account.type == "delivery"
-    ).all()
-    
-    results = []
-    for account in delivery_accounts:
-        # Get delivery rating
-        rating = db.query(DeliveryRating).filter(
-            DeliveryRating.accountID == account.ID
-        ).first()
-        
-        on_time_pct = 0.0
-        if rating and rating.total_deliveries > 0:
-            on_time_pct = (rating.on_time_deliveries / rating.total_deliveries) * 100
-        
-        results.append(DeliveryPersonStats(
-            account_id=account.ID,
-            email=account.email,
-            average_rating=float(rating.averageRating) if rating else 0.0,
-            reviews=rating.reviews if rating else 0,
-            total_deliveries=rating.total_deliveries if rating else 0,
-            on_time_deliveries=rating.on_time_deliveries if rating else 0,
-            on_time_percentage=round(on_time_pct, 1),
-            avg_delivery_minutes=rating.avg_delivery_minutes if rating else 30,
-            warnings=account.warnings
-        ))
-    
-    # Sort results
-    if sort_by == "rating":
-        results.sort(key=lambda x: (-x.average_rating, -x.reviews))
-    elif sort_by == "on_time":
-        results.sort(key=lambda x: (-x.on_time_percentage, -x.total_deliveries))
+    # Sort keys computed in SQL; people without a DeliveryRating row rank
+    # with the default (zero) stats
+    rating_x100 = func.coalesce(DeliveryRating.avg_rating_x100, 0)
+    reviews = func.coalesce(DeliveryRating.reviews, 0)
+    total_deliveries = func.coalesce(DeliveryRating.total_deliveries, 0)
+    on_time_key = func.round(func.coalesce(
+        DeliveryRating.on_time_deliveries * 100.0 / func.nullif(DeliveryRating.total_deliveries, 0), 0
+    ), 1)
+    if sort_by == "on_time":
+        ordering = (on_time_key.desc(), total_deliveries.desc())
     elif sort_by == "deliveries":
-        results.sort(key=lambda x: (-x.total_deliveries, -x.average_rating))
+        ordering = (total_deliveries.desc(), rating_x100.desc())
     else:
-        results.sort(key=lambda x: (-x.average_rating, -x.reviews))
+        ordering = (rating_x100.desc(), reviews.desc())
+    
+    # The requested page of the scoreboard, computed, sorted and limited in
+    # one query; people without a DeliveryRating row get the default stats
+    scoreboard = select(
+        Account.ID.label("account_id"),
+        Account.email,
+        (rating_x100 / 100.0).label("average_rating"),
+        reviews.label("reviews"),
+        total_deliveries.label("total_deliveries"),
+        func.coalesce(DeliveryRating.on_time_deliveries, 0).label("on_time_deliveries"),
+        on_time_key.label("on_time_percentage"),
+        func.coalesce(DeliveryRating.avg_delivery_minutes, 30).label("avg_delivery_minutes"),
+        Account.warnings
+    ).select_from(Account).outerjoin(
+        DeliveryRating, DeliveryRating.accountID == Account.ID
+    ).where(
+        Account.type == "delivery"
+    ).order_by(*ordering, Account.ID).limit(limit)
     
-    return results[:limit]
+    return [DeliveryPersonStats(**row._mapping) for row in db.execute(scoreboard)]
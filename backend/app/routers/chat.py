@@ -23,12 +23,12 @@ Flow:
 import os
 import logging
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func, or_
+from sqlalchemy import text, func, or_, insert, column, Float
 
 from app.database import get_db
 from app.models import Account, KnowledgeBase, ChatLog, KBContribution
@@ -57,6 +57,23 @@ def get_iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def bulk_log_chat(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert many chat_log rows in one executemany INSERT, bypassing the ORM
+    unit of work. Rows must all have the same keys; created_at defaults to
+    the database clock. Returns the new ids in row order.
+    
+    For batch ingest/backfill - /chat/query writes its single row through
+    the session because it returns the id to the caller.
+    """
+    if not rows:
+        return []
+    return list(db.execute(
+        insert(ChatLog).returning(ChatLog.id, sort_by_parameter_order=True),
+        rows
+    ).scalars())
+
+
 def search_knowledge_base(
     db: Session, 
     question: str, 
@@ -70,8 +87,9 @@ def search_knowledge_base(
     search_query = " | ".join(question.lower().split())
     
     try:
-        # Use full-text search with ts_rank for relevance scoring
-        result = db.execute(
+        # Use full-text search with ts_rank for relevance scoring; the
+        # matching row is mapped straight onto KnowledgeBase alongside its rank
+        result = db.query(KnowledgeBase, column("rank", Float)).from_statement(
             text("""
                 SELECT 
                     id, 
@@ -82,20 +100,19 @@ def search_knowledge_base(
                     author_id,
                     is_active,
                     created_at,
+                    updated_at,
                     ts_rank(search_vector, plainto_tsquery('english', :query)) as rank
                 FROM knowledge_base
                 WHERE is_active = TRUE
                   AND search_vector @@ plainto_tsquery('english', :query)
                 ORDER BY rank DESC, confidence DESC
                 LIMIT 1
-            """),
-            {"query": question}
-        ).fetchone()
+            """)
+        ).params(query=question).first()
         
         if result:
-            # Create KnowledgeBase object from result
-            kb_entry = db.query(KnowledgeBase).filter(KnowledgeBase.id == result[0]).first()
-            match_score = float(result[8]) if result[8] else 0.0
+            kb_entry, rank = result
+            match_score = float(rank) if rank else 0.0
             
             # Combine match score with KB confidence
             effective_confidence = (match_score * 0.5 + float(kb_entry.confidence) * 0.5)
@@ -10,6 +10,7 @@ Provides customer-facing dashboard data including:
 """
 
 import logging
+from functools import lru_cache
 from datetime import datetime, timezone
 from typing import Optional, List
 
@@ -39,10 +40,12 @@ VIP_DISCOUNT_PERCENT = 5  # 5% discount for VIP
 VIP_FREE_DELIVERY_EVERY_N_ORDERS = 3  # Free delivery every 3 orders
 
 
+@lru_cache(maxsize=1024)
 def format_cents_to_dollars(cents: int) -> str:
-    """Format cents as dollar string"""
-    dollars = cents / 100
-    return f"${dollars:,.2f}"
+    """Format cents as dollar string, in integer arithmetic"""
+    sign = "-" if cents < 0 else ""
+    whole, rem = divmod(abs(cents), 100)
+    return f"${sign}{whole:,}.{rem:02d}"
 
 
 def dish_to_response(dish: Dish) -> DishResponse:
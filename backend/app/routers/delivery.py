@@ -14,17 +14,18 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, desc, and_
+from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
 from app.auth import get_current_user
 from app.models import Account, Order, OrderedDish, Bid, DeliveryRating, OrderDeliveryReview, CustomerReview
+from app.routers.bids import bid_throttle, check_bid_throttle
 from app.schemas import BidCreateRequest, BidResponse
 
 router = APIRouter(prefix="/delivery", tags=["Delivery"])
 
 # Configuration
 BIDDING_DURATION_MINUTES = 30  # How long bidding stays open
-BID_THROTTLE_SECONDS = 30  # Minimum time between bids from same user
 
 
 def require_delivery_person(current_user: Account = Depends(get_current_user)) -> Account:
@@ -48,9 +49,6 @@ async def get_available_orders(
     Get orders that are open for bidding.
     Only shows orders with status 'paid' and bidding not yet closed.
     """
-    now = datetime.now(timezone.utc)
-    now_str = now.isoformat()
-    
     # Get orders that are open for bidding
     query = db.query(Order).options(
         joinedload(Order.ordered_dishes).joinedload(OrderedDish.dish),
@@ -62,10 +60,7 @@ async def get_available_orders(
     # Filter out orders where bidding has closed
     # Orders with bidding_closes_at set and past are excluded
     # Orders without bidding_closes_at are included (legacy or new orders)
-    query = query.filter(
-        (Order.bidding_closes_at == None) | 
-        (Order.bidding_closes_at > now_str)
-    )
+    query = query.filter(Order.bidding_open)
     
     total = query.count()
     orders = query.order_by(Order.id.desc()).offset(offset).limit(limit).all()
@@ -210,15 +205,15 @@ async def place_bid(
     - Bid throttle: minimum 30 seconds between bids
     """
     now = datetime.now(timezone.utc)
-    now_str = now.isoformat()
     
     # Get order
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if not order:
+    row = db.query(Order, Order.bidding_open).filter(Order.id == order_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order {order_id} not found"
         )
+    order, bidding_open = row
     
     # Order must be in 'paid' status
     if order.status != "paid":
@@ -228,64 +223,48 @@ async def place_bid(
         )
     
     # Check if bidding has closed
-    if order.bidding_closes_at:
-        closes_at = datetime.fromisoformat(order.bidding_closes_at.replace('Z', '+00:00'))
-        if now > closes_at:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Bidding has closed for this order"
-            )
-    
-    # Check if user already bid on this order
-    existing_bid = db.query(Bid).filter(
-        Bid.orderID == order_id,
-        Bid.deliveryPersonID == current_user.ID
-    ).first()
-    
-    if existing_bid:
+    if not bidding_open:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already submitted a bid for this order"
+            detail="Bidding has closed for this order"
         )
     
-    # Check bid throttle - get user's most recent bid
-    last_bid = db.query(Bid).filter(
-        Bid.deliveryPersonID == current_user.ID
-    ).order_by(Bid.id.desc()).first()
-    
-    if last_bid and last_bid.created_at:
-        last_bid_time = datetime.fromisoformat(last_bid.created_at.replace('Z', '+00:00'))
-        time_since_last_bid = (now - last_bid_time).total_seconds()
-        if time_since_last_bid < BID_THROTTLE_SECONDS:
-            wait_time = int(BID_THROTTLE_SECONDS - time_since_last_bid)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Please wait {wait_time} seconds before placing another bid"
-            )
+    # Check bid throttle (30 seconds between bids)
+    check_bid_throttle(db, current_user.ID, order_id, now)
     
     # Create bid
     bid = Bid(
         deliveryPersonID=current_user.ID,
         orderID=order_id,
         bidAmount=bid_request.price_cents,
-        estimated_minutes=bid_request.estimated_minutes,
-        created_at=now_str
+        estimated_minutes=bid_request.estimated_minutes
     )
     db.add(bid)
     
     # Set bidding close time if not already set
     if not order.bidding_closes_at:
-        order.bidding_closes_at = (now + timedelta(minutes=BIDDING_DURATION_MINUTES)).isoformat()
-    
-    db.commit()
+        order.bidding_closes_at = now + timedelta(minutes=BIDDING_DURATION_MINUTES)
+    
+    # One bid per user per order: a repeat fails on the unique
+    # (deliveryPersonID, orderID) index, also under concurrent requests
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already submitted a bid for this order"
+        )
+    bid_throttle.record(current_user.ID)
     db.refresh(bid)
     
-    # Check if this is the lowest bid
-    lowest_bid = db.query(Bid).filter(
-        Bid.orderID == order_id
-    ).order_by(Bid.bidAmount.asc()).first()
+    # Lowest if no other bid on the order is at or below it (ties keep the earlier bid)
+    min_other_amount = db.query(func.min(Bid.bidAmount)).filter(
+        Bid.orderID == order_id,
+        Bid.id != bid.id
+    ).scalar()
     
-    is_lowest = lowest_bid is not None and lowest_bid.id == bid.id
+    is_lowest = min_other_amount is None or bid.bidAmount < min_other_amount
     
     return BidResponse(
         id=bid.id,
@@ -477,7 +456,7 @@ async def mark_order_delivered(
     
     # Check if on time (compare estimated to actual)
     if order.dateTime and assigned_bid.estimated_minutes:
-        order_time = datetime.fromisoformat(order.dateTime.replace('Z', '+00:00'))
+        order_time = datetime.fromisoformat(order.dateTime)
         expected_delivery = order_time + timedelta(minutes=assigned_bid.estimated_minutes)
         if now <= expected_delivery:
             delivery_rating.on_time_deliveries += 1
@@ -13,7 +13,7 @@ from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy import func, desc
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, undefer
 
 from app.database import get_db
 from app.auth import get_current_user, get_current_user_optional
@@ -40,8 +40,9 @@ async def list_threads(
     List all forum threads with pagination.
     Optionally filter by restaurant or category.
     """
+    # List view only needs post headers - skip titles and bodies
     query = db.query(Thread).options(
-        joinedload(Thread.posts),
+        joinedload(Thread.posts).load_only(Post.id, Post.posterID, Post.datetime),
         joinedload(Thread.restaurant)
     )
     
@@ -138,7 +139,7 @@ async def create_thread(
             threadID=post.threadID,
             posterID=post.posterID,
             title=post.title,
-            body=post.body,
+            body=request.body,
             datetime=post.datetime
         )]
     )
@@ -153,7 +154,10 @@ async def get_thread(
     Get a thread with all its posts.
     """
     thread = db.query(Thread).options(
-        joinedload(Thread.posts).joinedload(Post.poster)
+        joinedload(Thread.posts).options(
+            undefer(Post.body),
+            joinedload(Post.poster)
+        )
     ).filter(Thread.id == thread_id).first()
     
     if not thread:
@@ -226,7 +230,7 @@ async def add_post(
         threadID=post.threadID,
         posterID=post.posterID,
         title=post.title,
-        body=post.body,
+        body=request.body,
         datetime=post.datetime
     )
 
@@ -23,6 +23,7 @@ from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_
+from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
 from app.models import (
@@ -33,6 +34,8 @@ from app.schemas import (
     DeliveryPersonStats, KnowledgeBaseEntry
 )
 from app.auth import get_current_user, require_manager, hash_password
+from app.reputation_engine import create_manager_notification, resolve_complaint_with_audit
+from app.routers.account import flush_transactions, transaction_row
 
 logger = logging.getLogger(__name__)
 
@@ -72,29 +75,6 @@ def create_audit_entry(
     return entry
 
 
-def create_manager_notification(
-    db: Session,
-    notification_type: str,
-    title: str,
-    message: str,
-    related_account_id: Optional[int] = None,
-    related_order_id: Optional[int] = None
-) -> ManagerNotification:
-    """Create a notification for managers"""
-    notification = ManagerNotification(
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        related_account_id=related_account_id,
-        related_order_id=related_order_id,
-        is_read=False,
-        created_at=get_iso_now()
-    )
-    db.add(notification)
-    db.flush()
-    return notification
-
-
 # ============================================================
 # Pydantic Schemas for Manager Endpoints
 # ============================================================
@@ -824,15 +804,8 @@ async def create_employee(
             detail="Manager must be associated with a restaurant to create employees"
         )
     
-    # Check if email already exists
-    existing = db.query(Account).filter(Account.email == request.email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
-    
-    # Create employee account
+    # Create employee account; a taken email is reported by the unique
+    # constraint when the row is flushed, so no pre-check query is needed
     employee = Account(
         email=request.email,
         password=hash_password(request.password),
@@ -845,7 +818,14 @@ async def create_employee(
         is_fired=False
     )
     db.add(employee)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already registered"
+        )
     
     # Create delivery rating record for delivery personnel
     if request.role == "delivery":
@@ -873,7 +853,6 @@ async def create_employee(
     )
     
     db.commit()
-    db.refresh(employee)
     
     logger.info(f"Employee {employee.email} ({request.role}) created by manager {current_user.email}")
     
@@ -1186,6 +1165,7 @@ async def evaluate_all_employees(
     ).all()
     
     results = []
+    bonus_transactions = []
     
     for emp in employees:
         # Count complaints with warning issued
@@ -1250,6 +1230,10 @@ async def evaluate_all_employees(
         elif should_bonus and not should_demote:
             # Give bonus of 10% of wage
             bonus_amount = int((emp.wage or 1500) * 0.1)
+            bonus_transactions.append(transaction_row(
+                emp.ID, bonus_amount, emp.balance or 0, "bonus",
+                description="Automatic performance bonus"
+            ))
             emp.balance = (emp.balance or 0) + bonus_amount
             action_taken = f"bonus_{bonus_amount}"
             
@@ -1275,6 +1259,8 @@ async def evaluate_all_employees(
             "action_taken": action_taken
         })
     
+    # Ledger entries for every bonus credited, in one INSERT
+    flush_transactions(db, bonus_transactions)
     db.commit()
     
     return {
@@ -1393,11 +1379,8 @@ async def resolve_dispute(
             detail="Complaint already resolved"
         )
     
-    # Update complaint
-    complaint.status = "resolved"
-    complaint.resolution = "warning_issued" if request.resolution == "uphold" else "dismissed"
-    complaint.resolved_by = current_user.ID
-    complaint.resolved_at = get_iso_now()
+    # The complaint itself is marked resolved together with its audit entry below
+    resolution = "warning_issued" if request.resolution == "uphold" else "dismissed"
     
     warning_applied_to = None
     new_warning_count = None
@@ -1505,14 +1488,14 @@ async def resolve_dispute(
                 )
                 db.add(blacklist_entry)
     
-    # Create audit entry
-    audit_entry = create_audit_entry(
+    # Resolve the complaint and create its audit entry in one statement
+    audit_log_id = resolve_complaint_with_audit(
         db,
+        complaint,
+        resolution=resolution,
         action_type="dispute_resolved",
         actor_id=current_user.ID,
         target_id=warning_applied_to,
-        complaint_id=complaint.id,
-        order_id=complaint.order_id,
         details={
             "resolution": request.resolution,
             "notes": request.notes,
@@ -1537,7 +1520,7 @@ async def resolve_dispute(
         blacklisted=blacklisted,
         employee_demoted=employee_demoted,
         employee_fired=employee_fired,
-        audit_log_id=audit_entry.id
+        audit_log_id=audit_log_id
     )
 
 
@@ -18,10 +18,12 @@ from app.models import Account, Order, OrderedDish, Dish, Bid, Transaction, Deli
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
 from app.auth import get_current_user, require_manager
 from app.models import Account, Order, OrderedDish, Dish, Bid, Transaction, DeliveryRating
+from app.routers.bids import bid_throttle, check_bid_throttle
 from app.schemas import (
     OrderCreateRequest,
     OrderResponse,
@@ -69,8 +71,7 @@ def create_transaction(
         transaction_type=transaction_type,
         reference_type=reference_type,
         reference_id=reference_id,
-        description=description,
-        created_at=datetime.now(timezone.utc).isoformat()
+        description=description
     )
     db.add(transaction)
     return transaction
@@ -443,9 +444,8 @@ async def create_order(
                 current_user.free_delivery_credits += 1
                 logger.info(f"VIP {current_user.email} earned a free delivery credit! Total: {current_user.free_delivery_credits}")
         
+        # expire_on_commit=False keeps order and balance loaded; no re-SELECT needed
         db.commit()
-        db.refresh(order)
-        db.refresh(current_user)
         
         # Build response with dish details
         ordered_dishes_response = []
@@ -541,9 +541,6 @@ async def get_order(
         ordered_dishes=ordered_dishes_response
     )
 
-# Configuration for bid throttling
-BID_THROTTLE_SECONDS = 30  # Minimum time between bids from same user
-
 
 @router.post("/{order_id}/bid", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
 async def create_bid(
@@ -562,7 +559,6 @@ async def create_bid(
     - Bid throttle (30 seconds between bids)
     """
     now = datetime.now(timezone.utc)
-    now_str = now.isoformat()
     
     # Only delivery personnel can bid
     if current_user.type != "delivery":
@@ -572,12 +568,13 @@ async def create_bid(
         )
     
     # Get order
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if not order:
+    row = db.query(Order, Order.bidding_open).filter(Order.id == order_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order {order_id} not found"
         )
+    order, bidding_open = row
     
     # Order must be in 'paid' status for bidding
     if order.status != "paid":
@@ -587,59 +584,44 @@ async def create_bid(
         )
     
     # Check if bidding has closed
-    if order.bidding_closes_at and isinstance(order.bidding_closes_at, str):
-        closes_at = datetime.fromisoformat(order.bidding_closes_at.replace('Z', '+00:00'))
-        if now > closes_at:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Bidding has closed for this order"
-            )
-    
-    # Check if this delivery person already bid on this order
-    existing_bid = db.query(Bid).filter(
-        Bid.orderID == order_id,
-        Bid.deliveryPersonID == current_user.ID
-    ).first()
-    
-    if existing_bid:
+    if not bidding_open:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already submitted a bid for this order"
+            detail="Bidding has closed for this order"
         )
     
-    # Check bid throttle - get user's most recent bid
-    last_bid = db.query(Bid).filter(
-        Bid.deliveryPersonID == current_user.ID
-    ).order_by(Bid.id.desc()).first()
-    
-    if last_bid and last_bid.created_at and isinstance(last_bid.created_at, str):
-        last_bid_time = datetime.fromisoformat(last_bid.created_at.replace('Z', '+00:00'))
-        time_since_last_bid = (now - last_bid_time).total_seconds()
-        if time_since_last_bid < BID_THROTTLE_SECONDS:
-            wait_time = int(BID_THROTTLE_SECONDS - time_since_last_bid)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Please wait {wait_time} seconds before placing another bid"
-            )
+    # Check bid throttle (30 seconds between bids)
+    check_bid_throttle(db, current_user.ID, order_id, now)
     
     # Create bid
     bid = Bid(
         deliveryPersonID=current_user.ID,
         orderID=order_id,
         bidAmount=bid_request.price_cents,
-        estimated_minutes=bid_request.estimated_minutes,
-        created_at=now_str
+        estimated_minutes=bid_request.estimated_minutes
     )
     db.add(bid)
-    db.commit()
+    
+    # One bid per user per order: a repeat fails on the unique
+    # (deliveryPersonID, orderID) index, also under concurrent requests
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already submitted a bid for this order"
+        )
+    bid_throttle.record(current_user.ID)
     db.refresh(bid)
     
-    # Check if this is the lowest bid
-    lowest_bid = db.query(Bid).filter(
-        Bid.orderID == order_id
-    ).order_by(Bid.bidAmount.asc()).first()
+    # Lowest if no other bid on the order is at or below it (ties keep the earlier bid)
+    min_other_amount = db.query(func.min(Bid.bidAmount)).filter(
+        Bid.orderID == order_id,
+        Bid.id != bid.id
+    ).scalar()
     
-    is_lowest = lowest_bid is not None and lowest_bid.id == bid.id
+    is_lowest = min_other_amount is None or bid.bidAmount < min_other_amount
     
     return BidResponse(
         id=bid.id,
@@ -865,8 +847,7 @@ async def chef_mark_prepared(
         action_type="chef_mark_prepared",
         actor_id=current_user.ID,
         order_id=order.id,
-        details={"prepared_dish_ids": prepared_dish_ids},
-        created_at=datetime.now(timezone.utc).isoformat()
+        details={"prepared_dish_ids": prepared_dish_ids}
     )
     db.add(log)
     db.commit()
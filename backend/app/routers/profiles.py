@@ -7,6 +7,7 @@ Endpoints for viewing and editing user profiles:
 """
 
 import logging
+from functools import lru_cache
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -30,9 +31,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/profiles", tags=["Profiles"])
 
 
+@lru_cache(maxsize=1024)
 def format_cents_to_dollars(cents: int) -> str:
-    """Format cents as dollar string"""
-    return f"${cents / 100:,.2f}"
+    """Format cents as dollar string, in integer arithmetic"""
+    sign = "-" if cents < 0 else ""
+    whole, rem = divmod(abs(cents), 100)
+    return f"${sign}{whole:,}.{rem:02d}"
 
 
 def dish_to_response(dish: Dish) -> DishResponse:
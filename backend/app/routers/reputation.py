@@ -18,7 +18,7 @@ from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 from app.database import get_db
 from app.models import Account, Complaint, AuditLog, Blacklist, ManagerNotification, Dish, Order, OrderedDish, Bid, DeliveryRating
@@ -73,29 +73,6 @@ def create_audit_entry(
     return entry
 
 
-def create_manager_notification(
-    db: Session,
-    notification_type: str,
-    title: str,
-    message: str,
-    related_account_id: Optional[int] = None,
-    related_order_id: Optional[int] = None
-) -> ManagerNotification:
-    """Create a notification for managers"""
-    notification = ManagerNotification(
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        related_account_id=related_account_id,
-        related_order_id=related_order_id,
-        is_read=False,
-        created_at=get_iso_now()
-    )
-    db.add(notification)
-    db.flush()
-    return notification
-
-
 def check_and_apply_customer_warning_rules(db: Session, account: Account, manager_id: int) -> Optional[str]:
     """
     Apply warning rules for customers/VIPs:
@@ -127,7 +104,7 @@ def check_and_apply_customer_warning_rules(db: Session, account: Account, manage
             details={"warnings": account.warnings, "reason": "3 warnings threshold"}
         )
         
-        create_manager_notification(
+        rep_engine.create_manager_notification(
             db,
             notification_type="customer_blacklisted",
             title=f"Customer Blacklisted",
@@ -152,7 +129,7 @@ def check_and_apply_customer_warning_rules(db: Session, account: Account, manage
             details={"from_type": "vip", "to_type": "customer", "warnings_cleared": old_warnings}
         )
         
-        create_manager_notification(
+        rep_engine.create_manager_notification(
             db,
             notification_type="vip_demoted",
             title=f"VIP Demoted",
@@ -215,7 +192,7 @@ def check_and_apply_chef_rules(db: Session, chef: Account, manager_id: int) -> O
                 }
             )
             
-            create_manager_notification(
+            rep_engine.create_manager_notification(
                 db,
                 notification_type="chef_fired",
                 title=f"Chef Fired",
@@ -246,7 +223,7 @@ def check_and_apply_chef_rules(db: Session, chef: Account, manager_id: int) -> O
                 }
             )
             
-            create_manager_notification(
+            rep_engine.create_manager_notification(
                 db,
                 notification_type="chef_demoted",
                 title=f"Chef Demoted",
@@ -460,7 +437,7 @@ async def file_complaint(
                 detail="Cannot file a complaint about yourself"
             )
         
-        about_account = db.query(Account).filter(Account.ID == request.about_user_id).first()
+        about_account = db.get(Account, request.about_user_id)
         if not about_account:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -551,8 +528,8 @@ async def list_complaints(
     # Build response with email lookups
     response_complaints = []
     for c in complaints:
-        filer_account = db.query(Account).filter(Account.ID == c.filer).first()
-        about_account = db.query(Account).filter(Account.ID == c.accountID).first() if c.accountID else None
+        filer_account = db.get(Account, c.filer)
+        about_account = db.get(Account, c.accountID) if c.accountID else None
         
         response_complaints.append(ComplaintResponse(
             id=c.id,
@@ -595,8 +572,8 @@ async def get_complaint(
             detail="Complaint not found"
         )
     
-    filer_account = db.query(Account).filter(Account.ID == complaint.filer).first()
-    about_account = db.query(Account).filter(Account.ID == complaint.accountID).first() if complaint.accountID else None
+    filer_account = db.get(Account, complaint.filer)
+    about_account = db.get(Account, complaint.accountID) if complaint.accountID else None
     
     return ComplaintResponse(
         id=complaint.id,
@@ -684,8 +661,8 @@ async def dispute_complaint(
     )
     
     # Notify managers
-    filer = db.query(Account).filter(Account.ID == complaint.filer).first()
-    create_manager_notification(
+    filer = db.get(Account, complaint.filer)
+    rep_engine.create_manager_notification(
         db,
         notification_type="complaint_disputed",
         title="Complaint Disputed",
@@ -724,7 +701,7 @@ async def get_my_filed_complaints(
     
     response_complaints = []
     for c in complaints:
-        about_account = db.query(Account).filter(Account.ID == c.accountID).first() if c.accountID else None
+        about_account = db.get(Account, c.accountID) if c.accountID else None
         
         response_complaints.append(ComplaintResponse(
             id=c.id,
@@ -770,7 +747,7 @@ async def get_complaints_against_me(
     
     response_complaints = []
     for c in complaints:
-        filer_account = db.query(Account).filter(Account.ID == c.filer).first()
+        filer_account = db.get(Account, c.filer)
         
         response_complaints.append(ComplaintResponse(
             id=c.id,
@@ -831,10 +808,9 @@ async def resolve_complaint(
     # Handle compliment resolution separately
     if complaint.type == "compliment":
         result = rep_engine.process_compliment_resolution(db, complaint, current_user.ID)
-        db.commit()
         
-        # Create audit entry
-        audit_entry = rep_engine.create_audit_entry(
+        # Create audit entry (committed together with the resolution)
+        audit_log_id = rep_engine.insert_audit_entry(
             db,
             action_type="compliment_resolved",
             actor_id=current_user.ID,
@@ -850,7 +826,7 @@ async def resolve_complaint(
             warning_applied_to=None,
             warning_count=None,
             account_status_changed=None,
-            audit_log_id=audit_entry.id
+            audit_log_id=audit_log_id
         )
     
     # Use reputation engine for dispute resolution
@@ -883,14 +859,12 @@ async def resolve_complaint(
     
     # Get warning count if we have a target
     if warning_applied_to and warning_count is None:
-        target = db.query(Account).filter(Account.ID == warning_applied_to).first()
+        target = db.get(Account, warning_applied_to)
         if target:
             warning_count = target.warnings
     
-    db.commit()
-    
-    # Create final audit entry
-    audit_entry = rep_engine.create_audit_entry(
+    # Create final audit entry (committed together with the resolution)
+    audit_log_id = rep_engine.insert_audit_entry(
         db,
         action_type="complaint_resolved_with_engine",
         actor_id=current_user.ID,
@@ -917,7 +891,7 @@ async def resolve_complaint(
         warning_applied_to=warning_applied_to,
         warning_count=warning_count,
         account_status_changed=account_status_changed,
-        audit_log_id=audit_entry.id
+        audit_log_id=audit_log_id
     )
 
 
@@ -953,7 +927,7 @@ async def list_audit_logs(
             target_id=e.target_id,
             complaint_id=e.complaint_id,
             order_id=e.order_id,
-            details=e.details,
+            details=e.full_details,
             created_at=e.created_at
         ) for e in entries],
         total=total
@@ -1006,14 +980,19 @@ async def mark_notification_read(
     db: Session = Depends(get_db)
 ):
     """Mark a notification as read."""
-    notification = db.query(ManagerNotification).filter(ManagerNotification.id == notification_id).first()
-    if not notification:
+    # One round trip: UPDATE ... RETURNING tells us whether the row exists
+    marked_id = db.execute(
+        update(ManagerNotification)
+        .where(ManagerNotification.id == notification_id)
+        .values(is_read=True)
+        .returning(ManagerNotification.id)
+    ).scalar_one_or_none()
+    if marked_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
-    notification.is_read = True
     db.commit()
     
     return {"message": "Notification marked as read"}
@@ -1079,7 +1058,7 @@ async def get_my_complaint_summary(
     # Build response
     recent_items_response = []
     for item in recent_items:
-        filer_account = db.query(Account).filter(Account.ID == item.filer).first()
+        filer_account = db.get(Account, item.filer)
         recent_items_response.append({
             "id": item.id,
             "type": item.type,
@@ -1330,12 +1309,9 @@ async def get_employee_reputation(
     Get reputation summary for a specific employee.
     Employees can view their own, managers can view any.
     """
-    employee = db.query(Account).filter(
-        Account.ID == employee_id,
-        Account.type.in_(["chef", "delivery"])
-    ).first()
+    summary = rep_engine.get_cached_employee_reputation_summary(db, employee_id)
     
-    if not employee:
+    if not summary or summary["type"] not in ("chef", "delivery"):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
@@ -1348,8 +1324,6 @@ async def get_employee_reputation(
             detail="Can only view your own reputation"
         )
     
-    summary = rep_engine.get_employee_reputation_summary(db, employee)
-    
     status_warning = None
     if summary["near_firing"]:
         status_warning = "One more demotion will result in termination"
@@ -6,7 +6,6 @@ Integrates with reputation engine for automatic rule evaluation.
 
 import logging
 from datetime import datetime, timezone
-from decimal import Decimal
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
@@ -17,7 +16,7 @@ from app.database import get_db
 from app.auth import get_current_user
 from app.models import (
     Account, Dish, Order, OrderedDish, DishReview, OrderDeliveryReview,
-    DeliveryRating, Bid, CustomerReview
+    Bid, CustomerReview
 )
 from app.schemas import (
     DishReviewCreateRequest, DishReviewResponse, DishReviewListResponse,
@@ -117,21 +116,25 @@ async def create_dish_review(
     
     total_rating = sum(r.rating for r in all_reviews) + request.rating
     new_count = len(all_reviews) + 1
-    new_average = Decimal(str(total_rating / new_count))
     
-    dish.average_rating = round(new_average, 2)
+    # Average kept in rating*100 units, rounded half-up
+    old_dish_avg_x100, old_dish_reviews = dish.avg_rating_x100, dish.reviews
+    dish.avg_rating_x100 = (total_rating * 100 + new_count // 2) // new_count
     dish.reviews = new_count
     
     # Trigger reputation engine for chef rating update
-    rule_results = None
     if dish.chefID:
         chef = db.query(Account).filter(Account.ID == dish.chefID).first()
         if chef:
-            # Recalculate chef's rolling average from all their dishes
-            rep_engine.recalculate_chef_rating_from_dishes(db, chef)
+            # Fold this dish's new rating into the chef's rolling average
+            rep_engine.apply_dish_rating_change(
+                db, chef,
+                old_dish_avg_x100, old_dish_reviews,
+                dish.avg_rating_x100, dish.reviews
+            )
             
-            # Evaluate rules (may trigger demotion/bonus)
-            rule_results = rep_engine.evaluate_employee_rules(db, chef, current_user.ID)
+            # Evaluate rules once at commit (may trigger demotion/bonus)
+            rep_engine.defer_employee_rules(db, chef, current_user.ID)
     
     db.commit()
     db.refresh(review)
@@ -272,41 +275,19 @@ async def create_delivery_review(
     )
     db.add(review)
     
-    # Update delivery person's overall rating
-    delivery_rating = db.query(DeliveryRating).filter(
-        DeliveryRating.accountID == bid.deliveryPersonID
-    ).first()
-    
-    if not delivery_rating:
-        delivery_rating = DeliveryRating(
-            accountID=bid.deliveryPersonID,
-            averageRating=Decimal("0.00"),
-            reviews=0,
-            total_deliveries=0,
-            on_time_deliveries=0
-        )
-        db.add(delivery_rating)
-    
-    # Update stats
-    total_rating = float(delivery_rating.averageRating or 0) * delivery_rating.reviews
-    total_rating += request.rating
-    delivery_rating.reviews += 1
-    delivery_rating.averageRating = Decimal(str(total_rating / delivery_rating.reviews))
-    delivery_rating.total_deliveries += 1
-    
-    if request.on_time:
-        delivery_rating.on_time_deliveries += 1
-    
     # Trigger reputation engine for delivery person rating update
-    rule_results = None
     delivery_person = db.query(Account).filter(Account.ID == bid.deliveryPersonID).first()
     if delivery_person:
-        # Update the rolling average on the account as well
-        rep_engine.update_employee_rating(db, delivery_person, request.rating, current_user.ID)
-        # Sync from DeliveryRating table
-        rep_engine.recalculate_delivery_rating(db, delivery_person)
-        # Evaluate rules
-        rule_results = rep_engine.evaluate_employee_rules(db, delivery_person, current_user.ID)
+        # Update the rolling average on the account as well; rules are
+        # evaluated once at commit, after the DeliveryRating sync below
+        rep_engine.update_employee_rating(
+            db, delivery_person, request.rating, current_user.ID, defer_rules=True
+        )
+    
+    # Upsert the delivery person's overall rating and sync it onto the account
+    rep_engine.upsert_delivery_rating(
+        db, bid.deliveryPersonID, request.rating, request.on_time, delivery_person
+    )
     
     db.commit()
     db.refresh(review)
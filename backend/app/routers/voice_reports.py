@@ -7,13 +7,13 @@ import logging
 import os
 import shutil
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, insert
 
 from app.database import get_db
 from app.auth import get_current_user
@@ -49,6 +49,20 @@ def get_iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def bulk_log_voice(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert many voice_reports rows in one executemany INSERT, bypassing the
+    ORM unit of work. Rows must all have the same keys; created_at defaults
+    to the database clock. Returns the new ids in row order.
+    """
+    if not rows:
+        return []
+    return list(db.execute(
+        insert(VoiceReport).returning(VoiceReport.id, sort_by_parameter_order=True),
+        rows
+    ).scalars())
+
+
 def ensure_audio_storage_dir():
     """Ensure audio storage directory exists"""
     AUDIO_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
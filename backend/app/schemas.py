@@ -700,6 +700,7 @@ class TransactionListResponse(BaseModel):
     """List of transactions"""
     transactions: List[TransactionResponse]
     total: int
+    next_before_id: Optional[int] = None  # Cursor for the next page, None on the last one
 
 
 # ============================================================
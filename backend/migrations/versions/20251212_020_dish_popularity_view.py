@@ -0,0 +1,43 @@
+"""Add dish_popularity materialized view
+
+Revision ID: 20251212_020
+Revises: 20251211_019
+Create Date: 2025-12-12
+
+Adds a dish_popularity materialized view that aggregates ordered_dishes per dish
+(order_count, units). Popularity counters are recomputed by a periodic
+REFRESH MATERIALIZED VIEW CONCURRENTLY instead of being bumped on the order
+write path, so order inserts never contend on a popular dish's row lock.
+
+The unique index on dish_id is required for CONCURRENTLY refreshes.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_020'
+down_revision = '20251211_019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS dish_popularity AS
+        SELECT "DishID" AS dish_id,
+               COUNT(*) AS order_count,
+               SUM(quantity) AS units
+        FROM ordered_dishes
+        GROUP BY "DishID";
+    """)
+
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_dish_popularity_dish
+        ON dish_popularity(dish_id);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_dish_popularity_dish;")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS dish_popularity;")
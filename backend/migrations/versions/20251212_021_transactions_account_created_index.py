@@ -0,0 +1,36 @@
+"""Add (accountID, created_at) index on transactions and cluster on it
+
+Revision ID: 20251212_021
+Revises: 20251212_020
+Create Date: 2025-12-12
+
+Transactions are almost always read as "most recent N for account X".
+A composite index on ("accountID", created_at DESC) serves that query
+directly, and clustering the table on it keeps each account's ledger
+physically adjacent on disk.
+
+Note: CLUSTER is a one-off rewrite; re-run it periodically (or after
+large backfills) to keep the physical order tight.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_021'
+down_revision = '20251212_020'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_created
+        ON transactions("accountID", created_at DESC);
+    """)
+
+    op.execute("CLUSTER transactions USING idx_transactions_account_created;")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_transactions_account_created;")
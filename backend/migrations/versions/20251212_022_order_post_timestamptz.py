@@ -0,0 +1,58 @@
+"""Convert orders."dateTime" and post.datetime to TIMESTAMPTZ
+
+Revision ID: 20251212_022
+Revises: 20251212_021
+Create Date: 2025-12-12
+
+Both columns were stored as ISO-8601 TEXT, so range filters and
+ORDER BY "dateTime" DESC compared strings and could not use a btree
+range scan. They become TIMESTAMP WITH TIME ZONE (8 bytes, chronological
+ordering) and orders gets a descending index for recent-orders queries.
+
+The ORM maps them with models.IsoTimestamp, which still reads/writes ISO
+strings, so no API payloads change.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_022'
+down_revision = '20251212_021'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE orders
+        ALTER COLUMN "dateTime" TYPE TIMESTAMPTZ
+        USING NULLIF("dateTime"::text, '')::timestamptz;
+    """)
+
+    op.execute("""
+        ALTER TABLE post
+        ALTER COLUMN datetime TYPE TIMESTAMPTZ
+        USING NULLIF(datetime::text, '')::timestamptz;
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_orders_datetime
+        ON orders("dateTime" DESC);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_orders_datetime;")
+
+    op.execute("""
+        ALTER TABLE post
+        ALTER COLUMN datetime TYPE TEXT
+        USING to_char(datetime AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"');
+    """)
+
+    op.execute("""
+        ALTER TABLE orders
+        ALTER COLUMN "dateTime" TYPE TEXT
+        USING to_char("dateTime" AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"');
+    """)
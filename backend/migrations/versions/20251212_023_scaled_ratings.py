@@ -0,0 +1,56 @@
+"""Store average ratings as SMALLINT rating*100
+
+Revision ID: 20251212_023
+Revises: 20251212_022
+Create Date: 2025-12-12
+
+Replaces the NUMERIC(3,2) average rating columns with SMALLINT columns
+holding rating*100 (e.g. 4.75 -> 475):
+- dishes.average_rating          -> dishes.avg_rating_x100
+- agent_answer.average_rating    -> agent_answer.avg_rating_x100
+- "DeliveryRating"."averageRating" -> "DeliveryRating".avg_rating_x100
+
+Integer storage is 2 bytes, exact and cheaper to aggregate than NUMERIC.
+The ORM keeps exposing average_rating / averageRating in rating units
+through models.scaled_rating.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_023'
+down_revision = '20251212_022'
+branch_labels = None
+depends_on = None
+
+
+RATING_COLUMNS = [
+    ('dishes', 'average_rating'),
+    ('agent_answer', 'average_rating'),
+    ('"DeliveryRating"', '"averageRating"'),
+]
+
+
+def upgrade() -> None:
+    for table, column in RATING_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT;")
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE SMALLINT
+            USING ROUND({column} * 100)::smallint;
+        """)
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN {column} TO avg_rating_x100;")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN avg_rating_x100 SET DEFAULT 0;")
+
+
+def downgrade() -> None:
+    for table, column in RATING_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN avg_rating_x100 DROP DEFAULT;")
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN avg_rating_x100 TO {column};")
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE NUMERIC(3,2)
+            USING ({column} / 100.0)::numeric(3,2);
+        """)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT 0.00;")
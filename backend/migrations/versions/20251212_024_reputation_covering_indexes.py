@@ -0,0 +1,41 @@
+"""Add covering/composite indexes for reputation queries
+
+Revision ID: 20251212_024
+Revises: 20251212_023
+Create Date: 2025-12-12
+
+Chef rating recalculation aggregates dishes WHERE "chefID" = ? AND
+reviews > 0, reading only avg_rating_x100 and reviews. A partial index on
+"chefID" that INCLUDEs those two columns lets Postgres answer it with an
+index-only scan instead of fetching every dish row from the heap.
+
+Reputation checks also filter complaints per account by status, served by
+a composite ("accountID", status) index.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_024'
+down_revision = '20251212_023'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_dishes_chef_reviews
+        ON dishes("chefID") INCLUDE (avg_rating_x100, reviews)
+        WHERE reviews > 0;
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_complaint_account_status
+        ON complaint("accountID", status);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_complaint_account_status;")
+    op.execute("DROP INDEX IF EXISTS idx_dishes_chef_reviews;")
@@ -0,0 +1,67 @@
+"""Convert event created_at columns to TIMESTAMPTZ and add BRIN index on audit_log
+
+Revision ID: 20251212_025
+Revises: 20251212_024
+Create Date: 2025-12-12
+
+complaint, transactions, audit_log, manager_notifications, chat_log and
+voice_reports stored created_at as ISO-8601 TEXT (~32 bytes, string
+comparisons on range filters). They become TIMESTAMP WITH TIME ZONE
+(8 bytes, chronological ordering) with DEFAULT now(), so the reputation
+engine no longer formats a timestamp per audit/notification row.
+
+audit_log is append-only, so created_at tracks physical row order and a
+BRIN index covers time-range scans at a fraction of a btree's size.
+
+The ORM maps these columns with models.IsoTimestamp; API payloads still
+carry ISO strings.
+
+Some databases already have TIMESTAMPTZ here (e.g. audit_log from
+20251201_007); the USING clause casts through ::text so it works for both.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_025'
+down_revision = '20251212_024'
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    'complaint',
+    'transactions',
+    'audit_log',
+    'manager_notifications',
+    'chat_log',
+    'voice_reports',
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN created_at TYPE TIMESTAMPTZ
+            USING NULLIF(created_at::text, '')::timestamptz;
+        """)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now();")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_audit_log_created_brin
+        ON audit_log USING brin (created_at);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_audit_log_created_brin;")
+
+    for table in reversed(TABLES):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at DROP DEFAULT;")
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN created_at TYPE TEXT
+            USING to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"');
+        """)
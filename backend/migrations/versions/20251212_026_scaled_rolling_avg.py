@@ -0,0 +1,44 @@
+"""Store accounts.rolling_avg_rating as SMALLINT rating*100
+
+Revision ID: 20251212_026
+Revises: 20251212_025
+Create Date: 2025-12-12
+
+Same conversion as 20251212_023, for the employee rolling average that is
+rewritten on every rating event:
+- accounts.rolling_avg_rating -> accounts.rolling_avg_x100
+
+The reputation engine now updates it with integer arithmetic only; the ORM
+still exposes rolling_avg_rating in rating units via models.scaled_rating.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_026'
+down_revision = '20251212_025'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE accounts ALTER COLUMN rolling_avg_rating DROP DEFAULT;")
+    op.execute("""
+        ALTER TABLE accounts
+        ALTER COLUMN rolling_avg_rating TYPE SMALLINT
+        USING ROUND(rolling_avg_rating * 100)::smallint;
+    """)
+    op.execute("ALTER TABLE accounts RENAME COLUMN rolling_avg_rating TO rolling_avg_x100;")
+    op.execute("ALTER TABLE accounts ALTER COLUMN rolling_avg_x100 SET DEFAULT 0;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE accounts ALTER COLUMN rolling_avg_x100 DROP DEFAULT;")
+    op.execute("ALTER TABLE accounts RENAME COLUMN rolling_avg_x100 TO rolling_avg_rating;")
+    op.execute("""
+        ALTER TABLE accounts
+        ALTER COLUMN rolling_avg_rating TYPE NUMERIC(3,2)
+        USING (rolling_avg_rating / 100.0)::numeric(3,2);
+    """)
+    op.execute("ALTER TABLE accounts ALTER COLUMN rolling_avg_rating SET DEFAULT 0.00;")
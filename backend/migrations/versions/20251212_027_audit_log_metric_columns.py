@@ -0,0 +1,63 @@
+"""Promote frequent audit_log.details keys to typed columns
+
+Revision ID: 20251212_027
+Revises: 20251212_026
+Create Date: 2025-12-12
+
+Reputation audit rows almost always carry the same few numeric keys in the
+details JSON. They become typed, nullable columns (ratings as rating*100):
+- new_rating, old_avg_x100, new_avg_x100, total_ratings,
+  old_complaint_count, new_complaint_count
+
+details keeps everything else. Existing rows are backfilled and the promoted
+keys removed from their JSON. The API still returns the merged view via
+AuditLog.full_details.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_027'
+down_revision = '20251212_026'
+branch_labels = None
+depends_on = None
+
+
+# (column, type, details key, SQL expression converting the JSON text value)
+METRIC_COLUMNS = [
+    ('new_rating', sa.SmallInteger(), 'new_rating', "(details->>'new_rating')::numeric::smallint"),
+    ('old_avg_x100', sa.SmallInteger(), 'old_avg', "ROUND((details->>'old_avg')::numeric * 100)::smallint"),
+    ('new_avg_x100', sa.SmallInteger(), 'new_avg', "ROUND((details->>'new_avg')::numeric * 100)::smallint"),
+    ('total_ratings', sa.Integer(), 'total_ratings', "(details->>'total_ratings')::numeric::integer"),
+    ('old_complaint_count', sa.Integer(), 'old_complaint_count', "(details->>'old_complaint_count')::numeric::integer"),
+    ('new_complaint_count', sa.Integer(), 'new_complaint_count', "(details->>'new_complaint_count')::numeric::integer"),
+]
+
+
+def upgrade() -> None:
+    for column, column_type, _, _ in METRIC_COLUMNS:
+        op.add_column('audit_log', sa.Column(column, column_type, nullable=True))
+
+    for column, _, key, expression in METRIC_COLUMNS:
+        op.execute(f"""
+            UPDATE audit_log
+            SET {column} = {expression},
+                details = details - '{key}'
+            WHERE details ? '{key}'
+              AND jsonb_typeof(details->'{key}') = 'number';
+        """)
+
+
+def downgrade() -> None:
+    for column, _, key, _ in METRIC_COLUMNS:
+        value = f"{column} / 100.0" if column.endswith('_x100') else column
+        op.execute(f"""
+            UPDATE audit_log
+            SET details = COALESCE(details, '{{}}'::jsonb) || jsonb_build_object('{key}', {value})
+            WHERE {column} IS NOT NULL;
+        """)
+
+    for column, _, _, _ in reversed(METRIC_COLUMNS):
+        op.drop_column('audit_log', column)
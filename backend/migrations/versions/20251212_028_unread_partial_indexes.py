@@ -0,0 +1,46 @@
+"""Add partial indexes for unread/unprocessed work queues
+
+Revision ID: 20251212_028
+Revises: 20251212_027
+Create Date: 2025-12-12
+
+Unread manager notifications, flagged-but-unreviewed chat logs and
+unprocessed voice reports are small slices of tables that only grow.
+Partial indexes over just those rows stay proportional to the backlog
+rather than the history, and rows drop out of them once handled.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_028'
+down_revision = '20251212_027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_manager_notifications_unread
+        ON manager_notifications(created_at DESC)
+        WHERE is_read = false;
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chat_log_flagged_unreviewed
+        ON chat_log(created_at DESC)
+        WHERE flagged = true AND reviewed = false;
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_voice_reports_unprocessed
+        ON voice_reports(status)
+        WHERE is_processed = false;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_voice_reports_unprocessed;")
+    op.execute("DROP INDEX IF EXISTS idx_chat_log_flagged_unreviewed;")
+    op.execute("DROP INDEX IF EXISTS idx_manager_notifications_unread;")
@@ -0,0 +1,37 @@
+"""Set fillfactor on accounts for HOT counter updates
+
+Revision ID: 20251212_029
+Revises: 20251212_028
+Create Date: 2025-12-12
+
+The reputation engine updates complaint_count, compliment_count,
+rolling_avg_x100, total_rating_count and warnings on nearly every event.
+None of these columns is indexed (the accounts indexes cover email, type,
+restaurant and is_blacklisted only), so with free space left on each heap
+page Postgres can apply those UPDATEs as HOT updates: no new index entries,
+less bloat and WAL.
+
+fillfactor only affects pages written from now on; VACUUM FULL rewrites the
+existing table with it. VACUUM cannot run inside a transaction, hence the
+autocommit block. It takes an exclusive lock on accounts while it runs.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_029'
+down_revision = '20251212_028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE accounts SET (fillfactor = 80);")
+
+    with op.get_context().autocommit_block():
+        op.execute("VACUUM FULL accounts;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE accounts RESET (fillfactor);")
@@ -0,0 +1,145 @@
+"""Partition audit_log and transactions by month
+
+Revision ID: 20251212_030
+Revises: 20251212_029
+Create Date: 2025-12-12
+
+Both tables are append-only and grow without bound. They become
+PARTITION BY RANGE (created_at) parents with one partition per UTC month,
+so inserts only touch the current month's (small) indexes and time-bounded
+reads prune to the months they cover.
+
+Each table is rebuilt: the old one is renamed, a partitioned copy is created
+with the same columns, defaults and CHECK constraints, rows are copied over
+and the old table's indexes and foreign keys are recreated on the new parent
+(Postgres cascades them to every partition). The primary key becomes
+(id, created_at) because a partitioned table's unique constraints must
+include the partition key; ids still come from the original sequence.
+
+ensure_monthly_partitions(parent, months_ahead) creates any missing monthly
+partitions from the oldest row up to months_ahead months from now. It is
+idempotent and is called periodically by app.background_tasks. A DEFAULT
+partition catches rows outside every monthly range.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_030'
+down_revision = '20251212_029'
+branch_labels = None
+depends_on = None
+
+
+PARTITIONED_TABLES = ['audit_log', 'transactions']
+
+# Months of partitions created ahead of the current one
+MONTHS_AHEAD = 3
+
+
+def _indexes_and_foreign_keys(bind, table):
+    """Definitions of the table's secondary indexes and foreign keys"""
+    indexes = bind.execute(sa.text("""
+        SELECT indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = :table
+          AND indexname NOT IN (
+              SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass)
+          )
+    """), {"table": table}).scalars().all()
+    foreign_keys = bind.execute(sa.text("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'
+    """), {"table": table}).all()
+    return indexes, foreign_keys
+
+
+def _rebuild(bind, table, partitioned):
+    """Recreate table (partitioned or plain) with its data, indexes and FKs"""
+    legacy = f"{table}_legacy"
+    indexes, foreign_keys = _indexes_and_foreign_keys(bind, table)
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}
+    ).scalar()
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy};')
+    if partitioned:
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE
+            ) PARTITION BY RANGE (created_at);
+        """)
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, created_at);')
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT;')
+        op.execute(f"""
+            SELECT ensure_monthly_partitions(
+                '{table}', {MONTHS_AHEAD}, (SELECT MIN(created_at) FROM {legacy})
+            );
+        """)
+        # The partition key is part of the primary key and cannot be NULL;
+        # undated rows land in the DEFAULT partition
+        op.execute(f'UPDATE {legacy} SET created_at = to_timestamp(0) WHERE created_at IS NULL;')
+    else:
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE
+            );
+        """)
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id);')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {legacy};')
+    if sequence:
+        # Keep the id sequence alive when the old table is dropped
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id;")
+    op.execute(f'DROP TABLE {legacy} CASCADE;')
+
+    for indexdef in indexes:
+        # Definitions were read before the rename, so they already name the
+        # new table; ON ONLY (partitioned parents) must cascade again
+        op.execute(indexdef.replace(' ON ONLY ', ' ON ', 1) + ';')
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition};')
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+            parent TEXT, months_ahead INTEGER, since TIMESTAMPTZ DEFAULT NULL
+        ) RETURNS INTEGER AS $$
+        DECLARE
+            month_start TIMESTAMP := date_trunc('month', COALESCE(since, now()) AT TIME ZONE 'UTC');
+            last_month TIMESTAMP := date_trunc('month', now() AT TIME ZONE 'UTC')
+                                    + make_interval(months => months_ahead);
+            partition_name TEXT;
+            created INTEGER := 0;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                partition_name := format('%s_p%s', parent, to_char(month_start, 'YYYY_MM'));
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, parent,
+                        month_start AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                    created := created + 1;
+                END IF;
+                month_start := month_start + interval '1 month';
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    bind = op.get_bind()
+    for table in PARTITIONED_TABLES:
+        _rebuild(bind, table, partitioned=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in PARTITIONED_TABLES:
+        _rebuild(bind, table, partitioned=False)
+
+    op.execute("DROP FUNCTION IF EXISTS ensure_monthly_partitions(TEXT, INTEGER, TIMESTAMPTZ);")
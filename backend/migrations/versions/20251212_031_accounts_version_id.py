@@ -0,0 +1,35 @@
+"""Add version_id to accounts for optimistic locking
+
+Revision ID: 20251212_031
+Revises: 20251212_030
+Create Date: 2025-12-12
+
+Account maps version_id as its SQLAlchemy version_id_col: every ORM UPDATE
+of an account includes "AND version_id = <loaded version>" and increments it.
+Two requests that read the same balance and both try to write it can no
+longer silently lose one of the updates; the second one fails with
+StaleDataError and is retried on fresh data.
+
+Existing rows start at version 1. The column is a plain integer with a
+constant default, so the ALTER does not rewrite the table.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_031'
+down_revision = '20251212_030'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE accounts
+        ADD COLUMN IF NOT EXISTS version_id INTEGER NOT NULL DEFAULT 1;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS version_id;")
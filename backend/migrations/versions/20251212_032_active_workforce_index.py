@@ -0,0 +1,36 @@
+"""Add partial index for active chefs and delivery people
+
+Revision ID: 20251212_032
+Revises: 20251212_031
+Create Date: 2025-12-12
+
+run_all_employee_evaluations selects type IN ('chef', 'delivery') AND
+is_fired = false, and the bidding-eligibility helpers select
+type = 'delivery' AND is_fired = false. Both predicates imply this index's
+WHERE clause, so they read only the small active workforce instead of
+scanning every customer account.
+
+The indexed and predicate columns only change when an employee is hired,
+fired or reassigned; reputation counter UPDATEs remain HOT updates.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_032'
+down_revision = '20251212_031'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_accounts_active_workforce
+        ON accounts(type)
+        WHERE is_fired = false AND type IN ('chef', 'delivery');
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_accounts_active_workforce;")
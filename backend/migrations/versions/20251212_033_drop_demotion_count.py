@@ -0,0 +1,31 @@
+"""Drop accounts.demotion_count
+
+Revision ID: 20251212_033
+Revises: 20251212_032
+Create Date: 2025-12-12
+
+demotion_count was a copy of times_demoted kept in sync on every demotion.
+Account.demotion_count is now a synonym for times_demoted, so the duplicate
+column is dropped. Downgrade restores it from times_demoted.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_033'
+down_revision = '20251212_032'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS demotion_count;")
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE accounts
+        ADD COLUMN IF NOT EXISTS demotion_count INTEGER NOT NULL DEFAULT 0;
+    """)
+    op.execute("UPDATE accounts SET demotion_count = times_demoted WHERE times_demoted > 0;")
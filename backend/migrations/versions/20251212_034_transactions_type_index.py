@@ -0,0 +1,31 @@
+"""Add transactions (accountID, transaction_type, created_at) index
+
+Revision ID: 20251212_034
+Revises: 20251212_033
+Create Date: 2025-12-12
+
+The transaction history page filters by type. This index serves the
+filtered "recent N for account X" page and its window count the same way
+idx_transactions_account_created serves the unfiltered one. Created on the
+partitioned parent, it cascades to every monthly partition.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_034'
+down_revision = '20251212_033'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_type_created
+        ON transactions("accountID", transaction_type, created_at DESC);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_transactions_account_type_created;")
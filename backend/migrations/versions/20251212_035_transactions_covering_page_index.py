@@ -0,0 +1,41 @@
+"""Make the type-filtered transaction history index covering
+
+Revision ID: 20251212_035
+Revises: 20251212_034
+Create Date: 2025-12-12
+
+The transaction history page filters by ("accountID", transaction_type),
+orders by (created_at DESC, id DESC) and reads every column of the page's
+rows. idx_transactions_account_type_page keys on the filter and the full
+sort order and INCLUDEs the remaining columns, so a page is answered by an
+index-only scan with no heap fetches and no sort. It replaces
+idx_transactions_account_type_created (20251212_034), so inserts still
+maintain one index for the filtered page. Created on the partitioned
+parent, it cascades to every monthly partition.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_035'
+down_revision = '20251212_034'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_type_page
+        ON transactions("accountID", transaction_type, created_at DESC, id DESC)
+        INCLUDE (amount_cents, balance_before, balance_after, reference_type, reference_id, description);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_transactions_account_type_created;")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_type_created
+        ON transactions("accountID", transaction_type, created_at DESC);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_transactions_account_type_page;")
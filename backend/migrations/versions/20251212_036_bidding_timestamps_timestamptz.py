@@ -0,0 +1,51 @@
+"""Convert orders.bidding_closes_at and bid.created_at to TIMESTAMPTZ
+
+Revision ID: 20251212_036
+Revises: 20251212_035
+Create Date: 2025-12-12
+
+Both columns were ISO-8601 TEXT, so every bid parsed the order's deadline
+and the bidder's previous bid time in Python. As TIMESTAMP WITH TIME ZONE
+the bid endpoints check the deadline with bidding_closes_at > now() in the
+order lookup and fetch a previous bid only when it falls inside the
+throttle window. bid.created_at gets DEFAULT now(), so the router no longer
+formats a timestamp per bid.
+
+The ORM maps these columns with models.IsoTimestamp; API payloads still
+carry ISO strings.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_036'
+down_revision = '20251212_035'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ('orders', 'bidding_closes_at'),
+    ('bid', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE TIMESTAMPTZ
+            USING NULLIF({column}::text, '')::timestamptz;
+        """)
+    op.execute("ALTER TABLE bid ALTER COLUMN created_at SET DEFAULT now();")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bid ALTER COLUMN created_at DROP DEFAULT;")
+    for table, column in reversed(COLUMNS):
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE TEXT
+            USING to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"');
+        """)
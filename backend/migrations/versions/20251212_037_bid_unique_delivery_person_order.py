@@ -0,0 +1,44 @@
+"""Enforce one bid per delivery person per order
+
+Revision ID: 20251212_037
+Revises: 20251212_036
+Create Date: 2025-12-12
+
+idx_bid_delivery_person_order makes the one-bid-per-order rule a
+constraint. A repeat bid, including a concurrent one, fails on insert with
+a unique violation, which the bid endpoints report as a 400. They no longer
+look for an earlier bid up front; only a throttled attempt checks the
+index to tell a repeat bid from a throttled one (routers.bids.check_bid_throttle).
+
+Existing duplicates are removed first, keeping the bid an order accepted
+(orders."bidID") or else the earliest one.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_037'
+down_revision = '20251212_036'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM bid b
+        USING bid keep
+        WHERE keep."deliveryPersonID" = b."deliveryPersonID"
+          AND keep."orderID" = b."orderID"
+          AND keep.id <> b.id
+          AND NOT EXISTS (SELECT 1 FROM orders o WHERE o."bidID" = b.id)
+          AND (keep.id < b.id OR EXISTS (SELECT 1 FROM orders o WHERE o."bidID" = keep.id));
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_bid_delivery_person_order
+        ON bid("deliveryPersonID", "orderID");
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_bid_delivery_person_order;")
@@ -0,0 +1,32 @@
+"""Index bids by bidder and creation time for the bid throttle
+
+Revision ID: 20251212_038
+Revises: 20251212_037
+Create Date: 2025-12-12
+
+Placing a bid reads the bidder's latest bid inside the throttle window as
+MAX(created_at) over ("deliveryPersonID", created_at > cutoff).
+idx_bid_delivery_person_created answers it from the first matching index
+entry, with no heap row fetched and no sort. Repeat bids on an order are
+rejected by the unique idx_bid_delivery_person_order (20251212_037).
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_038'
+down_revision = '20251212_037'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bid_delivery_person_created
+        ON bid("deliveryPersonID", created_at DESC);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_bid_delivery_person_created;")
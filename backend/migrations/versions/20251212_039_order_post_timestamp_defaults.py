@@ -0,0 +1,30 @@
+"""Default orders."dateTime" and post.datetime to now()
+
+Revision ID: 20251212_039
+Revises: 20251212_038
+Create Date: 2025-12-12
+
+20251212_022 converted both columns to TIMESTAMPTZ but left them without
+a default, so every insert had to format its own timestamp. With DEFAULT
+now() the database stamps rows that do not set one, like the other
+created_at columns. Existing rows are unchanged.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_039'
+down_revision = '20251212_038'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('ALTER TABLE orders ALTER COLUMN "dateTime" SET DEFAULT now();')
+    op.execute("ALTER TABLE post ALTER COLUMN datetime SET DEFAULT now();")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE post ALTER COLUMN datetime DROP DEFAULT;")
+    op.execute('ALTER TABLE orders ALTER COLUMN "dateTime" DROP DEFAULT;')
@@ -191,7 +191,7 @@ SELECT setval('"accounts_ID_seq"', 11, true);
 -- Dishes 3 and 5 are VIP-only specialty dishes
 
 -- Dish 1: Signature Burger (by Chef Gordon)
-INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, average_rating, reviews, "chefID", is_specialty)
+INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, avg_rating_x100, reviews, "chefID", is_specialty)
 VALUES (
     1,
     1,
@@ -199,14 +199,14 @@ VALUES (
     'Juicy Angus beef patty with aged cheddar, caramelized onions, lettuce, tomato, and our secret DashX sauce on a brioche bun.',
     1599,  -- $15.99
     '/images/dishes/signature-burger.jpg',
-    4.75,
+    475,   -- 4.75 stars
     48,
     2,
     false
 );
 
 -- Dish 2: Truffle Fries (by Chef Julia)
-INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, average_rating, reviews, "chefID", is_specialty)
+INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, avg_rating_x100, reviews, "chefID", is_specialty)
 VALUES (
     2,
     1,
@@ -214,14 +214,14 @@ VALUES (
     'Crispy golden fries tossed with truffle oil, fresh parmesan, and herbs. A perfect side or snack.',
     899,   -- $8.99
     '/images/dishes/truffle-fries.jpg',
-    4.50,
+    450,   -- 4.50 stars
     72,
     3,
     false
 );
 
 -- Dish 3: Grilled Salmon (by Chef Gordon) - VIP SPECIALTY
-INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, average_rating, reviews, "chefID", is_specialty)
+INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, avg_rating_x100, reviews, "chefID", is_specialty)
 VALUES (
     3,
     1,
@@ -229,14 +229,14 @@ VALUES (
     'Fresh Atlantic salmon fillet, grilled to perfection with lemon butter sauce, served with seasonal vegetables and rice pilaf. VIP exclusive specialty dish.',
     2499,  -- $24.99
     '/images/dishes/grilled-salmon.jpg',
-    4.80,
+    480,   -- 4.80 stars
     35,
     2,
     true
 );
 
 -- Dish 4: Caesar Salad (by Chef Julia)
-INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, average_rating, reviews, "chefID", is_specialty)
+INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, avg_rating_x100, reviews, "chefID", is_specialty)
 VALUES (
     4,
     1,
@@ -244,14 +244,14 @@ VALUES (
     'Crisp romaine lettuce, house-made caesar dressing, parmesan crisps, and garlic croutons. Add grilled chicken for $5.',
     1299,  -- $12.99
     '/images/dishes/caesar-salad.jpg',
-    4.20,
+    420,   -- 4.20 stars
     55,
     3,
     false
 );
 
 -- Dish 5: Chocolate Lava Cake (by Chef Julia) - VIP SPECIALTY
-INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, average_rating, reviews, "chefID", is_specialty)
+INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, avg_rating_x100, reviews, "chefID", is_specialty)
 VALUES (
     5,
     1,
@@ -259,7 +259,7 @@ VALUES (
     'Warm chocolate cake with a gooey molten center, served with vanilla ice cream and fresh berries. VIP exclusive specialty dish.',
     999,   -- $9.99
     '/images/dishes/chocolate-lava.jpg',
-    4.90,
+    490,   -- 4.90 stars
     88,
     3,
     true
@@ -401,12 +401,12 @@ VALUES
 -- =============================================================================
 
 -- Delivery rating for Mike (ID: 4)
-INSERT INTO "DeliveryRating" ("accountID", "averageRating", reviews)
-VALUES (4, 5.00, 1);
+INSERT INTO "DeliveryRating" ("accountID", avg_rating_x100, reviews)
+VALUES (4, 500, 1);
 
 -- Delivery rating for Lisa (ID: 5)
-INSERT INTO "DeliveryRating" ("accountID", "averageRating", reviews)
-VALUES (5, 4.50, 2);
+INSERT INTO "DeliveryRating" ("accountID", avg_rating_x100, reviews)
+VALUES (5, 450, 2);
 
 -- =============================================================================
 -- COMPLAINT
@@ -459,13 +459,13 @@ VALUES (
 );
 
 -- AI-generated answer
-INSERT INTO agent_answer (id, "queryID", answer, "authorID", average_rating, reviews)
+INSERT INTO agent_answer (id, "queryID", answer, "authorID", avg_rating_x100, reviews)
 VALUES (
     1,
     1,
     'We have several vegetarian options! Our Classic Caesar Salad is a great choice, and our Truffle Parmesan Fries are vegetarian-friendly. We can also modify the Signature Burger to a veggie patty upon request.',
     NULL,  -- AI generated
-    4.5,
+    450,   -- 4.50 stars
     2
 );
 
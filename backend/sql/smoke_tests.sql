@@ -101,7 +101,7 @@ SELECT
     d.id,
     d.name,
     d.price / 100.0 as price_dollars,
-    d.average_rating,
+    d.avg_rating_x100 / 100.0 as average_rating,
     COALESCE(SUM(od.quantity), 0) as total_ordered
 FROM dishes d
 LEFT JOIN ordered_dishes od ON d.id = od.dish_id
@@ -120,10 +120,10 @@ LIMIT 5;
 SELECT 
     id,
     name,
-    average_rating,
+    avg_rating_x100 / 100.0 as average_rating,
     review_count
 FROM dishes
-ORDER BY average_rating DESC, review_count DESC
+ORDER BY avg_rating_x100 DESC, review_count DESC
 LIMIT 5;
 
 \echo ''
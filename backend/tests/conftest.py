@@ -1,8 +1,13 @@
 import os
+from contextlib import contextmanager
 
 # Disable background tasks during testing to avoid PostgreSQL connection attempts
 os.environ["ENABLE_BACKGROUND_TASKS"] = "false"
 os.environ["TESTING"] = "true"
+# Tests read audit rows back inside their own transaction
+os.environ["ASYNC_AUDIT_WRITES"] = "false"
+# Minimum bcrypt cost: hashes stay valid, tests skip ~250 ms per hash
+os.environ.setdefault("BCRYPT_COST", "4")
 
 import pytest
 from sqlalchemy import create_engine, text, event
@@ -21,7 +26,7 @@ from app.models import (
 # Test database setup
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test_db.db"
 engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 @pytest.fixture(scope="session")
 def db_engine():
@@ -51,6 +56,45 @@ def db_session(db_engine):
     transaction.rollback()
     connection.close()
 
+class StatementLog(list):
+    """SQL statements sent to the database while capturing, in order"""
+
+    def __init__(self):
+        super().__init__()
+        self.executemany = []  # Whether each statement was sent as an executemany
+
+    def clear(self):
+        super().clear()
+        self.executemany.clear()
+
+    def kind(self, keyword):
+        """Statements whose leading keyword is keyword (SELECT, INSERT, ...)"""
+        return [statement for statement in self if statement.lstrip().split()[0].upper() == keyword]
+
+    def executemany_of(self, prefix):
+        """executemany flags of the statements starting with prefix"""
+        return [many for statement, many in zip(self, self.executemany) if statement.startswith(prefix)]
+
+@pytest.fixture(scope="function")
+def capture_statements(db_session):
+    """Context manager factory yielding a StatementLog of SQL run on db_session's connection"""
+    @contextmanager
+    def capture():
+        log = StatementLog()
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            log.append(statement)
+            log.executemany.append(executemany)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield log
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return capture
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_db(db_engine):
     """Create tables once for the test session"""
@@ -65,6 +109,26 @@ def setup_test_db(db_engine):
     if os.path.exists("test_db.db"):
         os.remove("test_db.db")
 
+@pytest.fixture(autouse=True)
+def clear_reputation_cache():
+    """Every test rolls its data back, so cached counters must not outlive it"""
+    from app.auth import blacklist_cache, login_rate_limiter, profile_cache, token_cache
+    from app.reputation_engine import reputation_cache
+    from app.routers.bids import bid_throttle
+    reputation_cache.clear()
+    profile_cache.clear()
+    login_rate_limiter.clear()
+    blacklist_cache.clear()
+    bid_throttle.clear()
+    token_cache.clear()
+    yield
+    reputation_cache.clear()
+    profile_cache.clear()
+    login_rate_limiter.clear()
+    blacklist_cache.clear()
+    bid_throttle.clear()
+    token_cache.clear()
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Yields a TestClient that uses the test database session"""
@@ -242,12 +306,12 @@ def seed_db(db_session):
         db_session.add(ordered_dish)
     db_session.flush()
 
-    # Create Bids
+    # Create Bids - both delivery people bid on orders 1-3 (one bid each per order)
     for i in range(1, 7):
         bid = Bid(
             id=i,
-            deliveryPersonID=4,
-            orderID=1 if i < 3 else 2,
+            deliveryPersonID=4 if i % 2 else 5,
+            orderID=(i + 1) // 2,
             bidAmount=500
         )
         db_session.add(bid)
@@ -16,8 +16,12 @@ from datetime import datetime, timezone
 import re
 
 from app.main import app
-from app.auth import hash_password, verify_password, create_access_token, decode_token, get_current_user
+from app.auth import (
+    hash_password, verify_password, create_access_token, decode_token,
+    get_current_user, get_current_profile, account_profile
+)
 from app.database import get_db
+from app.models import Account
 
 
 # Create test client
@@ -43,6 +47,7 @@ def create_mock_user(
     mock_user.warnings = 0
     mock_user.wage = None
     mock_user.restaurantID = None
+    mock_user.customer_tier = "registered"
     mock_user.password = "$2b$12$hashedpassword"
     return mock_user
 
@@ -72,13 +77,13 @@ class TestPasswordHashing:
     """Test password hashing utilities"""
 
     def test_hash_password_returns_hash(self):
-        """Test that hash_password returns a bcrypt hash"""
+        """Test that hash_password returns a SHA-256 pre-hashed bcrypt hash"""
         password = "SecureP@ss123"
         hashed = hash_password(password)
         
         assert hashed is not None
         assert hashed != password
-        assert hashed.startswith("$2b$")  # bcrypt prefix
+        assert hashed.startswith("$bcrypt-sha256$")  # bcrypt over SHA-256 prefix
 
     def test_hash_password_different_for_same_input(self):
         """Test that hashing same password twice produces different hashes (salt)"""
@@ -110,6 +115,35 @@ class TestPasswordHashing:
         
         assert password not in hashed
 
+    def test_long_passwords_differ_past_72_bytes(self):
+        """The SHA-256 pre-hash makes bytes past bcrypt's 72-byte limit count"""
+        password = "A1" * 40
+        hashed = hash_password(password)
+        
+        assert verify_password(password, hashed) is True
+        assert verify_password(password[:72] + "different", hashed) is False
+
+    def test_legacy_bcrypt_hashes_still_verify(self):
+        """Plain bcrypt hashes stored before the pre-hash still log in"""
+        import bcrypt
+        
+        legacy = bcrypt.hashpw(b"SecureP@ss123", bcrypt.gensalt(4)).decode()
+        
+        assert verify_password("SecureP@ss123", legacy) is True
+        assert verify_password("WrongPassword123", legacy) is False
+
+    def test_malformed_hash_fails_without_bcrypt(self):
+        """Empty, short or unrecognized stored hashes are rejected up front"""
+        from app.auth import pwd_context
+        
+        with patch.object(pwd_context, "verify", wraps=pwd_context.verify) as verify:
+            assert verify_password("SecureP@ss123", "") is False
+            assert verify_password("SecureP@ss123", None) is False
+            assert verify_password("SecureP@ss123", "hashed_password") is False
+            assert verify.call_count == 0
+        
+        assert verify_password("SecureP@ss123", "x" * 60) is False
+
 
 # ============================================================
 # JWT Token Tests
@@ -194,6 +228,100 @@ class TestRegistration:
         finally:
             app.dependency_overrides.clear()
 
+    def test_register_taken_email_conflicts_on_insert(self):
+        """A taken email is reported from the unique constraint, without a pre-check query"""
+        from sqlalchemy.exc import IntegrityError
+        from app.models import Blacklist
+        
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.commit.side_effect = IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+        
+        app.dependency_overrides[get_db] = lambda: mock_db
+        
+        try:
+            response = client.post("/auth/register", json={
+                "email": "taken@example.com",
+                "password": "SecureP@ss123"
+            })
+            
+            assert response.status_code == 409
+            assert response.json()["detail"] == "Email already registered"
+            # Only the blacklist is queried before the INSERT
+            assert [c.args[0] for c in mock_db.query.call_args_list] == [Blacklist]
+            mock_db.rollback.assert_called_once()
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_register_blacklisted_email_logs_attempt(self, client, db_session, capture_statements):
+        """A blocked registration writes its notification and audit rows as buffered INSERTs"""
+        from app.models import AuditLog, Blacklist, ManagerNotification
+
+        entry = Blacklist(email="banned@example.com", created_at="2025-12-12T00:00:00+00:00")
+        db_session.add(entry)
+        db_session.commit()
+
+        with capture_statements() as statements:
+            response = client.post("/auth/register", json={
+                "email": "banned@example.com",
+                "password": "SecureP@ss123"
+            })
+
+        assert response.status_code == 403
+        assert len(statements.kind("INSERT")) == 2
+        audit = db_session.query(AuditLog).filter(
+            AuditLog.action_type == "blocked_registration_attempt"
+        ).one()
+        assert audit.details == {"email": "banned@example.com", "blacklist_id": entry.id}
+        assert db_session.query(ManagerNotification).filter(
+            ManagerNotification.notification_type == "blacklist_registration_attempt"
+        ).count() == 1
+
+    def test_register_manager_creates_restaurant_and_account(self, client, db_session):
+        """The manager account is linked to the restaurant created with it"""
+        from app.models import Restaurant
+
+        response = client.post("/auth/register-manager", json={
+            "email": "owner@example.com",
+            "password": "SecureP@ss123",
+            "restaurant_name": " Owner's Diner ",
+            "restaurant_address": "1 Main St"
+        })
+
+        assert response.status_code == 201
+        payload = decode_token(response.json()["access_token"])
+        manager = db_session.get(Account, payload["user_id"])
+        assert (manager.email, manager.type, manager.version_id) == ("owner@example.com", "manager", 1)
+        assert db_session.get(Restaurant, manager.restaurantID).name == "Owner's Diner"
+
+    def test_register_manager_is_one_statement_on_postgres(self):
+        """On PostgreSQL the restaurant INSERT feeds the account INSERT through a CTE"""
+        from sqlalchemy.dialects import postgresql
+
+        mock_db = MagicMock()
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        mock_db.execute.return_value.one.return_value = (42, 7)
+        app.dependency_overrides[get_db] = lambda: mock_db
+
+        try:
+            response = client.post("/auth/register-manager", json={
+                "email": "pg-owner@example.com",
+                "password": "SecureP@ss123",
+                "restaurant_name": "PG Diner",
+                "restaurant_address": "2 Main St"
+            })
+
+            assert response.status_code == 201
+            assert decode_token(response.json()["access_token"])["user_id"] == 42
+            assert mock_db.execute.call_count == 1
+            sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+            assert sql.startswith("WITH new_restaurant AS \n(INSERT INTO restaurant")
+            assert "INSERT INTO accounts" in sql
+            mock_db.add.assert_not_called()
+            mock_db.commit.assert_called_once()
+        finally:
+            app.dependency_overrides.clear()
+
     def test_register_invalid_email(self):
         """Test registration with invalid email format"""
         response = client.post("/auth/register", json={
@@ -321,8 +449,8 @@ class TestLogin:
     def test_login_invalid_credentials(self):
         """Test login with invalid credentials"""
         mock_db = MagicMock()
-        # User not found
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        # User not found (no account, not blacklisted)
+        mock_db.execute.return_value.first.return_value = (None, False)
         
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -343,7 +471,7 @@ class TestLogin:
         password = "MySecretPassword123"
         
         mock_db = MagicMock()
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.execute.return_value.first.return_value = (None, False)
         
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -359,6 +487,88 @@ class TestLogin:
             app.dependency_overrides.clear()
 
 
+class TestLoginLookup:
+    """Login account and blacklist lookups against the test database"""
+
+    def test_login_reads_account_and_blacklist_in_one_query(self, client, db_session, customer_user, capture_statements):
+        """A login costs one SELECT; a blacklisted email is still refused"""
+        from app.models import Blacklist
+        
+        customer_user.password = hash_password("TestP@ss123")
+        db_session.commit()
+        credentials = {"email": customer_user.email, "password": "TestP@ss123"}
+        
+        with capture_statements() as statements:
+            assert client.post("/auth/login", json=credentials).status_code == 200
+        assert len(statements.kind("SELECT")) == 1
+        
+        db_session.add(Blacklist(email=customer_user.email, created_at="2025-12-12T00:00:00+00:00"))
+        db_session.commit()
+        response = client.post("/auth/login", json=credentials)
+        assert response.status_code == 403
+        assert "suspended" in response.json()["detail"]
+
+    def test_login_unknown_email_pays_bcrypt(self, client, db_session):
+        """An unknown email is checked against the dummy hash before the 401"""
+        from app.routers import auth as auth_router
+
+        with patch.object(auth_router, "verify_password", wraps=verify_password) as verify:
+            response = client.post("/auth/login", json={"email": "nobody@test.com", "password": "TestP@ss123"})
+
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid credentials"
+        verify.assert_called_once_with("TestP@ss123", auth_router._DUMMY_HASH)
+
+    def test_login_unknown_email_is_one_query(self, client, db_session, capture_statements):
+        """Without an account the blacklist flag comes from the same SELECT"""
+        from app.models import Blacklist
+
+        credentials = {"email": "gone@test.com", "password": "TestP@ss123"}
+
+        with capture_statements() as statements:
+            assert client.post("/auth/login", json=credentials).status_code == 401
+            db_session.add(Blacklist(email="gone@test.com", created_at="2025-12-12T00:00:00+00:00"))
+            db_session.commit()
+            statements.clear()
+            assert client.post("/auth/login", json=credentials).status_code == 403
+            assert len(statements.kind("SELECT")) == 1
+            
+            # Now known to be blacklisted: refused without a query
+            statements.clear()
+            response = client.post("/auth/login", json=credentials)
+            assert response.status_code == 403
+            assert "suspended" in response.json()["detail"]
+            assert statements.kind("SELECT") == []
+
+
+class TestLoginRateLimit:
+    """Repeated login attempts are refused before the database is queried"""
+
+    def test_attempts_over_limit_get_429(self):
+        from app.auth import LOGIN_ATTEMPT_LIMIT
+
+        mock_db = MagicMock()
+        mock_db.execute.return_value.first.return_value = (None, False)
+        app.dependency_overrides[get_db] = lambda: mock_db
+
+        try:
+            credentials = {"email": "target@example.com", "password": "WrongPassword123"}
+            for _ in range(LOGIN_ATTEMPT_LIMIT):
+                assert client.post("/auth/login", json=credentials).status_code == 401
+
+            mock_db.execute.reset_mock()
+            response = client.post("/auth/login", json=credentials)
+            assert response.status_code == 429
+            assert int(response.headers["Retry-After"]) > 0
+            mock_db.execute.assert_not_called()
+
+            # Other emails from the same client are counted separately
+            other = {"email": "other@example.com", "password": "WrongPassword123"}
+            assert client.post("/auth/login", json=other).status_code == 401
+        finally:
+            app.dependency_overrides.clear()
+
+
 # ============================================================
 # GET /auth/me Endpoint Tests
 # ============================================================
@@ -392,10 +602,11 @@ class TestGetMe:
         mock_user.warnings = 0
         mock_user.wage = None
         mock_user.restaurantID = None
+        mock_user.customer_tier = "registered"
         mock_user.password = "$2b$12$hashedpassword"
         
         # Use dependency override instead of patch
-        app.dependency_overrides[get_current_user] = lambda: mock_user
+        app.dependency_overrides[get_current_profile] = lambda: account_profile(mock_user)
         
         try:
             token = create_access_token(data={"sub": "test@example.com", "user_id": 1})
@@ -412,6 +623,23 @@ class TestGetMe:
             app.dependency_overrides.clear()
 
 
+    def test_me_repeat_token_skips_verification(self):
+        """A token verified once is served from token_cache on the next request"""
+        from app.auth import profile_cache
+
+        mock_user = create_mock_user()
+        profile_cache.set(account_profile(mock_user))
+        token = create_access_token(data={"sub": mock_user.email, "user_id": mock_user.ID})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        with patch("app.auth.decode_token", wraps=decode_token) as decode:
+            assert client.get("/auth/me", headers=headers).status_code == 200
+            assert client.get("/auth/me", headers=headers).status_code == 200
+            assert client.get("/auth/me", headers={"Authorization": "Bearer invalid.token.here"}).status_code == 401
+
+        assert decode.call_count == 2
+
+
 # ============================================================
 # Deposit Endpoint Tests
 # ============================================================
@@ -481,8 +709,10 @@ class TestDeposit:
     
     def test_deposit_success(self):
         """Test successful deposit"""
-        mock_user = create_mock_user(balance=5000)
+        mock_user = Account(ID=1, email="test@example.com", type="customer", balance=5000, version_id=1)
         mock_db = create_mock_db()
+        # UPDATE ... RETURNING balance, version_id
+        mock_db.execute.return_value.first.return_value = (6000, 2)
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -497,13 +727,18 @@ class TestDeposit:
             data = response.json()
             assert data["message"] == "Deposit successful"
             assert data["new_balance_cents"] == 6000  # 5000 + 1000
+            # The ledger row goes to the INSERT that follows the UPDATE
+            ledger_rows = mock_db.execute.call_args_list[-1][0][1]
+            assert ledger_rows[0]["balance_before"] == 5000
+            assert ledger_rows[0]["balance_after"] == 6000
         finally:
             app.dependency_overrides.clear()
     
     def test_deposit_updates_balance(self):
         """Test that deposit correctly updates user balance"""
-        mock_user = create_mock_user(balance=1000)
+        mock_user = Account(ID=1, email="test@example.com", type="customer", balance=1000, version_id=1)
         mock_db = create_mock_db()
+        mock_db.execute.return_value.first.return_value = (3500, 2)
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -548,7 +783,7 @@ class TestBalance:
         """Test successful balance retrieval"""
         mock_user = create_mock_user(balance=12345)
         
-        app.dependency_overrides[get_current_user] = lambda: mock_user
+        app.dependency_overrides[get_current_profile] = lambda: account_profile(mock_user)
         
         try:
             response = client.get("/account/balance")
@@ -564,7 +799,7 @@ class TestBalance:
         """Test balance of zero"""
         mock_user = create_mock_user(balance=0)
         
-        app.dependency_overrides[get_current_user] = lambda: mock_user
+        app.dependency_overrides[get_current_profile] = lambda: account_profile(mock_user)
         
         try:
             response = client.get("/account/balance")
@@ -594,7 +829,7 @@ class TestRoleBasedAccess:
                 detail="Account has been suspended"
             )
         
-        app.dependency_overrides[get_current_user] = mock_user_with_high_warnings
+        app.dependency_overrides[get_current_profile] = mock_user_with_high_warnings
         
         try:
             token = create_access_token(data={"sub": "warned@example.com"})
@@ -12,13 +12,14 @@ Covers:
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock, PropertyMock
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 
 from app.main import app
 from app.auth import create_access_token, get_current_user, require_manager
 from app.database import get_db
 from app.models import Account, Order, Bid, DeliveryRating
+from app.routers.bids import bid_throttle
 
 
 client = TestClient(app)
@@ -136,24 +137,17 @@ class TestCreateBidStandalone:
         
         # Setup query chain
         order_query = MagicMock()
-        order_query.filter.return_value.first.return_value = mock_order
+        order_query.filter.return_value.first.return_value = (mock_order, True)
         
-        bid_query = MagicMock()
-        bid_query.filter.return_value.first.return_value = None  # No existing bid
+        mock_db.execute.return_value.scalar.return_value = None  # No bid inside the throttle window
         
-        lowest_bid_query = MagicMock()
-        lowest_bid_query.filter.return_value.order_by.return_value.first.return_value = None
+        min_bid_query = MagicMock()
+        min_bid_query.filter.return_value.scalar.return_value = None  # No other bids on the order
         
-        call_count = [0]
-        def query_side_effect(model):
-            call_count[0] += 1
+        def query_side_effect(model, *columns):
             if model == Order:
                 return order_query
-            elif model == Bid:
-                if call_count[0] <= 2:
-                    return bid_query
-                return lowest_bid_query
-            return MagicMock()
+            return min_bid_query
         
         mock_db.query.side_effect = query_side_effect
         
@@ -184,6 +178,89 @@ class TestCreateBidStandalone:
         finally:
             app.dependency_overrides.clear()
 
+    def test_deadline_duplicate_and_throttle_checks(self, db_session):
+        """Closed bidding, a repeat bid and a recent bid are rejected"""
+        customer = Account(ID=301, email="c301@test.com", password="x", type="customer", balance=0, warnings=0)
+        courier = Account(ID=302, email="d302@test.com", password="x", type="delivery", balance=0, warnings=0)
+        db_session.add_all([customer, courier])
+        db_session.flush()
+        closed = Order(
+            accountID=301, finalCost=1000, status="paid",
+            bidding_closes_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+        )
+        first = Order(accountID=301, finalCost=1000, status="paid")
+        second = Order(accountID=301, finalCost=1000, status="paid")
+        db_session.add_all([closed, first, second])
+        db_session.commit()
+
+        app.dependency_overrides[get_current_user] = lambda: courier
+        app.dependency_overrides[get_db] = lambda: db_session
+        try:
+            def bid(order_id):
+                return client.post("/bids", json={"order_id": order_id, "price_cents": 300})
+
+            response = bid(closed.id)
+            assert response.status_code == 400
+            assert "closed" in response.json()["detail"].lower()
+
+            response = bid(first.id)
+            assert response.status_code == 201
+            assert response.json()["is_lowest"] is True
+            db_session.refresh(first)
+            assert first.bidding_closes_at is not None
+            assert db_session.query(Bid).filter(Bid.orderID == first.id).one().created_at is not None
+
+            # Order checks come before the throttle
+            assert bid(99999).status_code == 404
+            assert bid(closed.id).status_code == 400
+
+            for throttle_state in ("this worker's throttle", "the bid table"):
+                response = bid(first.id)
+                assert response.status_code == 400, throttle_state
+                assert "already submitted" in response.json()["detail"].lower()
+                assert bid(second.id).status_code == 429, throttle_state
+                # Without the in-process record (another worker, a restart)
+                # the bid table still decides
+                bid_throttle.clear()
+
+            # A repeat bid that gets past the checks is refused by the unique index
+            from sqlalchemy.exc import IntegrityError
+            with pytest.raises(IntegrityError):
+                with db_session.begin_nested():
+                    db_session.add(Bid(deliveryPersonID=302, orderID=first.id, bidAmount=250))
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_duplicate_bid_rejected_on_insert(self):
+        """A repeat bid on the same order fails on the unique index"""
+        from sqlalchemy.exc import IntegrityError
+
+        mock_user = create_mock_user(ID=2, email="delivery@test.com", user_type="delivery")
+        mock_user.is_fired = False
+        mock_user.employment_status = "active"
+        mock_db = create_mock_db()
+        mock_order = create_mock_order(id=1, status="paid")
+
+        order_query = MagicMock()
+        order_query.filter.return_value.first.return_value = (mock_order, True)
+
+        mock_db.execute.return_value.scalar.return_value = None
+
+        mock_db.query.side_effect = lambda model, *columns: order_query if model is Order else MagicMock()
+        mock_db.commit.side_effect = IntegrityError("INSERT INTO bid", {}, Exception("duplicate key"))
+
+        app.dependency_overrides[get_current_user] = lambda: mock_user
+        app.dependency_overrides[get_db] = lambda: mock_db
+
+        try:
+            response = client.post("/bids", json={"order_id": 1, "price_cents": 300})
+
+            assert response.status_code == 400
+            assert "already submitted" in response.json()["detail"].lower()
+            mock_db.rollback.assert_called_once()
+        finally:
+            app.dependency_overrides.clear()
+
     def test_create_bid_missing_order_id(self):
         """Test bid creation fails without order_id"""
         mock_user = create_mock_user(ID=2, user_type="delivery")
@@ -605,47 +682,16 @@ class TestDeliveryScoreboard:
         mock_manager = create_mock_user(ID=99, user_type="manager")
         mock_db = create_mock_db()
         
-        # Create delivery accounts
-        delivery1 = create_mock_user(ID=2, email="d1@test.com", user_type="delivery", warnings=0)
-        delivery2 = create_mock_user(ID=3, email="d2@test.com", user_type="delivery", warnings=1)
-        
-        rating1 = create_mock_delivery_rating(
-            accountID=2, averageRating=4.8, reviews=50,
-            total_deliveries=100, on_time_deliveries=95, avg_delivery_minutes=20
-        )
-        rating2 = create_mock_delivery_rating(
-            accountID=3, averageRating=4.2, reviews=30,
-            total_deliveries=60, on_time_deliveries=50, avg_delivery_minutes=28
-        )
-        
-        accounts_query = MagicMock()
-        accounts_query.filter.return_value.all.return_value = [delivery1, delivery2]
-        
-        # Return different ratings based on accountID
-        def rating_filter_side_effect(condition):
-            result = MagicMock()
-            # Check which account is being queried
-            if hasattr(condition, 'right') and condition.right.value == 2:
-                result.first.return_value = rating1
-            elif hasattr(condition, 'right') and condition.right.value == 3:
-                result.first.return_value = rating2
-            else:
-                result.first.return_value = rating1  # Default
-            return result
-        
-        rating_query = MagicMock()
-        rating_query.filter.side_effect = rating_filter_side_effect
-        
-        call_count = [0]
-        def query_side_effect(model):
-            call_count[0] += 1
-            if model == Account:
-                return accounts_query
-            elif model == DeliveryRating:
-                return rating_query
-            return MagicMock()
-        
-        mock_db.query.side_effect = query_side_effect
+        # Rows come back already computed, sorted and limited by the query
+        rows = [
+            dict(account_id=2, email="d1@test.com", average_rating=4.8, reviews=50,
+                 total_deliveries=100, on_time_deliveries=95, on_time_percentage=95.0,
+                 avg_delivery_minutes=20, warnings=0),
+            dict(account_id=3, email="d2@test.com", average_rating=4.2, reviews=30,
+                 total_deliveries=60, on_time_deliveries=50, on_time_percentage=83.3,
+                 avg_delivery_minutes=28, warnings=1),
+        ]
+        mock_db.execute.return_value = [MagicMock(_mapping=row) for row in rows]
         
         app.dependency_overrides[require_manager] = lambda: mock_manager
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -656,7 +702,55 @@ class TestDeliveryScoreboard:
             assert response.status_code == 200
             data = response.json()
             
-            assert len(data) >= 1  # At least one delivery person
+            assert [d["account_id"] for d in data] == [2, 3]  # In the query's order
+            assert data[0]["on_time_percentage"] == 95.0
+            mock_db.execute.assert_called_once()
+            statement = mock_db.execute.call_args[0][0]
+            assert statement._limit == 20
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_scoreboard_sorts_and_limits_in_sql(self, db_session, manager_user):
+        """Each sort_by orders the rows in the query; unrated people rank last"""
+        from app.models import DeliveryRating as Rating
+
+        stats = {
+            # ID: (avg_rating_x100, reviews, total_deliveries, on_time_deliveries)
+            201: (480, 50, 10, 5),
+            202: (420, 30, 100, 99),
+            203: (450, 10, 40, 40),
+        }
+        for account_id in (201, 202, 203, 204):
+            db_session.add(Account(
+                ID=account_id, email=f"d{account_id}@test.com", password="x",
+                type="delivery", balance=0, warnings=0
+            ))
+        db_session.flush()
+        for account_id, (x100, reviews, total, on_time) in stats.items():
+            db_session.add(Rating(
+                accountID=account_id, avg_rating_x100=x100, reviews=reviews,
+                total_deliveries=total, on_time_deliveries=on_time
+            ))
+        db_session.commit()
+
+        app.dependency_overrides[require_manager] = lambda: manager_user
+        app.dependency_overrides[get_db] = lambda: db_session
+        try:
+            def ids(**params):
+                response = client.get("/bids/scoreboard", params=params)
+                assert response.status_code == 200
+                return [d["account_id"] for d in response.json()]
+
+            assert ids(sort_by="rating") == [201, 203, 202, 204]
+            assert ids(sort_by="on_time") == [203, 202, 201, 204]
+            assert ids(sort_by="deliveries") == [202, 203, 201, 204]
+            assert ids(sort_by="rating", limit=2) == [201, 203]
+
+            stats_by_id = {d["account_id"]: d for d in client.get("/bids/scoreboard").json()}
+            assert stats_by_id[202]["average_rating"] == 4.2
+            assert stats_by_id[202]["on_time_percentage"] == 99.0
+            assert stats_by_id[204]["average_rating"] == 0.0
+            assert stats_by_id[204]["avg_delivery_minutes"] == 30
         finally:
             app.dependency_overrides.clear()
 
@@ -281,27 +281,13 @@ class TestChatQuery:
         # Setup query chain
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
         
-        # Setup execute for full-text search
-        mock_result = MagicMock()
-        mock_result.__iter__ = lambda self: iter([
-            (mock_kb.id, mock_kb.question, mock_kb.answer, mock_kb.keywords,
-             mock_kb.confidence, mock_kb.author_id, mock_kb.is_active,
-             mock_kb.created_at, 0.8)
-        ])
-        mock_result.fetchone.return_value = (
-            mock_kb.id, mock_kb.question, mock_kb.answer, mock_kb.keywords,
-            mock_kb.confidence, mock_kb.author_id, mock_kb.is_active,
-            mock_kb.created_at, 0.8
-        )
-        mock_db.execute.return_value = mock_result
-        
-        # Second query call for KB entry
-        def query_side_effect(model):
+        # Full-text search maps the matching row onto the entry with its rank
+        def query_side_effect(model, *columns):
             mock_query = MagicMock()
             if model.__name__ == 'Account':
                 mock_query.filter.return_value.first.return_value = mock_user
             elif model.__name__ == 'KnowledgeBase':
-                mock_query.filter.return_value.first.return_value = mock_kb
+                mock_query.from_statement.return_value.params.return_value.first.return_value = (mock_kb, 0.8)
             elif model.__name__ == 'ChatLog':
                 mock_query.filter.return_value.first.return_value = mock_chat
             return mock_query
@@ -330,16 +316,16 @@ class TestChatQuery:
         mock_db = create_mock_db()
         
         # Setup user query to succeed
-        def query_side_effect(model):
+        def query_side_effect(model, *columns):
             mock_query = MagicMock()
             if model.__name__ == 'Account':
                 mock_query.filter.return_value.first.return_value = mock_user
             else:
                 mock_query.filter.return_value.first.return_value = None
+                mock_query.from_statement.return_value.params.return_value.first.return_value = None  # No KB match
             return mock_query
         
         mock_db.query.side_effect = query_side_effect
-        mock_db.execute.return_value.fetchone.return_value = None  # No KB match
         
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -368,6 +354,25 @@ class TestChatQuery:
                 app.dependency_overrides.clear()
 
 
+class TestBulkChatLog:
+    """Test the bulk chat log insert helper"""
+
+    def test_bulk_log_chat(self, db_session, customer_user):
+        """Rows are inserted in one call and ids returned in order"""
+        from app.routers.chat import bulk_log_chat
+        from app.models import ChatLog
+        
+        rows = [
+            {"user_id": customer_user.ID, "question": f"q{i}", "answer": f"a{i}", "source": "llm"}
+            for i in range(3)
+        ]
+        
+        ids = bulk_log_chat(db_session, rows)
+        
+        assert [db_session.get(ChatLog, i).question for i in ids] == ["q0", "q1", "q2"]
+        assert db_session.get(ChatLog, ids[0]).created_at is not None
+
+
 # ============================================================
 # Rating Tests
 # ============================================================
@@ -732,7 +737,7 @@ class TestChatFlow:
         mock_db = create_mock_db()
         
         # For query
-        def query_side_effect(model):
+        def query_side_effect(model, *columns):
             mock_query = MagicMock()
             if model.__name__ == 'Account':
                 mock_query.filter.return_value.first.return_value = mock_user
@@ -740,10 +745,10 @@ class TestChatFlow:
                 mock_query.filter.return_value.first.return_value = mock_chat
             else:
                 mock_query.filter.return_value.first.return_value = None
+                mock_query.from_statement.return_value.params.return_value.first.return_value = None  # No KB match
             return mock_query
         
         mock_db.query.side_effect = query_side_effect
-        mock_db.execute.return_value.fetchone.return_value = None
         
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -1083,22 +1088,14 @@ class TestKBSearchAndLLMFallback:
         )
         mock_db = create_mock_db()
         
-        # Setup full-text search result
-        mock_result = MagicMock()
-        mock_result.fetchone.return_value = (
-            mock_kb.id, mock_kb.question, mock_kb.answer, mock_kb.keywords,
-            mock_kb.confidence, mock_kb.author_id, mock_kb.is_active,
-            mock_kb.created_at, 0.9  # High match score
-        )
-        mock_db.execute.return_value = mock_result
-        
-        def query_side_effect(model):
+        def query_side_effect(model, *columns):
             mock_query = MagicMock()
             model_name = model.__name__ if hasattr(model, '__name__') else str(model)
             if 'Account' in model_name:
                 mock_query.filter.return_value.first.return_value = mock_user
             elif 'KnowledgeBase' in model_name:
-                mock_query.filter.return_value.first.return_value = mock_kb
+                # Full-text search result with a high match score
+                mock_query.from_statement.return_value.params.return_value.first.return_value = (mock_kb, 0.9)
             return mock_query
         
         mock_db.query.side_effect = query_side_effect
@@ -1123,16 +1120,14 @@ class TestKBSearchAndLLMFallback:
         mock_user = create_mock_user()
         mock_db = create_mock_db()
         
-        # No KB match
-        mock_db.execute.return_value.fetchone.return_value = None
-        
-        def query_side_effect(model):
+        def query_side_effect(model, *columns):
             mock_query = MagicMock()
             model_name = model.__name__ if hasattr(model, '__name__') else str(model)
             if 'Account' in model_name:
                 mock_query.filter.return_value.first.return_value = mock_user
             else:
                 mock_query.filter.return_value.first.return_value = None
+                mock_query.from_statement.return_value.params.return_value.first.return_value = None  # No KB match
             return mock_query
         
         mock_db.query.side_effect = query_side_effect
@@ -1169,21 +1164,20 @@ class TestKBSearchAndLLMFallback:
         mock_user = create_mock_user()
         mock_db = create_mock_db()
         
-        mock_db.execute.return_value.fetchone.return_value = None
-        
         added_objects = []
         def track_add(obj):
             added_objects.append(obj)
         
         mock_db.add = track_add
         
-        def query_side_effect(model):
+        def query_side_effect(model, *columns):
             mock_query = MagicMock()
             model_name = model.__name__ if hasattr(model, '__name__') else str(model)
             if 'Account' in model_name:
                 mock_query.filter.return_value.first.return_value = mock_user
             else:
                 mock_query.filter.return_value.first.return_value = None
+                mock_query.from_statement.return_value.params.return_value.first.return_value = None  # No KB match
             return mock_query
         
         mock_db.query.side_effect = query_side_effect
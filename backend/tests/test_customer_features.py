@@ -675,6 +675,38 @@ class TestTransactions:
         finally:
             app.dependency_overrides.pop(get_current_user, None)
 
+    def test_transaction_history_total_with_pages(self, client, customer_user, db_session):
+        """total counts every matching transaction, on a partial page and past the end"""
+        for i, transaction_type in enumerate(["deposit", "deposit", "deposit", "withdrawal"]):
+            db_session.add(Transaction(
+                accountID=customer_user.ID,
+                amount_cents=100,
+                balance_before=i * 100,
+                balance_after=(i + 1) * 100,
+                transaction_type=transaction_type,
+                created_at=f"2025-12-0{i + 1}T00:00:00+00:00"
+            ))
+        db_session.commit()
+        
+        app.dependency_overrides[get_current_user] = lambda: customer_user
+        try:
+            page = client.get("/account/transactions?limit=2&transaction_type=deposit").json()
+            assert page["total"] == 3
+            assert [t["balance_after"] for t in page["transactions"]] == [300, 200]
+            
+            past_end = client.get("/account/transactions?offset=10&transaction_type=deposit").json()
+            assert past_end == {"transactions": [], "total": 3, "next_before_id": None}
+            
+            # Keyset: the cursor continues where the first page stopped
+            cursor = page["next_before_id"]
+            assert cursor == page["transactions"][-1]["id"]
+            rest = client.get(f"/account/transactions?limit=2&transaction_type=deposit&before_id={cursor}").json()
+            assert [t["balance_after"] for t in rest["transactions"]] == [100]
+            assert rest["total"] == 3
+            assert rest["next_before_id"] is None
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+
 
 # ============================================================
 # Order History Tests
@@ -742,6 +774,151 @@ class TestBalanceAndDeposit:
         
         assert customer_user.balance == initial_balance - order_amount
 
+    def test_concurrent_balance_write_is_detected(self, db_session, customer_user):
+        """A balance write based on a stale read fails instead of overwriting"""
+        from sqlalchemy import update
+        from sqlalchemy.orm.exc import StaleDataError
+
+        version = customer_user.version_id
+        # Another transaction changes the row after it was loaded here
+        db_session.execute(
+            update(Account.__table__)
+            .where(Account.__table__.c.ID == customer_user.ID)
+            .values(balance=0, version_id=version + 1)
+        )
+
+        customer_user.balance += 10000
+        with pytest.raises(StaleDataError):
+            db_session.flush()
+
+    def test_balance_change_keeps_concurrent_update(self, db_session, customer_user):
+        """apply_balance_change adds to the stored balance, not the one read earlier"""
+        from sqlalchemy import update
+        from app.models import Transaction
+        from app.routers.account import apply_balance_change
+
+        # Another request deposits after this one loaded the account
+        db_session.execute(
+            update(Account.__table__)
+            .where(Account.__table__.c.ID == customer_user.ID)
+            .values(balance=Account.__table__.c.balance + 5000)
+        )
+        stored = customer_user.balance + 5000
+        version = customer_user.version_id
+
+        apply_balance_change(db_session, customer_user, -2000, "withdrawal", "Withdrawal of $20.00")
+
+        assert customer_user.balance == stored - 2000
+        assert customer_user.version_id == version + 1
+        assert customer_user not in db_session.dirty
+        transaction = db_session.query(Transaction).filter(
+            Transaction.accountID == customer_user.ID
+        ).order_by(Transaction.id.desc()).first()
+        assert (transaction.balance_before, transaction.balance_after) == (stored, stored - 2000)
+
+    def test_balance_change_is_one_statement_on_postgres(self):
+        """On PostgreSQL the balance UPDATE feeds the transaction INSERT through a CTE"""
+        from sqlalchemy.dialects import postgresql
+        from app.routers.account import apply_balance_change
+
+        account = Account(ID=7, email="pg@test.com", type="customer", balance=5000, version_id=1)
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.execute.return_value.first.return_value = (6000,)
+
+        apply_balance_change(db, account, 1000, "deposit", "Deposit of $10.00")
+
+        assert db.execute.call_count == 1
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH changed_balance AS \n(UPDATE accounts")
+        assert "INSERT INTO transactions" in sql
+        db.add.assert_not_called()
+        assert account.balance == 6000
+        db.commit.assert_called_once()
+
+    def test_withdrawal_over_balance_changes_nothing(self, db_session, customer_user):
+        """A withdrawal the stored balance cannot cover is rejected without a write"""
+        from fastapi import HTTPException
+        from app.routers.account import apply_balance_change
+
+        balance = customer_user.balance
+        version = customer_user.version_id
+
+        with pytest.raises(HTTPException) as exc_info:
+            apply_balance_change(db_session, customer_user, -(balance + 1), "withdrawal", "Withdrawal")
+
+        assert exc_info.value.status_code == 400
+        db_session.expire(customer_user)
+        assert (customer_user.balance, customer_user.version_id) == (balance, version)
+
+    def test_balance_served_from_profile_cache_until_deposit(self, client, db_session, customer_user, capture_statements):
+        """/account/balance skips the account SELECT while cached; a deposit invalidates it"""
+        from app.auth import create_access_token
+        
+        token = create_access_token(data={"sub": customer_user.email, "user_id": customer_user.ID})
+        headers = {"Authorization": f"Bearer {token}"}
+        initial = customer_user.balance
+        
+        def account_selects():
+            return [s for s in statements.kind("SELECT") if "FROM accounts" in s]
+        
+        with capture_statements() as statements:
+            assert client.get("/account/balance", headers=headers).json()["balance_cents"] == initial
+            assert len(account_selects()) == 1
+            assert client.get("/account/balance", headers=headers).json()["balance_cents"] == initial
+            assert len(account_selects()) == 1
+            
+            response = client.post("/account/deposit", json={"amount_cents": 2500}, headers=headers)
+            assert response.status_code == 200
+            
+            assert client.get("/account/balance", headers=headers).json()["balance_cents"] == initial + 2500
+
+    def test_profile_cache_miss_selects_profile_columns_only(self, client, db_session, customer_user, capture_statements):
+        """A profile cache miss reads the profile columns, not the whole account row"""
+        from app.auth import create_access_token
+
+        token = create_access_token(data={"sub": customer_user.email, "user_id": customer_user.ID})
+
+        with capture_statements() as statements:
+            response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+        account_selects = [s for s in statements.kind("SELECT") if "FROM accounts" in s]
+        assert response.status_code == 200
+        assert response.json()["user"]["email"] == customer_user.email
+        assert len(account_selects) == 1
+        assert "password" not in account_selects[0]
+
+    def test_deregister_request_writes_notification_and_audit_only(self, client, db_session, customer_user, capture_statements):
+        """A deregistration request only INSERTs its notification and audit rows"""
+        from app.auth import create_access_token
+        from app.models import AuditLog, ManagerNotification
+
+        token = create_access_token(data={"sub": customer_user.email, "user_id": customer_user.ID})
+
+        with capture_statements() as statements:
+            response = client.post("/account/deregister", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        # The account lookup for the token, then the two buffered INSERTs
+        assert len(statements.kind("INSERT")) == 2
+        assert len(statements.kind("SELECT")) == 1
+        assert db_session.query(AuditLog).filter(
+            AuditLog.action_type == "deregister_request", AuditLog.target_id == customer_user.ID
+        ).count() == 1
+        assert db_session.query(ManagerNotification).filter(
+            ManagerNotification.related_account_id == customer_user.ID
+        ).count() == 1
+
+    def test_format_cents_to_dollars(self):
+        """Balances format with thousands separators and exact cents"""
+        from app.routers.account import format_cents_to_dollars
+        
+        assert format_cents_to_dollars(0) == "$0.00"
+        assert format_cents_to_dollars(5) == "$0.05"
+        assert format_cents_to_dollars(1050) == "$10.50"
+        assert format_cents_to_dollars(100000000) == "$1,000,000.00"
+        assert format_cents_to_dollars(-150) == "$-1.50"
+
     def test_insufficient_balance_check(self, db_session, customer_user):
         """Test that insufficient balance is detected"""
         customer_user.balance = 1000
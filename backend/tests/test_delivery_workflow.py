@@ -12,6 +12,7 @@ Covers:
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
@@ -202,30 +203,19 @@ class TestPlaceBid:
         mock_order = create_mock_order(status="paid")
         
         order_query = MagicMock()
-        order_query.filter.return_value.first.return_value = mock_order
+        order_query.filter.return_value.first.return_value = (mock_order, True)
         
-        existing_bid_query = MagicMock()
-        existing_bid_query.filter.return_value.first.return_value = None
+        # No bid inside the throttle window
+        mock_db.execute.return_value.scalar.return_value = None
         
-        last_bid_query = MagicMock()
-        last_bid_query.filter.return_value.order_by.return_value.first.return_value = None
+        # No other bid on the order for the lowest-bid MIN()
+        min_bid_query = MagicMock()
+        min_bid_query.filter.return_value.scalar.return_value = None
         
-        lowest_bid_query = MagicMock()
-        lowest_bid_query.filter.return_value.order_by.return_value.first.return_value = None
-        
-        call_count = [0]
-        def query_side_effect(model):
-            call_count[0] += 1
+        def query_side_effect(model, *columns):
             if model is Order:
                 return order_query
-            elif model is Bid:
-                if call_count[0] == 2:  # Existing bid check
-                    return existing_bid_query
-                elif call_count[0] == 3:  # Last bid check (throttle)
-                    return last_bid_query
-                else:  # Lowest bid check
-                    return lowest_bid_query
-            return MagicMock()
+            return min_bid_query
         
         mock_db.query.side_effect = query_side_effect
         
@@ -250,6 +240,7 @@ class TestPlaceBid:
             data = response.json()
             assert data["bidAmount"] == 450
             assert data["estimated_minutes"] == 25
+            assert data["is_lowest"] is True
         finally:
             app.dependency_overrides.clear()
 
@@ -259,33 +250,19 @@ class TestPlaceBid:
         mock_db = create_mock_db()
         mock_order = create_mock_order(status="paid")
         
-        # Create a recent bid (5 seconds ago)
-        recent_bid = create_mock_bid(
-            created_at=(datetime.now(timezone.utc) - timedelta(seconds=5)).isoformat()
-        )
+        # The user's latest bid was placed 5 seconds ago
+        recent_bid_at = (datetime.now(timezone.utc) - timedelta(seconds=5)).isoformat()
         
         order_query = MagicMock()
-        order_query.filter.return_value.first.return_value = mock_order
+        order_query.filter.return_value.first.return_value = (mock_order, True)
+        
+        mock_db.execute.return_value.scalar.return_value = recent_bid_at
         
+        # No earlier bid on this order, so the throttle applies
         existing_bid_query = MagicMock()
         existing_bid_query.filter.return_value.first.return_value = None
         
-        last_bid_query = MagicMock()
-        last_bid_query.filter.return_value.order_by.return_value.first.return_value = recent_bid
-        
-        call_count = [0]
-        def query_side_effect(model):
-            call_count[0] += 1
-            if model is Order:
-                return order_query
-            elif model is Bid:
-                if call_count[0] == 2:
-                    return existing_bid_query
-                else:
-                    return last_bid_query
-            return MagicMock()
-        
-        mock_db.query.side_effect = query_side_effect
+        mock_db.query.side_effect = lambda model, *columns: order_query if model is Order else existing_bid_query
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -313,9 +290,9 @@ class TestPlaceBid:
         )
         
         order_query = MagicMock()
-        order_query.filter.return_value.first.return_value = mock_order
+        order_query.filter.return_value.first.return_value = (mock_order, False)  # bidding_open evaluated in SQL
         
-        mock_db.query.side_effect = lambda model: order_query if model is Order else MagicMock()
+        mock_db.query.side_effect = lambda model, *columns: order_query if model is Order else MagicMock()
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -336,24 +313,15 @@ class TestPlaceBid:
         mock_user = create_mock_delivery_user()
         mock_db = create_mock_db()
         mock_order = create_mock_order(status="paid")
-        existing_bid = create_mock_bid(deliveryPersonID=mock_user.ID)
         
         order_query = MagicMock()
-        order_query.filter.return_value.first.return_value = mock_order
-        
-        existing_bid_query = MagicMock()
-        existing_bid_query.filter.return_value.first.return_value = existing_bid
+        order_query.filter.return_value.first.return_value = (mock_order, True)
         
-        call_count = [0]
-        def query_side_effect(model):
-            call_count[0] += 1
-            if model is Order:
-                return order_query
-            elif model is Bid:
-                return existing_bid_query
-            return MagicMock()
+        # The user already bid on this order: the insert hits the unique index
+        mock_db.execute.return_value.scalar.return_value = None
+        mock_db.commit.side_effect = IntegrityError("INSERT INTO bid", {}, Exception("duplicate key"))
         
-        mock_db.query.side_effect = query_side_effect
+        mock_db.query.side_effect = lambda model, *columns: order_query if model is Order else MagicMock()
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -376,9 +344,9 @@ class TestPlaceBid:
         mock_order = create_mock_order(status="assigned")  # Already assigned
         
         order_query = MagicMock()
-        order_query.filter.return_value.first.return_value = mock_order
+        order_query.filter.return_value.first.return_value = (mock_order, True)
         
-        mock_db.query.side_effect = lambda model: order_query if model is Order else MagicMock()
+        mock_db.query.side_effect = lambda model, *columns: order_query if model is Order else MagicMock()
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -212,6 +212,30 @@ class TestEmployeeCreation:
         assert mock_delivery.restaurantID is None
         assert mock_delivery.type == "delivery"
 
+    def test_taken_email_conflicts_on_insert(self):
+        """A taken employee email is reported from the unique constraint, without a pre-check query"""
+        from sqlalchemy.exc import IntegrityError
+        from app.auth import require_manager
+
+        mock_db = MagicMock()
+        mock_db.flush.side_effect = IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+        app.dependency_overrides[require_manager] = lambda: create_mock_manager()
+        app.dependency_overrides[get_db] = lambda: mock_db
+
+        try:
+            response = client.post("/manager/employees", json={
+                "email": "taken@example.com",
+                "password": "SecureP@ss123",
+                "role": "chef"
+            })
+
+            assert response.status_code == 409
+            assert response.json()["detail"] == "Email already registered"
+            mock_db.query.assert_not_called()
+            mock_db.rollback.assert_called_once()
+        finally:
+            app.dependency_overrides.clear()
+
 
 class TestEmployeeHRActions:
     """Tests for HR action API endpoints"""
@@ -255,6 +279,31 @@ class TestEmployeeHRActions:
         
         assert mock_chef.is_fired is True
 
+    def test_evaluate_all_logs_bonus_transactions(self, client, db_session, manager_user, chef_user, customer_user):
+        """Automatic bonuses credited by evaluate-all get ledger entries"""
+        from app.models import Transaction
+
+        chef_user.wage = 2000
+        for _ in range(3):
+            db_session.add(Complaint(
+                accountID=chef_user.ID, type="compliment",
+                description="Great food", filer=customer_user.ID
+            ))
+        db_session.commit()
+
+        token = create_access_token(data={"sub": manager_user.email, "user_id": manager_user.ID})
+        response = client.post(
+            "/manager/employees/evaluate-all",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+
+        entry = db_session.query(Transaction).filter(Transaction.accountID == chef_user.ID).one()
+        assert entry.transaction_type == "bonus"
+        assert (entry.balance_before, entry.amount_cents, entry.balance_after) == (0, 200, 200)
+        db_session.refresh(chef_user)
+        assert chef_user.balance == 200
+
 
 # ============================================================
 # Dispute Resolution Tests
@@ -12,6 +12,7 @@ Covers:
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
 from unittest.mock import patch, MagicMock, PropertyMock
 from datetime import datetime, timezone
 
@@ -165,15 +166,6 @@ class TestOrderCreation:
         mock_db.add.side_effect = capture_add
         mock_db.flush.side_effect = lambda: None
         
-        def mock_refresh(obj):
-            if hasattr(obj, 'ordered_dishes'):
-                # Mock ordered dishes with proper structure
-                mock_od = MagicMock()
-                mock_od.DishID = 1
-                mock_od.quantity = 2
-                obj.ordered_dishes = [mock_od]
-        mock_db.refresh.side_effect = mock_refresh
-        
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -193,6 +185,8 @@ class TestOrderCreation:
             assert data["order"]["status"] == "paid"
             # Balance should be deducted
             assert data["new_balance"] == 10000 - 2500
+            # Committed objects stay loaded; nothing is re-read
+            mock_db.refresh.assert_not_called()
         finally:
             app.dependency_overrides.clear()
 
@@ -513,10 +507,11 @@ class TestDeliveryBidding:
         mock_db = create_mock_db()
         mock_order = create_mock_order(id=1, status="paid")
         
-        mock_db.query.return_value.filter.return_value.first.side_effect = [
-            mock_order,  # First call: get order
-            None  # Second call: check existing bid (none)
-        ]
+        mock_db.query.return_value.filter.return_value.first.return_value = (mock_order, True)
+        # No bid inside the throttle window
+        mock_db.execute.return_value.scalar.return_value = None
+        # Minimum of the other bids on the order
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 400
         
         created_bid = None
         def capture_add(obj):
@@ -539,6 +534,7 @@ class TestDeliveryBidding:
             assert data["bidAmount"] == 300
             assert data["deliveryPersonID"] == 2
             assert data["orderID"] == 1
+            assert data["is_lowest"] is True
         finally:
             app.dependency_overrides.clear()
 
@@ -565,7 +561,7 @@ class TestDeliveryBidding:
         mock_db = create_mock_db()
         mock_order = create_mock_order(id=1, status="assigned")  # Already assigned
         
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_order
+        mock_db.query.return_value.filter.return_value.first.return_value = (mock_order, True)
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -585,12 +581,11 @@ class TestDeliveryBidding:
         mock_user = create_mock_user(ID=2, user_type="delivery")
         mock_db = create_mock_db()
         mock_order = create_mock_order(id=1, status="paid")
-        existing_bid = create_mock_bid(id=1, deliveryPersonID=2, orderID=1)
         
-        mock_db.query.return_value.filter.return_value.first.side_effect = [
-            mock_order,  # First call: get order
-            existing_bid  # Second call: existing bid found
-        ]
+        mock_db.query.return_value.filter.return_value.first.return_value = (mock_order, True)
+        # This user already bid on this order: the insert hits the unique index
+        mock_db.execute.return_value.scalar.return_value = None
+        mock_db.commit.side_effect = IntegrityError("INSERT INTO bid", {}, Exception("duplicate key"))
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
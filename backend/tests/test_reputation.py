@@ -161,6 +161,7 @@ class TestComplaintFiling:
             return mock_query
         
         mock_db.query = MagicMock(side_effect=query_side_effect)
+        mock_db.get.return_value = mock_target
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -194,6 +195,7 @@ class TestComplaintFiling:
             return mock_query
         
         mock_db.query = MagicMock(side_effect=query_side_effect)
+        mock_db.get.return_value = mock_target
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -241,6 +243,7 @@ class TestComplaintFiling:
         
         # Target user not found
         mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.get.return_value = None
         
         app.dependency_overrides[get_current_user] = lambda: mock_user
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -307,6 +310,7 @@ class TestComplaintListing:
             return mock_q
         
         mock_db.query = MagicMock(side_effect=query_side_effect)
+        mock_db.get.return_value = mock_manager
         
         app.dependency_overrides[require_manager] = lambda: mock_manager
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -566,10 +570,8 @@ class TestLoginWarningDisplay:
         mock_user = create_mock_user(ID=1, warnings=2, type="customer")
         mock_db = create_mock_db()
         
-        mock_db.query.return_value.filter.return_value.first.side_effect = [
-            None,  # Blacklist check
-            mock_user  # User lookup
-        ]
+        # User lookup with blacklist flag
+        mock_db.execute.return_value.first.return_value = (mock_user, False)
         
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -592,11 +594,8 @@ class TestLoginWarningDisplay:
         """Test that blacklisted user cannot log in"""
         mock_db = create_mock_db()
         
-        mock_blacklist = MagicMock()
-        mock_blacklist.email = "banned@example.com"
-        
-        # First query returns blacklist entry
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_blacklist
+        # No account left for the email, but the blacklist entry is flagged
+        mock_db.execute.return_value.first.return_value = (None, True)
         
         app.dependency_overrides[get_db] = lambda: mock_db
         
@@ -718,11 +717,8 @@ class TestManagerNotifications:
         mock_manager = create_mock_manager()
         mock_db = create_mock_db()
         
-        mock_notification = MagicMock()
-        mock_notification.id = 1
-        mock_notification.is_read = False
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_notification
+        # UPDATE ... RETURNING id
+        mock_db.execute.return_value.scalar_one_or_none.return_value = 1
         
         app.dependency_overrides[require_manager] = lambda: mock_manager
         app.dependency_overrides[get_db] = lambda: mock_db
@@ -731,7 +727,26 @@ class TestManagerNotifications:
             response = client.patch("/complaints/notifications/1/read")
             
             assert response.status_code == 200
-            assert mock_notification.is_read == True
+            assert mock_db.execute.called
+            assert mock_db.commit.called
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_mark_missing_notification_read(self):
+        """Test marking an unknown notification returns 404"""
+        mock_manager = create_mock_manager()
+        mock_db = create_mock_db()
+        
+        mock_db.execute.return_value.scalar_one_or_none.return_value = None
+        
+        app.dependency_overrides[require_manager] = lambda: mock_manager
+        app.dependency_overrides[get_db] = lambda: mock_db
+        
+        try:
+            response = client.patch("/complaints/notifications/999/read")
+            
+            assert response.status_code == 404
+            assert not mock_db.commit.called
         finally:
             app.dependency_overrides.clear()
 
@@ -764,9 +779,13 @@ class TestChefEvaluation:
             create_mock_user(ID=10, type="chef", email="chef1@example.com"),
             create_mock_user(ID=11, type="chef", email="chef2@example.com")
         ]
+        for chef in mock_chefs:
+            chef.rolling_avg_x100 = 300
+            chef.complaint_count = 0
+            chef.compliment_count = 0
         
-        # Mock chef query
-        mock_db.query.return_value.filter.return_value.all.return_value = mock_chefs
+        # Mock chef query (streamed in chunks)
+        mock_db.execute.return_value.scalars.return_value.partitions.return_value = [mock_chefs]
         mock_db.query.return_value.filter.return_value.count.return_value = 0
         mock_db.query.return_value.filter.return_value.scalar.return_value = 4.0
         
@@ -13,6 +13,7 @@ Business Rules Tested:
 8. Dismissed complaint adds warning to filer
 """
 
+import builtins
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone
@@ -54,6 +55,13 @@ def create_mock_account(
     mock.times_demoted = times_demoted
     mock.complaint_count = complaint_count
     mock.compliment_count = compliment_count
+    # Mirror the scaled_rating hybrid: rolling_avg_rating reads/writes rolling_avg_x100
+    builtins.type(mock).rolling_avg_rating = property(
+        lambda self: None if self.rolling_avg_x100 is None else self.rolling_avg_x100 / 100,
+        lambda self, value: setattr(
+            self, "rolling_avg_x100", None if value is None else int(round(Decimal(str(value)) * 100))
+        )
+    )
     mock.rolling_avg_rating = rolling_avg_rating
     mock.total_rating_count = total_rating_count
     mock.employment_status = employment_status
@@ -126,6 +134,326 @@ class TestRatingUpdates:
         assert chef.total_rating_count == 3
 
 
+class TestChefRatingRecalculation:
+    """Test chef rating recalculation from dish aggregates"""
+
+    def test_bulk_recalculation(self, db_session, restaurant):
+        """All chefs are recalculated in one pass, loaded instances stay in sync"""
+        from app.models import Dish
+        
+        chefs = [
+            Account(
+                ID=300 + i, email=f"bulkchef{i}@test.com", password="hash", type="chef",
+                restaurantID=restaurant.id, balance=0, warnings=0, total_spent_cents=0,
+                unresolved_complaints_count=0, is_vip=False,
+                rolling_avg_rating=Decimal("1.00"), total_rating_count=9
+            )
+            for i in range(3)
+        ]
+        db_session.add_all(chefs)
+        db_session.flush()
+        db_session.add_all([
+            Dish(id=300, restaurantID=restaurant.id, name="A", cost=100, chefID=300, average_rating=4, reviews=2),
+            Dish(id=301, restaurantID=restaurant.id, name="B", cost=100, chefID=300, average_rating=3, reviews=1),
+            Dish(id=302, restaurantID=restaurant.id, name="C", cost=100, chefID=301, average_rating=5, reviews=4),
+            Dish(id=303, restaurantID=restaurant.id, name="D", cost=100, chefID=302, average_rating=2, reviews=0),
+        ])
+        db_session.flush()
+        
+        results = rep_engine.recalculate_chef_ratings_bulk(db_session, [300, 301, 302])
+        
+        # Chef 300: (4*2 + 3*1) / 3 reviews
+        assert round(results[300][0], 2) == 3.67 and results[300][1] == 3
+        assert results[301] == (5.0, 4)
+        assert results[302] == (0.0, 0)
+        assert float(chefs[0].rolling_avg_rating) == 3.67
+        assert chefs[0].total_rating_count == 3
+        assert chefs[2].total_rating_count == 0
+        assert chefs[0] not in db_session.dirty
+
+    def test_recalculate_all_chefs(self, db_session, restaurant, chef_user):
+        """Full reconciliation matches the bulk recalculation"""
+        from app.models import Dish
+        
+        db_session.add_all([
+            Dish(id=310, restaurantID=restaurant.id, name="A", cost=100, chefID=chef_user.ID, average_rating=4, reviews=2),
+            Dish(id=311, restaurantID=restaurant.id, name="B", cost=100, chefID=chef_user.ID, average_rating=3, reviews=1),
+        ])
+        chef_user.rolling_avg_rating = Decimal("1.00")
+        db_session.flush()
+        
+        assert rep_engine.recalculate_all_chef_ratings(db_session) == 1
+        
+        db_session.refresh(chef_user)
+        assert chef_user.rolling_avg_x100 == 367
+        assert chef_user.total_rating_count == 3
+
+    def test_single_chef_wrapper(self, db_session, chef_user):
+        """Single-chef recalculation delegates to the bulk version"""
+        assert rep_engine.recalculate_chef_rating_from_dishes(db_session, chef_user) == (0.0, 0)
+        assert chef_user.total_rating_count == 0
+
+    def test_incremental_dish_rating_change(self, db_session, chef_user):
+        """Replacing one dish's contribution matches a full recalculation"""
+        chef_user.rolling_avg_rating = Decimal("4.00")
+        chef_user.total_rating_count = 4  # e.g. dishes (4.0 x 2) and (4.0 x 2)
+        db_session.flush()
+        
+        # Second dish goes from 4.0 x 2 to 3.0 x 3 (a new 1-star review)
+        avg, total = rep_engine.apply_dish_rating_change(db_session, chef_user, 400, 2, 300, 3)
+        
+        assert total == 5
+        assert round(avg, 2) == 3.4  # (4*2 + 3*3) / 5
+        assert float(chef_user.rolling_avg_rating) == 3.4
+        assert chef_user not in db_session.dirty
+        
+        db_session.expire(chef_user)
+        assert chef_user.total_rating_count == 5
+
+    def test_incremental_first_review(self, db_session, chef_user):
+        """A chef's first review sets the average directly"""
+        avg, total = rep_engine.apply_dish_rating_change(db_session, chef_user, 0, 0, 500, 1)
+        
+        assert (avg, total) == (5.0, 1)
+
+
+
+class TestDeliveryRatingUpsert:
+    """Test the single-statement DeliveryRating upsert"""
+
+    def test_first_review_inserts_row(self, db_session, delivery_user):
+        """No DeliveryRating row yet: the upsert creates it"""
+        from app.models import DeliveryRating
+        
+        result = rep_engine.upsert_delivery_rating(db_session, delivery_user.ID, 4, True, delivery_user)
+        
+        assert result == (4.0, 1)
+        row = db_session.get(DeliveryRating, delivery_user.ID)
+        assert (row.avg_rating_x100, row.reviews, row.total_deliveries, row.on_time_deliveries) == (400, 1, 1, 1)
+        assert delivery_user.rolling_avg_x100 == 400
+        assert delivery_user.total_rating_count == 1
+
+    def test_existing_row_is_updated(self, db_session, delivery_user):
+        """Existing row: running average and counters update in place"""
+        from app.models import DeliveryRating
+        
+        row = DeliveryRating(
+            accountID=delivery_user.ID, avg_rating_x100=500, reviews=2,
+            total_deliveries=2, on_time_deliveries=2
+        )
+        db_session.add(row)
+        db_session.flush()
+        
+        result = rep_engine.upsert_delivery_rating(db_session, delivery_user.ID, 2, False)
+        
+        # (500*2 + 200) / 3 = 400
+        assert result == (4.0, 3)
+        assert (row.avg_rating_x100, row.reviews, row.total_deliveries, row.on_time_deliveries) == (400, 3, 3, 2)
+        assert row not in db_session.dirty
+
+
+class TestReputationCache:
+    """Test the per-account reputation counter cache"""
+
+    def test_hit_skips_select(self, db_session, chef_user, capture_statements):
+        """Second read is served from the cache"""
+        first = rep_engine.reputation_cache.get(db_session, chef_user.ID)
+        
+        with capture_statements() as statements:
+            rep_engine.reputation_cache.get(db_session, chef_user.ID)
+        
+        assert first["type"] == "chef"
+        assert statements.kind("SELECT") == []
+
+    def test_commit_invalidates_written_account(self, db_session, chef_user):
+        """A committed write drops the account's cached counters"""
+        rep_engine.reputation_cache.get(db_session, chef_user.ID)
+        
+        chef_user.complaint_count = 2
+        db_session.flush()
+        # Uncommitted writes are not cached
+        assert rep_engine.reputation_cache.get(db_session, chef_user.ID)["complaint_count"] == 2
+        db_session.commit()
+        
+        summary = rep_engine.get_cached_employee_reputation_summary(db_session, chef_user.ID)
+        assert summary["complaint_count"] == 2
+        assert summary["near_demotion"] is True
+
+    def test_missing_account(self, db_session):
+        """Unknown accounts are not cached"""
+        assert rep_engine.get_cached_employee_reputation_summary(db_session, 9999) is None
+
+
+class TestDeferredRuleEvaluation:
+    """Rule evaluation queued with defer_rules runs once at commit"""
+
+    def test_rules_run_once_at_commit(self, db_session, chef_user, manager_user):
+        """Several events in one transaction cost one evaluation on the final counters"""
+        chef_user.complaint_count = 1
+        chef_user.wage = 2000
+        db_session.commit()
+        
+        with patch.object(
+            rep_engine, "evaluate_employee_rules", wraps=rep_engine.evaluate_employee_rules
+        ) as evaluate:
+            for _ in range(2):
+                result = rep_engine.process_complaint_against_employee(
+                    db_session, chef_user, actor_id=manager_user.ID, defer_rules=True
+                )
+                assert result["rule_results"] is None
+            assert chef_user.employment_status == "active"
+            
+            db_session.commit()
+        
+        evaluate.assert_called_once()
+        assert chef_user.times_demoted == 1
+        assert db_session.info.get(rep_engine.PENDING_RULE_EVALS_KEY) is None
+
+
+class TestQueryCounts:
+    """Reputation batch queries must not issue per-employee SELECTs"""
+
+    @staticmethod
+    def add_delivery_people(db_session, restaurant, start_id, count):
+        from app.models import DeliveryRating
+        
+        for i in range(start_id, start_id + count):
+            db_session.add(Account(
+                ID=i, email=f"qcount{i}@test.com", password="hash", type="delivery",
+                restaurantID=restaurant.id, balance=0, warnings=0, total_spent_cents=0,
+                unresolved_complaints_count=0, is_vip=False
+            ))
+            db_session.flush()
+            db_session.add(DeliveryRating(accountID=i, averageRating=4, reviews=1))
+        db_session.flush()
+        db_session.expunge_all()
+
+    def test_run_all_employee_evaluations_constant_selects(self, db_session, restaurant, capture_statements):
+        """SELECT count does not grow with the number of employees"""
+        self.add_delivery_people(db_session, restaurant, 400, 2)
+        with capture_statements() as small:
+            rep_engine.run_all_employee_evaluations(db_session)
+        db_session.expunge_all()
+        
+        self.add_delivery_people(db_session, restaurant, 410, 6)
+        with capture_statements() as large:
+            rep_engine.run_all_employee_evaluations(db_session)
+        
+        assert len(large.kind("SELECT")) == len(small.kind("SELECT"))
+
+    def test_run_all_rule_actions_need_no_deferred_columns(self, db_session, restaurant, capture_statements):
+        """Demotion and bonus only touch loaded columns, so they add no SELECTs"""
+        self.add_delivery_people(db_session, restaurant, 440, 2)
+        with capture_statements() as baseline:
+            rep_engine.run_all_employee_evaluations(db_session)
+        db_session.get(Account, 440).complaint_count = 3
+        db_session.get(Account, 441).compliment_count = 3
+        db_session.flush()
+        db_session.expunge_all()
+        
+        with capture_statements() as statements:
+            results = rep_engine.run_all_employee_evaluations(db_session)
+        
+        by_id = {r["employee_id"]: r for r in results}
+        assert by_id[440]["demoted"] and by_id[441]["bonus_awarded"]
+        assert len(statements.kind("SELECT")) == len(baseline.kind("SELECT"))
+
+    def test_run_all_reads_clock_once(self, db_session, restaurant):
+        """Every bonus in one run shares a single timestamp"""
+        self.add_delivery_people(db_session, restaurant, 450, 2)
+        for i in (450, 451):
+            db_session.get(Account, i).compliment_count = 3
+        db_session.flush()
+        
+        with patch.object(rep_engine, "get_iso_now", return_value="2025-12-12T00:00:00+00:00") as clock:
+            results = rep_engine.run_all_employee_evaluations(db_session)
+        
+        assert all(r["bonus_awarded"] for r in results if r["employee_id"] in (450, 451))
+        assert clock.call_count == 1
+        assert {db_session.get(Account, i).last_bonus_at for i in (450, 451)} == {"2025-12-12T00:00:00+00:00"}
+
+    def test_resolve_disputes_loads_accounts_once(self, db_session, customer_user, chef_user, capture_statements):
+        """Targets and filers of every dispute come from a single accounts SELECT"""
+        complaints = [
+            Complaint(accountID=chef_user.ID, type="complaint", description="Cold food",
+                      filer=customer_user.ID, status="disputed"),
+            Complaint(accountID=customer_user.ID, type="complaint", description="Rude",
+                      filer=chef_user.ID, status="disputed"),
+        ]
+        db_session.add_all(complaints)
+        db_session.flush()
+        db_session.expunge_all()
+        complaints = [db_session.get(Complaint, c.id) for c in complaints]
+        
+        with capture_statements() as statements:
+            results = rep_engine.resolve_disputes(db_session, complaints, "upheld", actor_id=None)
+        
+        account_selects = [s for s in statements.kind("SELECT") if "FROM accounts" in s]
+        assert [r["warning_applied_to"] for r in results] == [chef_user.ID, customer_user.ID]
+        assert len(account_selects) == 1
+
+    def test_resolve_disputes_blacklists_in_one_insert(self, db_session, customer_user, chef_user, capture_statements):
+        """Customers deregistered across a batch share a single blacklist INSERT"""
+        from app.models import Blacklist
+        
+        other = Account(
+            ID=461, email="second@test.com", password="hash", type="customer", warnings=2,
+            balance=0, total_spent_cents=0, unresolved_complaints_count=0, is_vip=False
+        )
+        db_session.add(other)
+        customer_user.warnings = 2
+        complaints = [
+            Complaint(accountID=account_id, type="complaint", description="Abusive",
+                      filer=chef_user.ID, status="disputed")
+            for account_id in (customer_user.ID, 461)
+        ]
+        db_session.add_all(complaints)
+        db_session.flush()
+        
+        with capture_statements() as statements:
+            results = rep_engine.resolve_disputes(db_session, complaints, "upheld", actor_id=None)
+        
+        assert len(statements.executemany_of("INSERT INTO blacklist")) == 1
+        assert all(r["actions"][0]["rule_results"]["deregistered"] for r in results)
+        assert rep_engine.BLACKLIST_BATCH_KEY not in db_session.info
+        blacklisted = db_session.query(Blacklist.original_account_id).filter(
+            Blacklist.original_account_id.in_([customer_user.ID, 461])
+        ).all()
+        assert sorted(row[0] for row in blacklisted) == sorted([customer_user.ID, 461])
+
+    def test_run_all_removes_fired_bids_in_one_statement(self, db_session, restaurant, customer_user, capture_statements):
+        """Bids of every delivery person fired in the run go in a single DELETE"""
+        from app.models import Bid, DeliveryRating, Order
+        
+        self.add_delivery_people(db_session, restaurant, 420, 2)
+        for i in (420, 421):
+            db_session.get(Account, i).times_demoted = 1
+            db_session.get(DeliveryRating, i).averageRating = 1
+            db_session.add(Order(id=i, accountID=customer_user.ID, finalCost=1000, status="pending"))
+            db_session.flush()
+            db_session.add(Bid(id=i, deliveryPersonID=i, orderID=i, bidAmount=300))
+        db_session.flush()
+        
+        with capture_statements() as statements:
+            results = rep_engine.run_all_employee_evaluations(db_session)
+        
+        fired = {r["employee_id"] for r in results if r.get("fired")}
+        assert fired == {420, 421}
+        assert len(statements.kind("DELETE")) == 1
+        assert db_session.query(Bid).filter(Bid.deliveryPersonID.in_([420, 421])).count() == 0
+
+    def test_classify_employee(self):
+        """Rule classification is a pure function of the counters"""
+        assert rep_engine._classify_employee(150, 0, 5) == "demote"
+        assert rep_engine._classify_employee(199, 0, 0) == "demote"
+        assert rep_engine._classify_employee(0, 3, 0) == "demote"
+        assert rep_engine._classify_employee(401, 0, 0) == "bonus"
+        assert rep_engine._classify_employee(300, 2, 3) == "bonus"
+        assert rep_engine._classify_employee(200, 0, 0) is None
+        assert rep_engine._classify_employee(400, 0, 0) is None
+        assert rep_engine._classify_employee(0, 0, 0) is None
+
+
 class TestComplaintProcessing:
     """Test complaint processing and counting"""
 
@@ -228,6 +556,43 @@ class TestComplimentProcessing:
         assert rule_results.get("bonus_applied") == True or result.get("new_compliment_count") is not None
 
 
+
+class TestBulkEventProcessing:
+    """Test batched complaint/compliment processing"""
+
+    def test_events_applied_per_employee(self, db_session, restaurant):
+        """Deltas are combined per employee and rules see the final counters"""
+        for account_id, account_type, complaints in [(500, "chef", 1), (501, "delivery", 0), (502, "customer", 0)]:
+            db_session.add(Account(
+                ID=account_id, email=f"bulkevents{account_id}@test.com", password="hash",
+                type=account_type, restaurantID=restaurant.id, balance=0, warnings=0,
+                total_spent_cents=0, unresolved_complaints_count=0, is_vip=False,
+                complaint_count=complaints, compliment_count=0
+            ))
+        db_session.flush()
+        
+        results = rep_engine.process_events_bulk(db_session, [
+            {"employee_id": 500, "type": "compliment"},
+            {"employee_id": 500, "type": "compliment"},
+            {"employee_id": 501, "type": "complaint"},
+            {"employee_id": 502, "type": "complaint"},
+        ], actor_id=None)
+        
+        assert set(results) == {500, 501}
+        # 1 complaint - 2 compliments floors at 0
+        assert results[500]["new_complaint_count"] == 0
+        assert results[500]["new_compliment_count"] == 2
+        assert results[501]["new_complaint_count"] == 1
+        assert db_session.get(Account, 502).complaint_count == 0
+
+    def test_no_events(self):
+        """Empty input issues no statements"""
+        mock_db = create_mock_db()
+        
+        assert rep_engine.process_events_bulk(mock_db, []) == {}
+        mock_db.execute.assert_not_called()
+
+
 class TestDemotionRules:
     """Test demotion rules for employees"""
 
@@ -270,6 +635,15 @@ class TestDemotionRules:
         # After demotion, wage should be reduced
         assert chef.wage < initial_wage or chef.employment_status == "demoted"
 
+    def test_demotion_count_is_times_demoted(self):
+        """demotion_count reads and writes the times_demoted column"""
+        chef = Account(email="chef@test.com", password="x", type="chef", times_demoted=1)
+
+        assert chef.demotion_count == 1
+        chef.demotion_count = 2
+        assert chef.times_demoted == 2
+        assert "demotion_count" not in Account.__table__.c
+
 
 class TestFiringRules:
     """Test firing rules for employees"""
@@ -294,6 +668,26 @@ class TestFiringRules:
         assert chef.is_fired == True or rule_results.get("fired") == True
         assert chef.employment_status == "fired"
 
+    def test_firing_deletes_losing_bids_in_one_statement(self, db_session, customer_user, delivery_user, capture_statements):
+        """Pending bids go in a single DELETE; bids that won their order are kept"""
+        from app.models import Bid, Order
+        
+        orders = [Order(id=500 + i, accountID=customer_user.ID, finalCost=1000, status="pending") for i in range(3)]
+        db_session.add_all(orders)
+        db_session.flush()
+        bids = [Bid(id=500 + i, deliveryPersonID=delivery_user.ID, orderID=500 + i, bidAmount=300) for i in range(3)]
+        db_session.add_all(bids)
+        db_session.flush()
+        orders[0].bidID = 500
+        db_session.flush()
+        
+        with capture_statements() as statements:
+            rep_engine.apply_employee_firing(db_session, delivery_user, actor_id=None)
+        
+        assert len(statements.kind("DELETE")) == 1
+        remaining = db_session.query(Bid.id).filter(Bid.deliveryPersonID == delivery_user.ID).all()
+        assert [bid_id for (bid_id,) in remaining] == [500]
+
     def test_fired_employee_not_further_processed(self):
         """Fired employees should have limited processing"""
         chef = create_mock_account(
@@ -388,6 +782,27 @@ class TestCustomerDeregistration:
         assert customer.type == "customer"
 
 
+    def test_batch_deregistration_single_blacklist_insert(self, db_session, customer_user, capture_statements):
+        """Blacklist entries for a batch are written by one executemany INSERT"""
+        from app.models import Blacklist
+        
+        other = Account(
+            ID=460, email="other@test.com", password="hash", type="customer", warnings=3,
+            balance=700, total_spent_cents=0, unresolved_complaints_count=0, is_vip=False
+        )
+        db_session.add(other)
+        db_session.flush()
+        
+        with capture_statements() as statements:
+            results = rep_engine.apply_customer_deregistrations(db_session, [customer_user, other])
+        
+        assert statements.executemany_of("INSERT INTO blacklist") == [True]
+        assert [r["deregistered"] for r in results] == [True, True]
+        assert results[1]["balance_removed"] == 700
+        emails = {b.email for b in db_session.query(Blacklist).filter(Blacklist.original_account_id.in_([customer_user.ID, 460]))}
+        assert emails == {customer_user.email, "other@test.com"}
+        assert other.type == "deregistered" and other.balance == 0
+
 class TestDeliveryPersonnelRules:
     """Test rules apply to delivery personnel same as chefs"""
 
@@ -430,6 +845,23 @@ class TestDeliveryPersonnelRules:
         assert rule_results.get("bonus_applied") == True or result.get("new_compliment_count") is not None
 
 
+    def test_eligible_delivery_ids(self, db_session, delivery_user, chef_user):
+        """Eligible IDs match is_delivery_eligible_for_bidding for every account"""
+        suspended = Account(
+            ID=430, email="suspended@test.com", password="hash", type="delivery",
+            employment_status="fired", balance=0, warnings=0, total_spent_cents=0,
+            unresolved_complaints_count=0, is_vip=False
+        )
+        db_session.add(suspended)
+        db_session.flush()
+        
+        eligible = rep_engine.get_eligible_delivery_ids(db_session)
+        
+        assert isinstance(eligible, frozenset)
+        for account in (delivery_user, chef_user, suspended):
+            assert (account.ID in eligible) == rep_engine.is_delivery_eligible_for_bidding(account)
+        assert delivery_user.ID in eligible
+
 class TestReputationSummary:
     """Test reputation summary generation"""
 
@@ -480,6 +912,21 @@ class TestReputationSummary:
         assert summary["customer_tier"] == "customer"
         assert summary["warning_count"] == 1
         assert summary["is_blacklisted"] == False
+        assert summary["warning_message"] == "You have 1 warning(s)."
+
+    def test_warning_messages(self):
+        """Messages by account type and count, including counts past the table"""
+        cases = [
+            ("customer", 0, False, None),
+            ("customer", 2, False, "You have 2 warning(s). One more warning will result in account suspension."),
+            ("vip", 1, False, "You have 1 warning(s). One more warning will result in VIP status removal."),
+            ("visitor", 5, False, "You have 5 warning(s). One more warning will result in account suspension."),
+            ("chef", 1, False, None),
+            ("customer", 1, True, "Your account has been suspended."),
+        ]
+        for account_type, warnings, blacklisted, expected in cases:
+            customer = create_mock_account(type=account_type, warnings=warnings, is_blacklisted=blacklisted)
+            assert rep_engine._get_warning_message(customer) == expected, (account_type, warnings)
 
 
 class TestEdgeCases:
@@ -532,3 +979,262 @@ class TestEdgeCases:
         # Should return error since not an employee
         assert "error" in result
 
+    def test_normal_band_employee_short_circuits(self):
+        """An employee no rule applies to returns the no-action result without touching the session"""
+        chef = create_mock_account(
+            ID=1,
+            type="chef",
+            rolling_avg_rating=Decimal("3.0"),
+            complaint_count=1,
+            compliment_count=1
+        )
+        mock_db = create_mock_db()
+        
+        result = rep_engine.evaluate_employee_rules(mock_db, chef, actor_id=100)
+        
+        assert result == {"demoted": False, "fired": False, "bonus_awarded": False, "actions": []}
+        assert mock_db.mock_calls == []
+        assert chef.employment_status == "active"
+
+
+
+class TestAuditBuffering:
+    """Test buffered audit log / notification writes"""
+
+    def test_entries_written_on_commit(self, db_session):
+        """Buffered rows are inserted when the session commits"""
+        from app.models import AuditLog, ManagerNotification
+        
+        rep_engine.create_audit_entry(db_session, "test_buffered", details={"n": 1})
+        rep_engine.create_audit_entry(db_session, "test_buffered", details={"n": 2})
+        rep_engine.create_manager_notification(db_session, "test_buffered", "Title", "Message")
+        
+        assert db_session.query(AuditLog).filter(AuditLog.action_type == "test_buffered").count() == 0
+        
+        db_session.commit()
+        
+        entries = db_session.query(AuditLog).filter(AuditLog.action_type == "test_buffered").all()
+        assert sorted(e.details["n"] for e in entries) == [1, 2]
+        assert db_session.query(ManagerNotification).filter(
+            ManagerNotification.notification_type == "test_buffered"
+        ).count() == 1
+        assert rep_engine.AUDIT_BUFFER_KEY not in db_session.info
+
+    def test_entries_discarded_on_rollback(self, db_session):
+        """Buffered rows are dropped with the transaction they belong to"""
+        from app.models import AuditLog
+        
+        db_session.query(AuditLog).count()
+        rep_engine.create_audit_entry(db_session, "test_rolled_back")
+        
+        db_session.rollback()
+        
+        assert rep_engine.AUDIT_BUFFER_KEY not in db_session.info
+
+    def test_full_buffer_written_early(self, db_session, capture_statements):
+        """A buffer reaching AUDIT_BUFFER_FLUSH_SIZE is written in one chunk before commit"""
+        from app.models import AuditLog
+        
+        with capture_statements() as statements, \
+                patch.object(rep_engine, "AUDIT_BUFFER_FLUSH_SIZE", 3):
+            for n in range(4):
+                rep_engine.create_audit_entry(db_session, "test_chunked", details={"n": n})
+            
+            assert statements.executemany_of("INSERT INTO audit_log") == [True]
+            assert len(db_session.info[rep_engine.AUDIT_BUFFER_KEY]) == 1
+            
+            db_session.commit()
+        
+        assert len(statements.executemany_of("INSERT INTO audit_log")) == 2
+        assert db_session.query(AuditLog).filter(AuditLog.action_type == "test_chunked").count() == 4
+
+    def test_notifications_signal_manager_channel_once(self):
+        """A written batch of notifications sends one pg_notify with counts per type"""
+        import json
+        
+        mock_db = MagicMock()
+        mock_db.info = {}
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        for notification_type in ("employee_demoted", "employee_demoted", "employee_fired"):
+            rep_engine.create_manager_notification(mock_db, notification_type, "Title", "Message")
+        
+        rep_engine.flush_reputation_buffers(mock_db)
+        
+        statements = [c.args[0] for c in mock_db.execute.call_args_list]
+        assert statements == [rep_engine._NOTIFICATION_INSERT, rep_engine._MANAGER_EVENTS_NOTIFY]
+        params = mock_db.execute.call_args_list[1].args[1]
+        assert params["channel"] == rep_engine.MANAGER_EVENTS_CHANNEL
+        assert json.loads(params["payload"]) == {"employee_demoted": 2, "employee_fired": 1}
+
+    def test_notification_template_rendered_on_write(self, db_session):
+        """Templated messages are formatted when written; *_cents params render as dollars"""
+        from app.models import ManagerNotification
+        
+        rep_engine.create_manager_notification(
+            db_session, "test_template", "Title",
+            "{email} wage ${wage_cents}",
+            message_params={"email": "chef@test.com", "wage_cents": 1050}
+        )
+        assert db_session.info[rep_engine.NOTIFICATION_BUFFER_KEY][0]["message"] == "{email} wage ${wage_cents}"
+        
+        db_session.commit()
+        
+        notification = db_session.query(ManagerNotification).filter(
+            ManagerNotification.notification_type == "test_template"
+        ).one()
+        assert notification.message == "chef@test.com wage $10.50"
+
+    def test_firing_notification_text(self, db_session, chef_user):
+        """Rule notifications render to the same text as before templating"""
+        from app.models import ManagerNotification
+        
+        chef_user.times_demoted = 2
+        rep_engine.apply_employee_firing(db_session, chef_user)
+        db_session.commit()
+        
+        notification = db_session.query(ManagerNotification).filter(
+            ManagerNotification.notification_type == "employee_fired",
+            ManagerNotification.related_account_id == chef_user.ID
+        ).one()
+        assert notification.message == f"Chef {chef_user.email} has been fired after 2 demotions. Account disabled."
+
+    def test_demotion_notification_without_wage(self, db_session, chef_user):
+        """An employee with no wage gets the no-wage demotion text"""
+        from app.models import ManagerNotification
+
+        chef_user.wage = None
+        chef_user.times_demoted = 0
+        rep_engine.apply_employee_demotion(db_session, chef_user)
+        db_session.commit()
+
+        notification = db_session.query(ManagerNotification).filter(
+            ManagerNotification.notification_type == "employee_demoted",
+            ManagerNotification.related_account_id == chef_user.ID
+        ).one()
+        assert notification.message == f"Chef {chef_user.email} has been demoted."
+
+    def test_bonus_notification_without_wage(self, db_session, chef_user):
+        """An employee with no wage gets the no-wage bonus text"""
+        from app.models import ManagerNotification
+
+        chef_user.wage = None
+        rep_engine.apply_employee_bonus(db_session, chef_user)
+        db_session.commit()
+
+        notification = db_session.query(ManagerNotification).filter(
+            ManagerNotification.notification_type == "employee_bonus",
+            ManagerNotification.related_account_id == chef_user.ID
+        ).one()
+        assert notification.message == f"Chef {chef_user.email} received a bonus!"
+
+    def test_async_writes_hand_off_after_commit(self, db_session):
+        """With ASYNC_AUDIT_WRITES, committed buffers go to audit_writer instead of the transaction"""
+        from app.models import AuditLog
+        
+        writer = MagicMock()
+        with patch.object(rep_engine, "ASYNC_AUDIT_WRITES", True), \
+                patch.object(rep_engine, "audit_writer", writer):
+            rep_engine.create_audit_entry(db_session, "test_async", details={"n": 1})
+            rep_engine.create_manager_notification(
+                db_session, "test_async", "Title", "Wage ${wage_cents}",
+                message_params={"wage_cents": 1050}
+            )
+            db_session.commit()
+        
+        assert db_session.query(AuditLog).filter(AuditLog.action_type == "test_async").count() == 0
+        statements = [c.args[0] for c in writer.submit.call_args_list]
+        assert statements == [rep_engine._AUDIT_INSERT, rep_engine._NOTIFICATION_INSERT]
+        assert writer.submit.call_args_list[0].args[1][0]["details"] == {"n": 1}
+        # Notifications are rendered on the committing thread
+        notification = writer.submit.call_args_list[1].args[1][0]
+        assert notification["message"] == "Wage $10.50"
+        assert "message_params" not in notification
+        assert rep_engine.AUDIT_BUFFER_KEY not in db_session.info
+
+    def test_background_writer_batches_rows(self):
+        """The writer drains queued rows into one executemany per statement and commits"""
+        session = MagicMock()
+        writer = rep_engine.BackgroundRowWriter(
+            session_factory=lambda: session, max_rows=10, max_wait_seconds=0.5
+        )
+        rows = [{"n": n} for n in range(3)]
+        
+        writer.submit("audit", rows[:2])
+        writer.submit("notification", rows[2:])
+        writer.stop()
+        
+        session.execute.assert_any_call("audit", rows[:2])
+        session.execute.assert_any_call("notification", rows[2:])
+        assert session.commit.call_count == 1
+
+    def test_background_writer_retries_failed_batch_per_row(self):
+        """One unwritable row does not drop the rest of its batch"""
+        written = []
+        
+        def execute(statement, rows):
+            if any(row.get("bad") for row in rows):
+                raise ValueError("bad row")
+            written.extend(rows)
+        
+        session = MagicMock()
+        session.execute.side_effect = execute
+        writer = rep_engine.BackgroundRowWriter(
+            session_factory=lambda: session, max_rows=10, max_wait_seconds=0.5
+        )
+        
+        writer.submit("audit", [{"n": 0}, {"n": 1, "bad": True}, {"n": 2}])
+        writer.stop()
+        
+        assert written == [{"n": 0}, {"n": 2}]
+        assert session.rollback.call_count == 2
+        assert session.commit.call_count == 2
+
+    def test_metric_columns(self, db_session):
+        """Rating/count values are stored in typed columns and merged back for the API"""
+        from app.models import AuditLog
+        
+        rep_engine.create_audit_entry(
+            db_session, "test_metrics",
+            new_rating=4, old_avg_x100=350, new_avg_x100=367, total_ratings=3,
+            details={"note": "x"}
+        )
+        db_session.commit()
+        
+        entry = db_session.query(AuditLog).filter(AuditLog.action_type == "test_metrics").one()
+        assert (entry.old_avg_x100, entry.new_avg_x100, entry.total_ratings) == (350, 367, 3)
+        assert entry.old_complaint_count is None
+        assert entry.details == {"note": "x"}
+        assert entry.full_details == {
+            "new_rating": 4, "old_avg": 3.5, "new_avg": 3.67, "total_ratings": 3, "note": "x"
+        }
+
+    def test_insert_audit_entry_returns_id(self, db_session):
+        """insert_audit_entry writes immediately and returns the new id"""
+        from app.models import AuditLog
+        
+        entry_id = rep_engine.insert_audit_entry(db_session, "test_immediate", actor_id=None)
+        
+        assert db_session.get(AuditLog, entry_id).action_type == "test_immediate"
+
+    def test_resolve_complaint_with_audit(self, db_session, customer_user, chef_user, manager_user):
+        """Complaint resolution and its audit entry are written together"""
+        from app.models import AuditLog
+        
+        complaint = Complaint(
+            accountID=chef_user.ID, type="complaint", description="Cold food",
+            filer=customer_user.ID, status="pending"
+        )
+        db_session.add(complaint)
+        db_session.flush()
+        
+        entry_id = rep_engine.resolve_complaint_with_audit(
+            db_session, complaint, resolution="dismissed", action_type="dispute_resolved",
+            actor_id=manager_user.ID, target_id=customer_user.ID, details={"resolution": "dismiss"}
+        )
+        
+        entry = db_session.get(AuditLog, entry_id)
+        assert (entry.complaint_id, entry.actor_id, entry.details) == (complaint.id, manager_user.ID, {"resolution": "dismiss"})
+        assert (complaint.status, complaint.resolution, complaint.resolved_by) == ("resolved", "dismissed", manager_user.ID)
+        assert complaint not in db_session.dirty
+        db_session.expire(complaint)
+        assert complaint.status == "resolved"
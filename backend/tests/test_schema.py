@@ -284,10 +284,10 @@ class TestComplexQueries:
             SELECT 
                 id,
                 name,
-                average_rating,
+                avg_rating_x100,
                 reviews
             FROM dishes
-            ORDER BY average_rating DESC, reviews DESC
+            ORDER BY avg_rating_x100 DESC, reviews DESC
             LIMIT 5
         """))
         rows = result.fetchall()
@@ -340,3 +340,46 @@ class TestComplaintFlow:
         row = result.fetchone()
         assert row[0] == 'complaint'
         assert row[1] == 'Test complaint'
+
+
+class TestTimestampColumns:
+    """Test TIMESTAMPTZ-backed timestamp columns keep their ISO string interface."""
+    
+    def test_order_datetime_round_trip(self, seed_db):
+        """Order.dateTime accepts ISO strings and reads back as UTC ISO strings."""
+        from app.models import Order
+        
+        order = seed_db.query(Order).filter(Order.id == 1).first()
+        order.dateTime = "2025-12-01T10:30:00-05:00"
+        seed_db.commit()
+        seed_db.expire(order)
+        
+        assert order.dateTime == "2025-12-01T15:30:00+00:00"
+    
+    def test_order_datetime_defaults_to_now(self, seed_db):
+        """An order inserted without dateTime is stamped by the database."""
+        from app.models import Order
+        
+        order = Order(accountID=1, finalCost=1000, status="pending")
+        seed_db.add(order)
+        seed_db.commit()
+        seed_db.expire(order)
+        
+        assert order.dateTime is not None
+    
+    def test_order_datetime_sorts_chronologically(self, seed_db):
+        """Ordering by dateTime follows time, not string order of mixed offsets."""
+        from app.models import Order
+        
+        first = seed_db.query(Order).filter(Order.id == 1).first()
+        second = seed_db.query(Order).filter(Order.id == 2).first()
+        # 09:00-05:00 is 14:00 UTC, later than 12:00Z despite sorting first as text
+        first.dateTime = "2025-12-01T09:00:00-05:00"
+        second.dateTime = "2025-12-01T12:00:00Z"
+        seed_db.commit()
+        
+        ids = [o.id for o in seed_db.query(Order).filter(
+            Order.id.in_([1, 2])
+        ).order_by(Order.dateTime.desc()).all()]
+        
+        assert ids == [1, 2]
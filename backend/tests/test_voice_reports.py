@@ -34,6 +34,33 @@ def create_test_audio_file(filename="test_audio.mp3", content=b"fake audio data"
     return BytesIO(content)
 
 
+class TestBulkVoiceLog:
+    """Tests for the bulk voice report insert helper"""
+    
+    def test_bulk_log_voice_returns_ids_in_order(self, db_session, customer_user):
+        """All rows are inserted and ids come back in row order"""
+        from app.routers.voice_reports import bulk_log_voice
+        
+        rows = [
+            {
+                "submitter_id": customer_user.ID,
+                "audio_file_path": f"/tmp/bulk_{i}.mp3",
+                "file_size_bytes": 100 + i,
+                "mime_type": "audio/mpeg",
+                "status": "pending",
+                "is_processed": False,
+                "updated_at": "2025-12-12T00:00:00+00:00",
+            }
+            for i in range(3)
+        ]
+        
+        ids = bulk_log_voice(db_session, rows)
+        
+        assert len(ids) == 3
+        assert [db_session.get(VoiceReport, i).file_size_bytes for i in ids] == [100, 101, 102]
+        assert bulk_log_voice(db_session, []) == []
+
+
 class TestVoiceReportSubmission:
     """Tests for voice report submission endpoint"""
     
@@ -10,6 +10,8 @@ export default function TransactionsPage() {
   const [total, setTotal] = useState(0);
   const [page, setPage] = useState(1);
   const [filter, setFilter] = useState<string>('');
+  // before_id cursor for each page visited so far (page 1 has none)
+  const [cursors, setCursors] = useState<(number | null)[]>([null]);
 
   useEffect(() => {
     fetchTransactions();
@@ -18,14 +20,19 @@ export default function TransactionsPage() {
   const fetchTransactions = async () => {
     setLoading(true);
     try {
-      const offset = (page - 1) * 20;
-      let url = `/account/transactions?offset=${offset}&limit=20`;
+      const cursor = cursors[page - 1];
+      let url = `/account/transactions?limit=20`;
+      if (cursor != null) {
+        url += `&before_id=${cursor}`;
+      }
       if (filter) {
         url += `&transaction_type=${filter}`;
       }
       const response = await apiClient.get<TransactionListResponse>(url);
       setTransactions(response.data?.transactions || []);
       setTotal(response.data?.total || 0);
+      const next = response.data?.next_before_id ?? null;
+      setCursors((prev) => [...prev.slice(0, page), next]);
     } catch (err: any) {
       toast.error('Failed to load transactions');
       setTransactions([]);
@@ -34,6 +41,12 @@ export default function TransactionsPage() {
     }
   };
 
+  const changeFilter = (value: string) => {
+    setFilter(value);
+    setPage(1);
+    setCursors([null]);
+  };
+
   const getTypeIcon = (type: string) => {
     switch (type) {
       case 'deposit':
@@ -75,7 +88,7 @@ export default function TransactionsPage() {
       <div className="bg-white rounded-xl shadow-md p-4 mb-6">
         <div className="flex gap-2 flex-wrap">
           <button
-            onClick={() => setFilter('')}
+            onClick={() => changeFilter('')}
             className={`px-4 py-2 rounded-lg text-sm font-medium ${
               filter === '' ? 'bg-primary-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
             }`}
@@ -83,7 +96,7 @@ export default function TransactionsPage() {
             All
           </button>
           <button
-            onClick={() => setFilter('deposit')}
+            onClick={() => changeFilter('deposit')}
             className={`px-4 py-2 rounded-lg text-sm font-medium ${
               filter === 'deposit' ? 'bg-primary-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
             }`}
@@ -91,7 +104,7 @@ export default function TransactionsPage() {
             💰 Deposits
           </button>
           <button
-            onClick={() => setFilter('withdrawal')}
+            onClick={() => changeFilter('withdrawal')}
             className={`px-4 py-2 rounded-lg text-sm font-medium ${
               filter === 'withdrawal' ? 'bg-primary-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
             }`}
@@ -99,7 +112,7 @@ export default function TransactionsPage() {
             💸 Withdrawals
           </button>
           <button
-            onClick={() => setFilter('order_payment')}
+            onClick={() => changeFilter('order_payment')}
             className={`px-4 py-2 rounded-lg text-sm font-medium ${
               filter === 'order_payment' ? 'bg-primary-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
             }`}
@@ -107,7 +120,7 @@ export default function TransactionsPage() {
             🛒 Orders
           </button>
           <button
-            onClick={() => setFilter('refund')}
+            onClick={() => changeFilter('refund')}
             className={`px-4 py-2 rounded-lg text-sm font-medium ${
               filter === 'refund' ? 'bg-primary-600 text-white' : 'bg-gray-100 text-gray-700 hover:bg-gray-200'
             }`}
@@ -191,7 +204,7 @@ export default function TransactionsPage() {
           </span>
           <button
             onClick={() => setPage((p) => p + 1)}
-            disabled={page >= Math.ceil(total / 20)}
+            disabled={page >= Math.ceil(total / 20) || cursors[page] == null}
             className="btn-secondary disabled:opacity-50"
           >
             Next →
@@ -436,6 +436,7 @@ export interface TransactionItem {
 export interface TransactionListResponse {
   transactions: TransactionItem[];
   total: number;
+  next_before_id: number | null;
 }
 
 // ============================================================
@@ -59,19 +59,19 @@ VALUES (11, NULL, 'warned_customer@test.com', '$2b$12$GQ.rUX0lE3v4JygnfubldOU2dl
 ALTER SEQUENCE "accounts_ID_seq" RESTART WITH 12;
 
 -- Insert delivery ratings
-INSERT INTO "DeliveryRating" ("accountID", "averageRating", reviews, total_deliveries, on_time_deliveries, avg_delivery_minutes)
+INSERT INTO "DeliveryRating" ("accountID", avg_rating_x100, reviews, total_deliveries, on_time_deliveries, avg_delivery_minutes)
 VALUES 
-    (4, 4.50, 10, 15, 12, 25),
-    (5, 4.20, 8, 10, 8, 30);
+    (4, 450, 10, 15, 12, 25),
+    (5, 420, 8, 10, 8, 30);
 
 -- Insert dishes
-INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, average_rating, reviews, "chefID")
+INSERT INTO dishes (id, "restaurantID", name, description, cost, picture, avg_rating_x100, reviews, "chefID")
 VALUES 
-    (1, 1, 'Classic Burger', 'Juicy beef burger with lettuce, tomato, onion', 1299, '/static/images/burger.jpg', 4.50, 20, 2),
-    (2, 1, 'Margherita Pizza', 'Fresh mozzarella, tomato sauce, basil', 1499, '/static/images/pizza.jpg', 4.80, 35, 2),
-    (3, 1, 'Caesar Salad', 'Romaine lettuce, parmesan, croutons, Caesar dressing', 899, '/static/images/salad.jpg', 4.20, 15, 3),
-    (4, 1, 'Spaghetti Carbonara', 'Pasta with bacon, eggs, parmesan', 1399, '/static/images/pasta.jpg', 4.70, 28, 3),
-    (5, 1, 'Chocolate Lava Cake', 'Warm chocolate cake with molten center', 699, '/static/images/cake.jpg', 4.90, 42, 2);
+    (1, 1, 'Classic Burger', 'Juicy beef burger with lettuce, tomato, onion', 1299, '/static/images/burger.jpg', 450, 20, 2),
+    (2, 1, 'Margherita Pizza', 'Fresh mozzarella, tomato sauce, basil', 1499, '/static/images/pizza.jpg', 480, 35, 2),
+    (3, 1, 'Caesar Salad', 'Romaine lettuce, parmesan, croutons, Caesar dressing', 899, '/static/images/salad.jpg', 420, 15, 3),
+    (4, 1, 'Spaghetti Carbonara', 'Pasta with bacon, eggs, parmesan', 1399, '/static/images/pasta.jpg', 470, 28, 3),
+    (5, 1, 'Chocolate Lava Cake', 'Warm chocolate cake with molten center', 699, '/static/images/cake.jpg', 490, 42, 2);
 
 ALTER SEQUENCE dishes_id_seq RESTART WITH 6;
 
@@ -31,12 +31,12 @@ EXPECTED_TABLES = {
 EXPECTED_COLUMNS = {
     "restaurant": {"id", "name", "address"},
     "accounts": {"ID", "restaurantID", "email", "password", "type", "balance", "warnings", "is_blacklisted", "free_delivery_credits"},
-    "dishes": {"id", "restaurantID", "name", "description", "cost", "picture", "average_rating", "reviews", "chefID"},
+    "dishes": {"id", "restaurantID", "name", "description", "cost", "picture", "avg_rating_x100", "reviews", "chefID"},
     "orders": {"id", "accountID", "dateTime", "finalCost", "status", "bidID", "delivery_fee", "subtotal_cents", "discount_cents"},
     "ordered_dishes": {"DishID", "orderID", "quantity"},
     "bid": {"id", "orderID", "deliveryPersonID", "bidAmount", "estimated_minutes"},
     "complaint": {"id", "accountID", "filer", "type", "description", "status", "resolution", "order_id"},
-    "DeliveryRating": {"accountID", "averageRating", "reviews", "total_deliveries"},
+    "DeliveryRating": {"accountID", "avg_rating_x100", "reviews", "total_deliveries"},
     "transactions": {"id", "accountID", "amount_cents", "balance_before", "balance_after", "transaction_type", "created_at"},
     "voice_reports": {"id", "submitter_id", "audio_file_path", "transcription", "sentiment", "subjects", "auto_labels", "status"},
     "knowledge_base": {"id", "question", "answer", "confidence", "is_active"},